@@ -130,7 +130,9 @@ def start_management(filepath=None, use_daemon=None, profiling: bool = False) ->
     splash.setProgress(0.2, "Importing modules")
     import angr
 
+    from .data.object_container import EventSentinel
     from .logic import GlobalInfo
+    from .logic.threads import gui_thread_schedule_later
     from .ui.awesome_tooltip_event_filter import QAwesomeTooltipEventFilter
     from .ui.css import refresh_theme  # import .ui after showing the splash screen since it's going to take time
     from .ui.main_window import MainWindow
@@ -151,6 +153,7 @@ def start_management(filepath=None, use_daemon=None, profiling: bool = False) ->
 
     splash.setProgress(0.9, "Initializing main window")
     GlobalInfo.gui_thread = QThread.currentThread()
+    EventSentinel.am_scheduler = gui_thread_schedule_later
     file_to_open = filepath if filepath else None
     main_window = MainWindow(app=app, use_daemon=use_daemon)
     QApplication.processEvents()  # Let the main window start up to correctly position early dialogs
@@ -313,6 +313,25 @@ ENTRIES = [
     CE("varec_endpoint", str, "http://192.168.32.129:5000/varec_joint_small"),
     # Daemon
     CE("use_daemon", bool, False),
+    # Jobs
+    CE("job_worker_count", int, 1),
+    # pool worker processes for per-function analyses (e.g., code tagging). -1 for the number of cores minus one, 0 to
+    # disable parallel analysis
+    CE("function_batch_workers", int, -1),
+    # Decompilation cache. An empty directory selects a directory in the user cache location
+    CE("decompilation_cache_enabled", bool, True),
+    CE("decompilation_cache_dir", str, ""),
+    # Prefetching of the neighbors (callees, callers, adjacent functions) of the current function. 0 disables it
+    CE("prefetch_function_count", int, 8),
+    CE("prefetch_decompilation", bool, True),
+    # Functions with at least this many blocks are disassembled and laid out in the background in the graph view
+    CE("disasm_graph_async_threshold", int, 200),
+    # Functions with at least this many blocks are lifted to AIL in the background in the linear view
+    CE("disasm_linear_async_threshold", int, 200),
+    # Function graphs with at least this many nodes are laid out with ScalableGraphLayouter
+    CE("disasm_graph_scalable_layout_threshold", int, 1000),
+    # At most this many blocks of the graph view keep the graphics items of their instructions
+    CE("disasm_graph_materialized_blocks", int, 256),
     # Tabs
     CE("enabled_tabs", str, ""),
     # Recent
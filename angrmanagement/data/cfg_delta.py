@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+
+class CFGDelta:
+    """
+    What changed in the knowledge base since the last update, while the CFG is being recovered. It is published with
+    the `delta` kwarg of Instance.cfg events. The blocks themselves are published by Instance.cfb events.
+    """
+
+    __slots__ = ("added_functions", "changed_functions")
+
+    def __init__(self, added_functions: set[int] | None = None, changed_functions: set[int] | None = None) -> None:
+        # functions that are new to the knowledge base
+        self.added_functions: set[int] = added_functions if added_functions is not None else set()
+        # functions that existed before and got new blocks
+        self.changed_functions: set[int] = changed_functions if changed_functions is not None else set()
+
+    def __bool__(self) -> bool:
+        return bool(self.added_functions or self.changed_functions)
+
+    def __repr__(self) -> str:
+        return f"<CFGDelta +{len(self.added_functions)} functions, {len(self.changed_functions)} changed>"
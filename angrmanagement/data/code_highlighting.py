@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from angr.analyses.decompiler.structured_codegen.base import PositionMapping
+
+# a run of characters in a line that is formatted: (column, length, name of the format)
+FormatRange = tuple[int, int, str]
+
+# string literals, line comments, and the starts of block comments
+_LEXICAL_RE = re.compile(r"\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'|//.*|/\*")
+
+
+class CodeHighlighting:
+    """
+    The format ranges of each line of a decompiled text.
+
+    Comments and string literals are found by lexing the text, and the other parts of the text are formatted by the
+    nodes that the position mapping maps them to. Rules (regular expressions for keywords and the like) are applied
+    last, outside of comments and string literals.
+
+    update() brings the ranges up to date with a re-rendered text, e.g., after a rename. Only the lines that changed
+    are highlighted again.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        posmap: PositionMapping | None,
+        classify: Callable[[Any], str | None],
+        rules: Iterable[tuple[str, str]] = (),
+    ) -> None:
+        """
+        :param text:        The text.
+        :param posmap:      The mapping from positions in the text to nodes, or None if the text has no nodes.
+        :param classify:    Gets the name of the format of a node, or None if the node is not formatted.
+        :param rules:       Pairs of regular expressions and the names of the formats of their matches.
+        """
+        self._classify = classify
+        # name of a format -> a regular expression of all rules with that format. in the order of the rules
+        patterns: dict[str, list[str]] = {}
+        for pattern, format_name in rules:
+            patterns.setdefault(format_name, []).append(pattern)
+        self._rules = [(name, re.compile("|".join(p))) for name, p in patterns.items()]
+
+        self.text: str = ""
+        self.posmap: PositionMapping | None = None
+        self._lines: list[str] = []
+        # whether a block comment is still open at the end of each line
+        self._in_comment: list[bool] = []
+        self._ranges: list[tuple[FormatRange, ...]] = []
+        # the number of lines that were highlighted by the last update
+        self.highlighted_lines = 0
+
+        self.update(text, posmap)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def line(self, lineno: int) -> tuple[FormatRange, ...]:
+        """
+        Get the format ranges of a line, in the order in which they should be applied.
+        """
+        if 0 <= lineno < len(self._ranges):
+            return self._ranges[lineno]
+        return ()
+
+    def update(self, text: str, posmap: PositionMapping | None) -> None:
+        """
+        Highlight a new version of the text. Lines that did not change keep their format ranges.
+        """
+        lines = text.split("\n")
+        old_lines, old_in_comment, old_ranges = self._lines, self._in_comment, self._ranges
+        count, old_count = len(lines), len(old_lines)
+
+        # lines are matched by their indices from the start and, after lines were inserted or removed, from the end
+        prefix = 0
+        limit = min(count, old_count)
+        while prefix < limit and lines[prefix] == old_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and lines[count - 1 - suffix] == old_lines[old_count - 1 - suffix]:
+            suffix += 1
+
+        in_comment_list = []
+        ranges_list = []
+        highlighted = 0
+        pos = 0
+        in_comment = False
+        for i, line in enumerate(lines):
+            if i >= count - suffix:
+                j = i - count + old_count
+            elif i < prefix or count == old_count:
+                j = i
+            else:
+                j = -1
+            if (
+                j >= 0
+                and old_lines[j] == line
+                and (old_in_comment[j - 1] if j > 0 else False) == in_comment
+                and (self.posmap is None) == (posmap is None)
+            ):
+                ranges = old_ranges[j]
+                in_comment = old_in_comment[j]
+            else:
+                ranges, in_comment = self._highlight_line(line, pos, in_comment, posmap)
+                highlighted += 1
+            ranges_list.append(ranges)
+            in_comment_list.append(in_comment)
+            pos += len(line) + 1
+
+        self.text = text
+        self.posmap = posmap
+        self._lines = lines
+        self._in_comment = in_comment_list
+        self._ranges = ranges_list
+        self.highlighted_lines = highlighted
+
+    #
+    # Private methods
+    #
+
+    def _highlight_line(
+        self, line: str, start: int, in_comment: bool, posmap: PositionMapping | None
+    ) -> tuple[tuple[FormatRange, ...], bool]:
+        ranges: list[FormatRange] = []
+
+        # comments and string literals
+        masked = []
+        col = 0
+        if in_comment:
+            end = line.find("*/")
+            col = len(line) if end < 0 else end + 2
+            in_comment = end < 0
+            ranges.append((0, col, "comment"))
+            masked.append((0, col))
+        while not in_comment:
+            m = _LEXICAL_RE.search(line, col)
+            if m is None:
+                break
+            token_start = m.start()
+            if m.group() == "/*":
+                end = line.find("*/", m.end())
+                col = len(line) if end < 0 else end + 2
+                in_comment = end < 0
+                format_name = "comment"
+            else:
+                col = m.end()
+                format_name = "comment" if m.group().startswith("//") else "quotation"
+            ranges.append((token_start, col - token_start, format_name))
+            masked.append((token_start, col))
+        for a, b in masked:
+            line = line[:a] + " " * (b - a) + line[b:]
+
+        # nodes
+        if posmap is not None and line:
+            end = start + len(line)
+            elements = posmap._posmap
+            # the node at the start of the line may start on an earlier line
+            first = posmap.get_element(start)
+            candidates = [first] if first is not None and first.start < start else []
+            candidates += [elements[pos] for pos in elements.irange(minimum=start, maximum=end - 1)]
+            for element in candidates:
+                a = max(element.start - start, 0)
+                b = min(element.start + element.length - start, len(line))
+                if b <= a or not line[a:b].strip():
+                    # the node is in a comment or string literal
+                    continue
+                format_name = self._classify(element.obj)
+                if format_name is not None:
+                    ranges.append((a, b - a, format_name))
+
+        # rules
+        for format_name, regex in self._rules:
+            for m in regex.finditer(line):
+                ranges.append((m.start(), m.end() - m.start(), format_name))
+
+        return tuple(ranges), in_comment
@@ -0,0 +1,440 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import io
+import logging
+import os
+import pickle
+import secrets
+import tempfile
+from typing import TYPE_CHECKING, Any
+
+import angr
+from angr.analyses.decompiler.decompilation_options import DecompilationOption
+from angr.knowledge_plugins.functions import Function
+from PySide6.QtCore import QStandardPaths
+
+from angrmanagement.config import Conf
+
+if TYPE_CHECKING:
+    from angr.analyses.decompiler.decompilation_cache import DecompilationCache
+    from angr.knowledge_base import KnowledgeBase
+    from angr.knowledge_plugins.cfg import CFGModel
+    from angr.knowledge_plugins.variables.variable_manager import VariableManagerInternal
+
+    from angrmanagement.data.instance import Instance
+
+
+_l = logging.getLogger(__name__)
+
+# bump this whenever the layout of cache entries changes
+CACHE_FORMAT_VERSION = 2
+
+# entries on disk start with a message authentication code of the entry key and the data
+_MAC_SIZE = hashlib.sha256().digest_size
+_SECRET_SIZE = 32
+
+# decompiler arguments that do not influence the decompilation output
+_IGNORED_DECOMPILER_ARGS = {"cfg", "progress_callback", "regen_clinic", "variable_kb", "flavor"}
+
+
+def _normalize_decompiler_arg(value: Any) -> Any:
+    """
+    Turn a decompiler argument into a stable, hashable representation.
+    """
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, DecompilationOption):
+        return value.param
+    if isinstance(value, Function):
+        return value.addr
+    if isinstance(value, dict):
+        return tuple(sorted((_normalize_decompiler_arg(k), _normalize_decompiler_arg(v)) for k, v in value.items()))
+    if isinstance(value, set | frozenset):
+        return tuple(sorted((_normalize_decompiler_arg(v) for v in value), key=repr))
+    if isinstance(value, list | tuple):
+        return tuple(_normalize_decompiler_arg(v) for v in value)
+    if isinstance(value, bool | int | float | str) or value is None:
+        return value
+    return repr(value)
+
+
+def decompiler_args_key(decompiler_args: dict[str, Any]) -> str:
+    """
+    Get a stable string representation of the decompiler arguments that influence the decompilation output.
+    """
+    return repr(
+        tuple(
+            sorted(
+                (k, _normalize_decompiler_arg(v))
+                for k, v in decompiler_args.items()
+                if k not in _IGNORED_DECOMPILER_ARGS
+            )
+        )
+    )
+
+
+class _EntryPickler(pickle.Pickler):
+    """
+    Pickles a decompilation while referring to objects of the current session (the project, knowledge bases, and
+    functions) by name instead of serializing them.
+    """
+
+    def __init__(self, file, shared: dict[int, str], functions) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._shared = shared
+        self._functions = functions
+
+    def persistent_id(self, obj):
+        name = self._shared.get(id(obj))
+        if name is not None:
+            return name
+        if isinstance(obj, Function) and self._functions.function(addr=obj.addr) is obj:
+            return ("function", obj.addr)
+        return None
+
+
+class _EntryUnpickler(pickle.Unpickler):
+    """
+    Resolves the references written by _EntryPickler against the current session.
+    """
+
+    def __init__(self, file, shared: dict[str, Any], functions) -> None:
+        super().__init__(file)
+        self._shared = shared
+        self._functions = functions
+
+    def persistent_load(self, pid):
+        if isinstance(pid, tuple) and pid[0] == "function":
+            func = self._functions.function(addr=pid[1])
+            if func is None:
+                raise pickle.UnpicklingError(f"Function {pid[1]:#x} does not exist")
+            return func
+        try:
+            return self._shared[pid]
+        except KeyError as ex:
+            raise pickle.UnpicklingError(f"Unknown shared object {pid}") from ex
+
+
+def _shared_objects(project: angr.Project, variable_kb: KnowledgeBase | None, cfg: CFGModel | None) -> dict[str, Any]:
+    """
+    Name the objects of a session that cache entries refer to instead of containing them.
+    """
+    shared = {
+        "project": project,
+        "loader": project.loader,
+        "arch": project.arch,
+        "simos": project.simos,
+        "factory": project.factory,
+        "analyses": project.analyses,
+        "kb": project.kb,
+    }
+    if cfg is not None:
+        shared["cfg"] = cfg
+    kbs: list[tuple[str, KnowledgeBase]] = [("kb", project.kb)]
+    if variable_kb is not None:
+        shared["variable_kb"] = variable_kb
+        kbs.append(("variable_kb", variable_kb))
+    for kb_name, kb in kbs:
+        # KnowledgeBase does not expose its plugins publicly
+        for plugin_name, plugin in kb._plugins.items():  # pylint:disable=protected-access
+            shared[f"{kb_name}.{plugin_name}"] = plugin
+    return shared
+
+
+def dumps_decompilation(
+    project: angr.Project,
+    variable_kb: KnowledgeBase | None,
+    cfg: CFGModel | None,
+    func_addr: int,
+    dec_cache: DecompilationCache,
+) -> bytes | None:
+    """
+    Serialize the decompilation of a function, together with its variables. Returns None if the decompilation cannot
+    be serialized. The result can be loaded by any session of the same project, including forked processes.
+    """
+    manager = None
+    if variable_kb is not None and variable_kb.variables.has_function_manager(func_addr):
+        manager = variable_kb.variables[func_addr]
+
+    shared = {id(obj): name for name, obj in _shared_objects(project, variable_kb, cfg).items()}
+    f = io.BytesIO()
+    try:
+        _EntryPickler(f, shared, project.kb.functions).dump((CACHE_FORMAT_VERSION, func_addr, dec_cache, manager))
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError) as ex:
+        _l.debug("Cannot serialize the decompilation of function %#x: %s", func_addr, ex)
+        return None
+    return f.getvalue()
+
+
+def loads_decompilation(
+    project: angr.Project, variable_kb: KnowledgeBase | None, cfg: CFGModel | None, data: bytes
+) -> tuple[int, DecompilationCache, VariableManagerInternal | None] | None:
+    """
+    Deserialize the output of dumps_decompilation(). Returns None if it cannot be restored in this session.
+    """
+    try:
+        version, func_addr, dec_cache, manager = _EntryUnpickler(
+            io.BytesIO(data), _shared_objects(project, variable_kb, cfg), project.kb.functions
+        ).load()
+    except (pickle.UnpicklingError, EOFError, TypeError, AttributeError, ImportError, ValueError) as ex:
+        _l.debug("Cannot deserialize a cached decompilation: %s", ex)
+        return None
+    if version != CACHE_FORMAT_VERSION:
+        return None
+    return func_addr, dec_cache, manager
+
+
+def _load_secret(path: str) -> bytes | None:
+    """
+    Read the key that authenticates cache entries, or create it if it does not exist yet. Returns None if the key can
+    neither be read nor created.
+    """
+    try:
+        with open(path, "rb") as f:
+            secret = f.read()
+        if len(secret) == _SECRET_SIZE:
+            return secret
+    except FileNotFoundError:
+        pass
+    except OSError as ex:
+        _l.warning("Failed to read the decompilation cache key %s: %s", path, ex)
+        return None
+
+    secret = secrets.token_bytes(_SECRET_SIZE)
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        # mkstemp() creates files that only the user can read
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(secret)
+        os.replace(tmp_path, path)
+    except OSError as ex:
+        _l.warning("Failed to create the decompilation cache key %s: %s", path, ex)
+        return None
+    return secret
+
+
+class DecompilationDiskCache:
+    """
+    An on-disk cache of decompilation results.
+
+    Entries are keyed by the bytes and layout of the decompiled function, the names and prototypes of the function and
+    its callees, the variables that were known before decompiling it, the labels, global variables, and types of the
+    program, and the decompiler arguments. Reopening the same binary (or a build in which the function did not change)
+    can therefore reuse earlier decompilations. Everything that is shared with the current session is stored by
+    reference and resolved again when an entry is loaded.
+
+    Entries are pickles, so each one is authenticated with a key that is private to the user and kept outside of the
+    cache directory. Entries that this user did not write are never unpickled.
+    """
+
+    def __init__(self, instance: Instance) -> None:
+        self.instance = instance
+        self._secret: bytes | None = None
+        # the digest of the labels and global variables, and the number of invalidations it was computed after
+        self._symbols_digest: str | None = None
+        self._symbols_generation = 0
+
+        # the CFG adds labels and global variables while it is being recovered
+        instance.project.am_subscribe(self.invalidate_globals_digest)
+        instance.cfg.am_subscribe(self.invalidate_globals_digest)
+
+    @property
+    def enabled(self) -> bool:
+        return Conf.decompilation_cache_enabled and self.directory is not None and self.secret_path is not None
+
+    @property
+    def directory(self) -> str | None:
+        if Conf.decompilation_cache_dir:
+            return os.path.expanduser(Conf.decompilation_cache_dir)
+        cache_root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+        if not cache_root:
+            return None
+        return os.path.join(cache_root, "decompilation")
+
+    @property
+    def secret_path(self) -> str | None:
+        data_root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+        if not data_root:
+            return None
+        return os.path.join(data_root, "decompilation_cache.key")
+
+    #
+    # Keys
+    #
+
+    def invalidate_globals_digest(self, **kwargs) -> None:  # pylint:disable=unused-argument
+        """
+        Forget the digest of the labels and global variables. Called whenever they change, e.g., when a label or a
+        global variable is renamed or retyped, or when the CFG is updated.
+        """
+        self._symbols_generation += 1
+        self._symbols_digest = None
+
+    def _compute_symbols_digest(self) -> str:
+        kb = self.instance.kb
+        h = hashlib.sha256()
+        for addr, name in sorted(kb.labels.items()):
+            h.update(f"{addr:#x}={name}|".encode())
+        for variable_kb in (kb, self.instance.pseudocode_variable_kb):
+            if variable_kb is None:
+                continue
+            manager = variable_kb.variables["global"]
+            for var in sorted(manager.get_variables(), key=lambda v: (v.addr or 0, v.ident or "")):
+                h.update(f"{var.addr}:{var.ident}={var.name}:{manager.get_variable_type(var)}|".encode())
+        return h.hexdigest()
+
+    def globals_digest(self) -> str:
+        """
+        Compute a digest of the program-wide state that decompilations depend on: the labels, the global variables, and
+        the user-defined types. It is part of every key.
+
+        Hashing the labels and global variables takes time proportional to the size of the knowledge base, so their
+        digest is kept until invalidate_globals_digest() is called. The user-defined types are few and can be edited in
+        place, so they are hashed every time.
+        """
+        symbols_digest = self._symbols_digest
+        if symbols_digest is None:
+            generation = self._symbols_generation
+            symbols_digest = self._compute_symbols_digest()
+            if generation == self._symbols_generation:
+                # nothing changed while the digest was being computed
+                self._symbols_digest = symbols_digest
+
+        h = hashlib.sha256(symbols_digest.encode())
+        for ty in sorted(self.instance.kb.types.iter_own(), key=lambda t: t.name):
+            h.update(f"{ty.name}={ty.type}|".encode())
+        return h.hexdigest()
+
+    def key(self, func: Function, decompiler_args: dict[str, Any], globals_digest: str | None = None) -> str:
+        """
+        Compute the cache key of a function. This must be called before the function is decompiled, since
+        decompilation updates the variables of the function.
+
+        :param globals_digest:  The result of globals_digest(), when computing the keys of many functions at once.
+        """
+        project = self.instance.project.am_obj
+        functions = self.instance.kb.functions
+
+        h = hashlib.sha256()
+        h.update(f"{CACHE_FORMAT_VERSION}|{angr.__version__}|{project.arch.name}|".encode())
+        h.update(f"{func.addr:#x}|{func.name}|{func.prototype}|".encode())
+        for node in sorted(func.graph, key=lambda n: n.addr):
+            h.update(f"{node.addr:#x}:{node.size}|".encode())
+            if node.size:
+                try:
+                    h.update(project.loader.memory.load(node.addr, node.size))
+                except KeyError:
+                    h.update(b"<unmapped>")
+        for callee_addr in sorted(functions.callgraph.successors(func.addr)):
+            callee = functions.function(addr=callee_addr)
+            if callee is not None:
+                h.update(f"{callee_addr:#x}={callee.name}:{callee.prototype}|".encode())
+
+        variable_kb = self.instance.pseudocode_variable_kb
+        if variable_kb is not None and variable_kb.variables.has_function_manager(func.addr):
+            manager = variable_kb.variables[func.addr]
+            for var in sorted(manager.get_variables(), key=lambda v: v.ident or ""):
+                h.update(f"{var.ident}={var.name}:{manager.get_variable_type(var)}|".encode())
+
+        h.update((self.globals_digest() if globals_digest is None else globals_digest).encode())
+        h.update(decompiler_args_key(decompiler_args).encode())
+        return h.hexdigest()
+
+    #
+    # Serialization
+    #
+
+    def dumps(self, func_addr: int, dec_cache: DecompilationCache) -> bytes | None:
+        """
+        Serialize the decompilation of a function, together with its variables. Returns None if the decompilation
+        cannot be serialized.
+        """
+        return dumps_decompilation(
+            self.instance.project.am_obj,
+            self.instance.pseudocode_variable_kb,
+            self.instance.cfg.am_obj,
+            func_addr,
+            dec_cache,
+        )
+
+    def loads(self, data: bytes) -> DecompilationCache | None:
+        """
+        Deserialize a decompilation, store it in the knowledge base, and install its variables. Returns None if the
+        entry cannot be restored in the current session.
+        """
+        r = loads_decompilation(
+            self.instance.project.am_obj, self.instance.pseudocode_variable_kb, self.instance.cfg.am_obj, data
+        )
+        if r is None:
+            return None
+        func_addr, dec_cache, manager = r
+
+        if manager is not None and self.instance.pseudocode_variable_kb is not None:
+            # the code generator refers to these variable objects
+            self.instance.pseudocode_variable_kb.variables.function_managers[func_addr] = manager
+        self.instance.kb.decompilations[(func_addr, "pseudocode")] = dec_cache
+        return dec_cache
+
+    #
+    # Disk access
+    #
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".pickle")
+
+    def _mac(self, key: str, data: bytes) -> bytes | None:
+        if self._secret is None:
+            self._secret = _load_secret(self.secret_path)
+            if self._secret is None:
+                return None
+        return hmac.new(self._secret, key.encode() + b"|" + data, hashlib.sha256).digest()
+
+    def read(self, key: str) -> bytes | None:
+        """
+        Read the data of an entry without loading it. Returns None if there is no entry, or if the entry was not
+        written by this user.
+        """
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                mac = f.read(_MAC_SIZE)
+                data = f.read()
+        except OSError:
+            return None
+        expected = self._mac(key, data)
+        if expected is None or not hmac.compare_digest(mac, expected):
+            return None
+        return data
+
+    def load(self, key: str) -> DecompilationCache | None:
+        """
+        Read an entry and load it into the knowledge base (see loads()).
+        """
+        data = self.read(key)
+        if data is None:
+            return None
+        return self.loads(data)
+
+    def store(self, key: str, data: bytes) -> None:
+        if not self.enabled:
+            return
+        mac = self._mac(key, data)
+        if mac is None:
+            return
+        path = self._path(key)
+        try:
+            # makedirs() only applies the mode to the last directory
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            # write to a temporary file first so that concurrent readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(mac)
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as ex:
+            _l.warning("Failed to write decompilation cache entry %s: %s", path, ex)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from angrmanagement.utils.cache import SmartLRUCache
+from angrmanagement.utils.edge import Edge
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import networkx
+
+
+_l = logging.getLogger(__name__)
+
+# the key of the cache in the extra info of angr databases
+GRAPH_LAYOUT_CACHE_DB_KEY = "angrmanagement___graph_layouts"
+# bump this whenever the serialized format or the layouters change
+GRAPH_LAYOUT_CACHE_VERSION = 1
+
+
+def node_key(node) -> tuple[int, int | None]:
+    """
+    Identify a node of a function graph across sessions.
+    """
+    return node.addr, node.idx
+
+
+def _sort_key(key: tuple[int, int | None]) -> tuple[int, int]:
+    return key[0], -1 if key[1] is None else key[1]
+
+
+def graph_fingerprint(func_addr: int, graph: networkx.DiGraph) -> str:
+    """
+    Hash the structure of a function graph: the kind and key of each node, and its edges.
+    """
+    h = hashlib.sha256()
+    node_type = type(next(iter(graph), None)).__name__
+    h.update(f"{func_addr:#x}|{node_type}|".encode())
+    h.update(repr(sorted((node_key(n) for n in graph), key=_sort_key)).encode())
+    edges = sorted(
+        (_sort_key(node_key(src)), _sort_key(node_key(dst)), data.get("type", None) == "exception")
+        for src, dst, data in graph.edges(data=True)
+    )
+    h.update(repr(edges).encode())
+    return h.hexdigest()
+
+
+def node_sizes_fingerprint(node_sizes: dict) -> str:
+    items = sorted(((_sort_key(node_key(node)), tuple(size)) for node, size in node_sizes.items()))
+    return hashlib.sha256(repr(items).encode()).hexdigest()
+
+
+class GraphLayout:
+    """
+    The result of laying out a function graph, without references to the nodes of the graph.
+    """
+
+    __slots__ = ("edges", "node_coordinates")
+
+    def __init__(self, node_coordinates: dict, edges: list) -> None:
+        # node key -> (x, y)
+        self.node_coordinates: dict[tuple[int, int | None], tuple[float, float]] = node_coordinates
+        # (source key, destination key, edge sort, coordinates)
+        self.edges: list[tuple[tuple, tuple, int | None, list[tuple[float, float]]]] = edges
+
+    @classmethod
+    def from_layouter(cls, layouter) -> GraphLayout:
+        node_coordinates = {node_key(node): coords for node, coords in layouter.node_coordinates.items()}
+        edges = [(node_key(edge.src), node_key(edge.dst), edge.sort, list(edge.coordinates)) for edge in layouter.edges]
+        return cls(node_coordinates, edges)
+
+    def make_edges(self, graph: networkx.DiGraph) -> list[Edge]:
+        """
+        Create new Edge objects that connect the nodes of a graph of the same structure.
+        """
+        nodes = {node_key(node): node for node in graph}
+        edges = []
+        for src, dst, sort, coordinates in self.edges:
+            edge = Edge(nodes[src], nodes[dst], sort=sort)
+            edge.coordinates = list(coordinates)
+            edges.append(edge)
+        return edges
+
+    def to_json(self) -> list:
+        return [
+            [[addr, idx, x, y] for (addr, idx), (x, y) in self.node_coordinates.items()],
+            [
+                [list(src), list(dst), sort, [list(c) for c in coordinates]]
+                for src, dst, sort, coordinates in self.edges
+            ],
+        ]
+
+    @classmethod
+    def from_json(cls, data: list) -> GraphLayout:
+        nodes, edges = data
+        return cls(
+            {(addr, idx): (x, y) for addr, idx, x, y in nodes},
+            [(tuple(src), tuple(dst), sort, [tuple(c) for c in coordinates]) for src, dst, sort, coordinates in edges],
+        )
+
+
+class GraphLayoutCache:
+    """
+    Caches the layouts of function graphs, keyed by the function, the structure of its graph, and the sizes of its
+    nodes. When only the sizes of some nodes changed, the last layouter of the same graph is asked to update its layout
+    instead of laying out the graph from scratch. Layouts can be stored in and restored from angr databases.
+
+    The cache is used from both the GUI thread and background threads.
+    """
+
+    MAX_LAYOUTS = 512
+    # layouters keep references to the graphs they laid out, so only keep a few of them
+    MAX_LAYOUTERS = 8
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._layouts: OrderedDict[tuple[str, str], GraphLayout] = OrderedDict()
+        self._layouters: SmartLRUCache = SmartLRUCache(maxsize=self.MAX_LAYOUTERS)
+
+    def __len__(self) -> int:
+        return len(self._layouts)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._layouts.clear()
+            self._layouters.clear()
+
+    def layout(
+        self,
+        func_addr: int,
+        graph: networkx.DiGraph,
+        node_sizes: dict,
+        layouter_factory: Callable[[networkx.DiGraph, dict], Any],
+    ) -> tuple[dict, list[Edge]]:
+        """
+        Lay out a function graph, reusing earlier layouts where possible.
+
+        :param layouter_factory:    Creates a layouter (e.g., GraphLayouter) for a graph and its node sizes.
+        :return:                    The coordinates of each node key and the edges of the graph.
+        """
+        fingerprint = graph_fingerprint(func_addr, graph)
+        key = fingerprint, node_sizes_fingerprint(node_sizes)
+
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is not None:
+                self._layouts.move_to_end(key)
+            # a layouter is only used by one thread at a time
+            layouter = self._layouters.pop(fingerprint, None) if layout is None else None
+
+        if layout is None:
+            if layouter is not None and layouter.graph is graph:
+                # only node sizes changed
+                layouter.update_node_sizes(node_sizes)
+            else:
+                layouter = layouter_factory(graph, node_sizes)
+            layout = GraphLayout.from_layouter(layouter)
+
+            with self._lock:
+                self._layouters[fingerprint] = layouter
+                self._layouts[key] = layout
+                while len(self._layouts) > self.MAX_LAYOUTS:
+                    self._layouts.popitem(last=False)
+
+        return dict(layout.node_coordinates), layout.make_edges(graph)
+
+    #
+    # Serialization
+    #
+
+    def dumps(self) -> str:
+        with self._lock:
+            layouts = [[fp, sizes_fp, layout.to_json()] for (fp, sizes_fp), layout in self._layouts.items()]
+        return json.dumps({"version": GRAPH_LAYOUT_CACHE_VERSION, "layouts": layouts})
+
+    def loads(self, data: str) -> None:
+        try:
+            obj = json.loads(data)
+            if obj.get("version") != GRAPH_LAYOUT_CACHE_VERSION:
+                return
+            layouts = [((fp, sizes_fp), GraphLayout.from_json(layout)) for fp, sizes_fp, layout in obj["layouts"]]
+        except (ValueError, TypeError, KeyError, AttributeError):
+            _l.warning("Failed to load the graph layout cache.", exc_info=True)
+            return
+
+        with self._lock:
+            for key, layout in layouts:
+                self._layouts[key] = layout
+            while len(self._layouts) > self.MAX_LAYOUTS:
+                self._layouts.popitem(last=False)
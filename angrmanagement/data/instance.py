@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import threading
 from typing import TYPE_CHECKING
 
 import angr
@@ -13,17 +14,28 @@ from cle import SymbolType
 from angrmanagement.data.breakpoint import Breakpoint, BreakpointManager, BreakpointType
 from angrmanagement.data.trace import Trace
 from angrmanagement.errors import ContainerAlreadyRegisteredError
+from angrmanagement.logic import GlobalInfo
 from angrmanagement.logic.debugger import DebuggerListManager, DebuggerManager
 
+from .decompilation_cache import DecompilationDiskCache
+from .graph_layout_cache import GraphLayoutCache
+from .jobs import CFGGenerationJob, IndexSymbolsJob
+from .jobs.job import JobState
 from .log import LogRecord, initialize
 from .object_container import ObjectContainer
+from .strings_index import StringsIndex
+from .symbol_index import SymbolIndex
+from .xref_index import XRefIndex
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
     from angr.knowledge_plugins.cfg import CFGModel
 
+    from angrmanagement.logic.jobmanager import JobManager
+
     from .jobs import VariableRecoveryJob
+    from .symbol_index import Symbol
 
 
 _l = logging.getLogger(__name__)
@@ -58,6 +70,11 @@ class Instance:
         self.register_container("patches", lambda: None, None, "Global patches update notifier")  # dummy
         self.register_container("cfg", lambda: None, angr.knowledge_plugins.cfg.CFGModel | None, "The current CFG")
         self.register_container("cfb", lambda: None, angr.analyses.cfg.CFBlanket | None, "The current CFBlanket")
+        # objects are added to the CFB one by one while the CFG is being recovered
+        self.cfb.am_coalesce(batch_keys=("object_added",))
+        self.register_container(
+            "strings_index", StringsIndex, StringsIndex, "Index of the strings in the memory data of the CFG"
+        )
         self.register_container("log", list, list[LogRecord], "Saved log messages", logging_permitted=False)
         self.register_container("current_trace", lambda: None, type[Trace], "Currently selected trace")
         self.register_container("traces", list, list[Trace], "Global traces list")
@@ -69,6 +86,7 @@ class Instance:
         self.debugger_mgr = DebuggerManager(self.debugger_list_mgr)
 
         self.project.am_subscribe(self.initialize)
+        self.cfg.am_subscribe(self._on_cfg_updated)
 
         self.functions_to_inline = set()
 
@@ -85,6 +103,21 @@ class Instance:
         self.variable_recovery_args = None
         self._disassembly = {}
         self.pseudocode_variable_kb = None
+        self.decompilation_cache = DecompilationDiskCache(self)
+        self.graph_layout_cache = GraphLayoutCache()
+        # functions, labels and strings for goto-style dialogs
+        self.symbol_index = SymbolIndex()
+        # held while the symbol index is read or changed. syncs only hold it while they apply their changes
+        self._symbol_index_lock = threading.Lock()
+        # held for the whole sync of the symbol index, since syncs must not run concurrently
+        self._symbol_index_sync_lock = threading.Lock()
+        self._index_job: IndexSymbolsJob | None = None
+        # whether the indexes must be updated again once the current index job has finished, and whether the
+        # references of the strings must be rebuilt then
+        self._indexes_outdated = False
+        self._references_outdated = False
+        # columns of the references to each address that the xref dialog was opened for
+        self.xref_index = XRefIndex()
 
         self.database_path = None
 
@@ -168,10 +201,123 @@ class Instance:
             return
 
         self.patches.am_obj = self.kb.patches
+        # layouts of another project are useless. layouts stored in an angr database are loaded after this
+        self.graph_layout_cache.clear()
 
         if not initialized and self.pseudocode_variable_kb is None:
             self.initialize_pseudocode_variable_kb()
 
+    def update_symbol_index(self) -> SymbolIndex:
+        """
+        Bring the symbol index up to date with the knowledge base and the CFG, and return it. Only the symbols that
+        changed since the last update are indexed, and the index can be searched while they are.
+        """
+        with self._symbol_index_sync_lock:
+            self.symbol_index.sync(self.kb, self.cfg.am_obj, lock=self._symbol_index_lock)
+        return self.symbol_index
+
+    def indexed_symbols(self, kind: str) -> list[Symbol]:
+        """
+        Bring the symbol index up to date, and get all symbols of a kind, sorted by their addresses.
+
+        The index is not updated right away if the CFG is being recovered or the index is being updated in the
+        background. An update is queued instead, and the symbols that are indexed so far are returned.
+        """
+        if self._cfg_jobs() or not self._symbol_index_sync_lock.acquire(blocking=False):
+            self.update_indexes_async()
+        else:
+            try:
+                self.symbol_index.sync(self.kb, self.cfg.am_obj, lock=self._symbol_index_lock)
+            finally:
+                self._symbol_index_sync_lock.release()
+        with self._symbol_index_lock:
+            return self.symbol_index.symbols(kind)
+
+    def search_symbols(self, query: str, limit: int = 50) -> list[Symbol]:
+        """
+        Find the symbols that match a query best. The symbol index is locked while it is searched, since it may be
+        updated in a background thread at the same time.
+        """
+        with self._symbol_index_lock:
+            return self.symbol_index.search(query, limit=limit)
+
+    def update_strings_index(self, rebuild_references: bool = False) -> bool:
+        """
+        Bring the strings index up to date with the memory data of the CFG. Only the memory data that changed since the
+        last update is indexed. This method may be called in a background thread.
+
+        :param rebuild_references:  Find the functions that reference each string again.
+        :return:                    True if any string was added, removed or changed.
+        """
+        index = self.strings_index.am_obj
+        project = self.project.am_obj
+        kb = self.kb
+        return index.sync(
+            None if self.cfg.am_none else self.cfg.am_obj,
+            xrefs=kb.xrefs if kb is not None else None,
+            loader=project.loader if project is not None else None,
+            rebuild_references=rebuild_references,
+        )
+
+    def update_indexes_async(self, rebuild_references: bool = False) -> None:
+        """
+        Update the symbol index and the strings index in a background job, once the CFG has been recovered. An event
+        is fired on the strings index container if strings changed. If an update is already queued or running, another
+        one follows it, so that changes made in the meantime are not missed.
+
+        :param rebuild_references:  Find the functions that reference each string again.
+        """
+        job_manager = self._job_manager()
+        if job_manager is None:
+            self.update_symbol_index()
+            index = self.strings_index.am_obj
+            self._on_indexes_updated((index, self.update_strings_index(rebuild_references=rebuild_references)))
+            return
+        if self._index_job is not None and self._index_job.state in (JobState.PENDING, JobState.RUNNING):
+            self._indexes_outdated = True
+            self._references_outdated |= rebuild_references
+            return
+        self._indexes_outdated = False
+        self._references_outdated = False
+        self._index_job = IndexSymbolsJob(
+            self,
+            rebuild_references=rebuild_references,
+            on_finish=self._on_indexes_updated,
+            depends_on=self._cfg_jobs(),
+        )
+        job_manager.add_job(self._index_job)
+
+    def _on_indexes_updated(self, result: tuple[StringsIndex, bool]) -> None:
+        self._index_job = None
+        index, updated = result
+        if updated and self.strings_index.am_obj is index:
+            self.strings_index.am_event()
+        if self._indexes_outdated:
+            self.update_indexes_async(rebuild_references=self._references_outdated)
+
+    @staticmethod
+    def _job_manager() -> JobManager | None:
+        main_window = GlobalInfo.main_window
+        return main_window.workspace.job_manager if main_window is not None else None
+
+    def _cfg_jobs(self) -> list[CFGGenerationJob]:
+        """
+        Get the jobs that are recovering the CFG of this instance, or are about to.
+        """
+        job_manager = self._job_manager()
+        if job_manager is None:
+            return []
+        return [job for job in job_manager.jobs if isinstance(job, CFGGenerationJob) and job.instance is self]
+
+    def _on_cfg_updated(self, **kwargs) -> None:
+        if "delta" in kwargs or self.cfg.am_none:
+            # the CFG is still being recovered
+            return
+        self.xref_index.clear()
+        # index ahead of time, so that the strings view and goto-style dialogs open quickly. the CFG brings cross
+        # references that strings indexed earlier did not have
+        self.update_indexes_async(rebuild_references=True)
+
     def initialize_pseudocode_variable_kb(self) -> None:
         self.pseudocode_variable_kb = KnowledgeBase(self.project.am_obj, name="pseudocode_variable_kb")
 
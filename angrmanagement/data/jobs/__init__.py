@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+from .batch_decompilation import BatchDecompilationJob
 from .cfg_generation import CFGGenerationJob
 from .code_tagging import CodeTaggingJob
 from .ddg_generation import DDGGenerationJob
 from .decompile_function import DecompileFunctionJob
 from .deobfuscation import APIDeobfuscationJob
 from .dependency_analysis import DependencyAnalysisJob
+from .disassemble_function import DisassembleFunctionJob
 from .flirt_signature_recognition import FlirtSignatureRecognitionJob
+from .index_symbols import IndexSymbolsJob
 from .job import Job
+from .operand_indexing import OperandIndexingJob
+from .prefetch import PrefetchFunctionsJob
 from .prototype_finding import PrototypeFindingJob
 from .simgr_explore import SimgrExploreJob
 from .simgr_step import SimgrStepJob
@@ -16,13 +21,18 @@ from .vfg_generation import VFGGenerationJob
 
 __all__ = [
     "APIDeobfuscationJob",
+    "BatchDecompilationJob",
     "CFGGenerationJob",
     "CodeTaggingJob",
     "DDGGenerationJob",
     "DecompileFunctionJob",
     "DependencyAnalysisJob",
+    "DisassembleFunctionJob",
     "FlirtSignatureRecognitionJob",
+    "IndexSymbolsJob",
     "Job",
+    "OperandIndexingJob",
+    "PrefetchFunctionsJob",
     "PrototypeFindingJob",
     "SimgrExploreJob",
     "SimgrStepJob",
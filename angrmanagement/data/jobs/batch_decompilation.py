@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from angrmanagement.data.decompilation_cache import dumps_decompilation
+from angrmanagement.logic import GlobalInfo
+from angrmanagement.logic.threads import gui_thread_schedule, gui_thread_schedule_async
+
+from .function_batch import FunctionBatchJob
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import angr
+    from angr.analyses.decompiler.decompilation_cache import DecompilationCache
+    from angr.knowledge_plugins.functions import Function
+
+    from angrmanagement.data.instance import Instance
+
+    from .job import Job
+
+
+_l = logging.getLogger(name=__name__)
+
+
+class BatchDecompilationJob(FunctionBatchJob):
+    """
+    Decompile many functions in the background to fill kb.decompilations, so that opening them in the pseudocode view
+    is instant. Functions that have been decompiled before, either in this session or with the same decompiler
+    arguments in an earlier one (see DecompilationDiskCache), are skipped.
+    """
+
+    def __init__(
+        self,
+        instance: Instance,
+        decompiler_args: dict[str, Any],
+        limit: int | None = None,
+        on_finish=None,
+        workers: int | None = None,
+        depends_on: Iterable[Job] | None = None,
+    ) -> None:
+        """
+        :param decompiler_args: Arguments to the Decompiler analysis, as used by CodeView.decompile().
+        :param limit:           Only decompile this many functions, starting with the ones that have the most callers.
+        """
+        super().__init__("Batch decompilation", instance, on_finish=on_finish, workers=workers, depends_on=depends_on)
+        self.decompiler_args = dict(decompiler_args)
+        # pool workers cannot use the object container of the CFG
+        cfg = self.decompiler_args.get("cfg")
+        if cfg is not None and hasattr(cfg, "am_obj"):
+            self.decompiler_args["cfg"] = cfg.am_obj
+        self.limit = limit
+
+        self._keys: dict[int, str] = {}
+
+    def select_function(self, func: Function) -> bool:
+        return not (func.is_plt or func.is_simprocedure or func.is_alignment or func.is_syscall)
+
+    def collect_function_addrs(self) -> list[int]:
+        functions = self.instance.kb.functions
+        decompilations = self.instance.kb.decompilations
+        disk_cache = self.instance.decompilation_cache
+
+        func_addrs = [
+            addr
+            for addr in super().collect_function_addrs()
+            if "pseudocode" not in decompilations.available_flavors(addr)
+        ]
+        if self.limit is not None:
+            func_addrs.sort(key=functions.callgraph.in_degree, reverse=True)
+            func_addrs = func_addrs[: self.limit]
+
+        if not disk_cache.enabled:
+            return func_addrs
+
+        globals_digest = disk_cache.globals_digest()
+        cached = []
+        for addr in func_addrs:
+            key = disk_cache.key(functions.function(addr=addr), self.decompiler_args, globals_digest=globals_digest)
+            self._keys[addr] = key
+            data = disk_cache.read(key)
+            if data is not None:
+                cached.append((addr, data))
+
+        # loading entries writes to the knowledge bases, which only happens on the GUI thread
+        loaded = gui_thread_schedule(self._load_cached, args=(cached,)) if cached else set()
+        _l.info("Loaded %d decompilations from the cache", len(loaded))
+        return [addr for addr in func_addrs if addr not in loaded]
+
+    def _load_cached(self, cached: list[tuple[int, bytes]]) -> set[int]:
+        disk_cache = self.instance.decompilation_cache
+        return {addr for addr, data in cached if disk_cache.loads(data) is not None}
+
+    def worker_context(self) -> Any:
+        return {
+            "variable_kb": self.instance.pseudocode_variable_kb,
+            "cfg": self.instance.cfg.am_obj,
+            "decompiler_args": self.decompiler_args,
+        }
+
+    @staticmethod
+    def _decompile(project: angr.Project, func: Function, context: dict[str, Any]) -> DecompilationCache | None:
+        try:
+            decompiler = project.analyses.Decompiler(
+                func,
+                flavor="pseudocode",
+                variable_kb=context["variable_kb"],
+                **context["decompiler_args"],
+            )
+        except Exception:  # pylint:disable=broad-except
+            _l.warning("Failed to decompile function %s", func.name, exc_info=True)
+            return None
+        return decompiler.cache
+
+    @staticmethod
+    def process_function(project: angr.Project, func: Function, context: dict[str, Any]) -> bytes | None:
+        dec_cache = BatchDecompilationJob._decompile(project, func, context)
+        if dec_cache is None:
+            return None
+        return dumps_decompilation(project, context["variable_kb"], context["cfg"], func.addr, dec_cache)
+
+    def process_function_locally(self, func: Function, context: dict[str, Any]) -> DecompilationCache | None:
+        return self._decompile(self.instance.project.am_obj, func, context)
+
+    def apply_result(self, func: Function, result: bytes | DecompilationCache | None) -> None:
+        if result is None:
+            return
+        disk_cache = self.instance.decompilation_cache
+        key = self._keys.get(func.addr)
+        if isinstance(result, bytes):
+            # decompiled by a pool worker
+            if disk_cache.loads(result) is None:
+                return
+            data = result
+        else:
+            # decompiled in this process. caching it on disk is best-effort
+            self.instance.kb.decompilations[(func.addr, "pseudocode")] = result
+            data = disk_cache.dumps(func.addr, result) if key is not None else None
+        if key is not None and data is not None:
+            disk_cache.store(key, data)
+        gui_thread_schedule_async(GlobalInfo.main_window.workspace.plugins.decompile_callback, args=(func,))
+
+    def __repr__(self) -> str:
+        return "BatchDecompilationJob"
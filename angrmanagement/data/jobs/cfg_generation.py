@@ -4,7 +4,10 @@ import functools
 import logging
 from typing import TYPE_CHECKING
 
+from angr.block import Block
+
 from angrmanagement.data.analysis_options import CFGForceScanMode
+from angrmanagement.data.cfg_delta import CFGDelta
 from angrmanagement.logic.threads import gui_thread_schedule_async
 
 from .job import InstanceJob
@@ -21,9 +24,14 @@ class CFGGenerationJob(InstanceJob):
     Job for generating the Control Flow Graph.
     """
 
+    mutates_kb = True
+
     DEFAULT_CFG_ARGS = {
         "normalize": True,  # this is what people naturally expect
     }
+    # the number of deltas for which a block whose function does not exist yet is kept. views learn about the blocks
+    # that are dropped after that when the complete CFG is published
+    MAX_DELTA_RETRIES = 8
 
     def __init__(self, instance: Instance, on_finish=None, **kwargs) -> None:
         super().__init__("CFG generation", instance, on_finish=on_finish)
@@ -44,6 +52,11 @@ class CFGGenerationJob(InstanceJob):
             self.cfg_args["force_complete_scan"] = scanning_mode == CFGForceScanMode.CompleteScan
 
         self._cfb = None
+        # the blocks that were added to the CFB since the last delta, with the number of deltas that they were held back
+        # from because their functions did not exist yet. they are only accessed from the CFG thread
+        self._added_blocks: dict[int, int] = {}
+        # the functions that were published through deltas
+        self._published_funcs: set[int] = set()
 
     def run(self, ctx: JobContext):
         exclude_region_types = {"kernel", "tls"}
@@ -77,19 +90,44 @@ class CFGGenerationJob(InstanceJob):
 
         if cfg is not None:
             # Peek into the CFG
-            gui_thread_schedule_async(
-                self._refresh,
-                args=(
-                    cfg.model,
-                    self._cfb,
-                ),
-            )
-
-    def _refresh(self, cfg_model, cfb) -> None:
-        # do not signal events. that will happen on a timer to not overwhelm the renderer
+            gui_thread_schedule_async(self._refresh, args=(cfg.model, self._cfb, self._make_delta(cfg)))
+
+    def _make_delta(self, cfg) -> CFGDelta:
+        """
+        Collect the functions that the blocks added since the last delta belong to. This method is called in the CFG
+        thread, so the CFG does not change while it runs.
+        """
+        delta = CFGDelta()
+        functions = cfg.kb.functions
+        blocks, self._added_blocks = self._added_blocks, {}
+        for block_addr, retries in blocks.items():
+            node = cfg.model.get_any_node(block_addr)
+            if node is None or node.function_address is None:
+                continue
+            func_addr = node.function_address
+            if func_addr in self._published_funcs:
+                delta.changed_functions.add(func_addr)
+            elif functions.contains_addr(func_addr):
+                delta.added_functions.add(func_addr)
+                self._published_funcs.add(func_addr)
+            elif retries < self.MAX_DELTA_RETRIES:
+                # the function has not been created yet
+                self._added_blocks[block_addr] = retries + 1
+        return delta
+
+    def _refresh(self, cfg_model, cfb, delta: CFGDelta) -> None:
         # instance will exist because _run must be used first
+        first = self.instance.cfg.am_obj is not cfg_model
         self.instance.cfg = cfg_model
         self.instance.cfb = cfb
+        if first:
+            # views load the partial CFG once, and then apply deltas
+            self.instance.cfb.am_event()
+            self.instance.cfg.am_event()
+        elif delta:
+            self.instance.cfg.am_event(delta=delta)
 
     def _on_cfb_object_added(self, addr: int, obj) -> None:
+        if isinstance(obj, Block):
+            self._added_blocks.setdefault(addr, 0)
         self.instance.cfb.am_event(object_added=(addr, obj))
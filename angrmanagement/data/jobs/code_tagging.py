@@ -2,31 +2,41 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from .job import InstanceJob
+from .function_batch import FunctionBatchJob
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import angr
+    from angr.knowledge_plugins.functions import Function
+
     from angrmanagement.data.instance import Instance
-    from angrmanagement.logic.jobmanager import JobContext
 
+    from .job import Job
 
-class CodeTaggingJob(InstanceJob):
+
+class CodeTaggingJob(FunctionBatchJob):
     """
     Job for tagging functions.
     """
 
-    def __init__(self, instance: Instance, on_finish=None) -> None:
-        super().__init__("Code tagging", instance, on_finish=on_finish)
+    def __init__(
+        self, instance: Instance, on_finish=None, workers: int | None = None, depends_on: Iterable[Job] | None = None
+    ) -> None:
+        super().__init__("Code tagging", instance, on_finish=on_finish, workers=workers, depends_on=depends_on)
+
+    def select_function(self, func: Function) -> bool:
+        return not func.is_alignment
 
-    def run(self, ctx: JobContext) -> None:
-        func_count = len(self.instance.kb.functions)
-        for i, func in enumerate(self.instance.kb.functions.values()):
-            if func.is_alignment:
-                continue
-            ct = self.instance.project.analyses.CodeTagging(func)
-            func.tags = tuple(ct.tags)
+    @staticmethod
+    def process_function(
+        project: angr.Project, func: Function, context: None  # pylint:disable=unused-argument
+    ) -> tuple[str, ...]:
+        ct = project.analyses.CodeTagging(func)
+        return tuple(ct.tags)
 
-            percentage = i / func_count * 100
-            ctx.set_progress(percentage)
+    def apply_result(self, func: Function, result: tuple[str, ...]) -> None:
+        func.tags = result
 
     def __repr__(self) -> str:
         return "CodeTaggingJob"
@@ -1,35 +1,91 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import logging
+from typing import TYPE_CHECKING, Any
 
 from angrmanagement.logic import GlobalInfo
 
-from .job import InstanceJob
+from .job import InstanceJob, JobPriority
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from angr.analyses.decompiler.decompilation_cache import DecompilationCache
+    from angr.knowledge_plugins.functions import Function
+
     from angrmanagement.data.instance import Instance
     from angrmanagement.logic.jobmanager import JobContext
 
+_l = logging.getLogger(name=__name__)
+
+
+def decompile_function(
+    instance: Instance,
+    function: Function,
+    decompiler_args: dict[str, Any],
+    use_disk_cache: bool = True,
+    progress_callback: Callable[[float], None] | None = None,
+) -> DecompilationCache:
+    """
+    Decompile a function into kb.decompilations, going through the on-disk decompilation cache.
+
+    :param use_disk_cache:  When False, always decompile, but still refresh the on-disk cache entry afterwards.
+    """
+    disk_cache = instance.decompilation_cache
+    # the key depends on the state before decompilation
+    key = disk_cache.key(function, decompiler_args) if disk_cache.enabled else None
+
+    if use_disk_cache and key is not None:
+        dec_cache = disk_cache.load(key)
+        if dec_cache is not None:
+            _l.debug("Loaded the decompilation of %s from the decompilation cache", function.name)
+            return dec_cache
+
+    decompiler = instance.project.analyses.Decompiler(
+        function,
+        flavor="pseudocode",
+        variable_kb=instance.pseudocode_variable_kb,
+        **decompiler_args,
+        progress_callback=progress_callback,
+    )
+    # cache the result
+    instance.kb.decompilations[(function.addr, "pseudocode")] = decompiler.cache
+    if key is not None:
+        data = disk_cache.dumps(function.addr, decompiler.cache)
+        if data is not None:
+            disk_cache.store(key, data)
+    return decompiler.cache
+
 
 class DecompileFunctionJob(InstanceJob):
     """
     The job for running the decompiler analysis. You can trigger this by pressing f5 in a function.
     """
 
-    def __init__(self, instance: Instance, function, on_finish=None, blocking: bool = False, **kwargs) -> None:
+    priority = JobPriority.INTERACTIVE
+    mutates_kb = True
+
+    def __init__(
+        self,
+        instance: Instance,
+        function,
+        on_finish=None,
+        blocking: bool = False,
+        use_disk_cache: bool = True,
+        **kwargs,
+    ) -> None:
         super().__init__("Decompiling", instance, on_finish=on_finish, blocking=blocking)
         self.kwargs = kwargs
         self.function = function
+        # when False, always decompile, but still refresh the on-disk cache entry afterwards
+        self.use_disk_cache = use_disk_cache
 
     def run(self, ctx: JobContext) -> None:
-        decompiler = self.instance.project.analyses.Decompiler(
+        decompile_function(
+            self.instance,
             self.function,
-            flavor="pseudocode",
-            variable_kb=self.instance.pseudocode_variable_kb,
-            **self.kwargs,
+            self.kwargs,
+            use_disk_cache=self.use_disk_cache,
             progress_callback=ctx.set_progress,
         )
-        # cache the result
-        self.instance.kb.decompilations[(self.function.addr, "pseudocode")] = decompiler.cache
-
         GlobalInfo.main_window.workspace.plugins.decompile_callback(self.function)
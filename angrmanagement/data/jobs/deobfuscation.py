@@ -4,20 +4,27 @@ from typing import TYPE_CHECKING
 
 from angr.analyses.deobfuscator import APIObfuscationFinder
 
-from .job import InstanceJob
+from .job import InstanceJob, JobPriority
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from angrmanagement.data.instance import Instance
     from angrmanagement.logic.jobmanager import JobContext
 
+    from .job import Job
+
 
 class APIDeobfuscationJob(InstanceJob):
     """
     Job for deobfuscating API usage.
     """
 
-    def __init__(self, instance: Instance, on_finish=None) -> None:
-        super().__init__("API Deobfuscation", instance, on_finish=on_finish)
+    priority = JobPriority.BACKGROUND
+    mutates_kb = True
+
+    def __init__(self, instance: Instance, on_finish=None, depends_on: Iterable[Job] | None = None) -> None:
+        super().__init__("API Deobfuscation", instance, on_finish=on_finish, depends_on=depends_on)
 
     def run(self, ctx: JobContext) -> None:
         self.instance.project.analyses[APIObfuscationFinder].prep(progress_callback=ctx.set_progress)(
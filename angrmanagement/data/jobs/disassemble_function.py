@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from .job import InstanceJob, JobPriority
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from angr.analyses import Disassembly
+    from angr.analyses.decompiler.clinic import Clinic
+    from angr.knowledge_plugins.functions import Function
+
+    from angrmanagement.data.instance import Instance
+    from angrmanagement.logic.jobmanager import JobContext
+
+_l = logging.getLogger(name=__name__)
+
+
+def disassemble_function(
+    instance: Instance, function: Function, ail: bool = False, include_ir: bool = False
+) -> Disassembly | Clinic:
+    """
+    Disassemble a function, or lift it to AIL.
+
+    :param ail:         Lift the function to AIL instead of disassembling it.
+    :param include_ir:  Include the lifter IR in the disassembly.
+    """
+    if ail:
+        try:
+            # the decompiler may have lifted the function already
+            return instance.kb.decompilations[(function.addr, "pseudocode")].clinic
+        except (KeyError, AttributeError):
+            return instance.project.analyses.Clinic(function)
+    return instance.project.analyses.Disassembly(function=function, include_ir=include_ir)
+
+
+class DisassembleFunctionJob(InstanceJob):
+    """
+    Disassemble a function, or lift it to AIL, for a view that displays it. The result is the Disassembly or Clinic
+    analysis of the function, or None if it could not be created.
+
+    Both analyses read the knowledge base, and lifting writes the variables of the function to it, so the job never
+    runs concurrently with other jobs that write to the knowledge base.
+    """
+
+    mutates_kb = True
+
+    def __init__(
+        self,
+        instance: Instance,
+        function: Function,
+        ail: bool = False,
+        include_ir: bool = False,
+        priority: JobPriority = JobPriority.INTERACTIVE,
+        on_finish: Callable[[Disassembly | Clinic | None], None] | None = None,
+    ) -> None:
+        """
+        :param ail:         Lift the function to AIL instead of disassembling it.
+        :param include_ir:  Include the lifter IR in the disassembly.
+        :param priority:    INTERACTIVE if the function is displayed, SPECULATIVE if it is prepared in advance.
+        """
+        super().__init__(f"Disassembling {function.name}", instance, on_finish=on_finish)
+        self.priority = priority
+        self.function = function
+        self.ail = ail
+        self.include_ir = include_ir
+
+    def run(self, ctx: JobContext) -> Disassembly | Clinic | None:
+        try:
+            return disassemble_function(self.instance, self.function, ail=self.ail, include_ir=self.include_ir)
+        except Exception:  # pylint:disable=broad-except
+            _l.exception("Failed to disassemble function %s", self.function.name)
+            return None
+
+    def __repr__(self) -> str:
+        return "DisassembleFunctionJob"
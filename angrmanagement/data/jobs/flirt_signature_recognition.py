@@ -5,12 +5,16 @@ from typing import TYPE_CHECKING
 
 import angr.flirt
 
-from .job import InstanceJob
+from .job import InstanceJob, JobPriority
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from angrmanagement.data.instance import Instance
     from angrmanagement.logic.jobmanager import JobContext
 
+    from .job import Job
+
 _l = logging.getLogger(name=__name__)
 
 
@@ -19,8 +23,11 @@ class FlirtSignatureRecognitionJob(InstanceJob):
     Describes a job for using FLIRT signatures to recognize and match library functions embedded in a binary.
     """
 
-    def __init__(self, instance: Instance, on_finish=None) -> None:
-        super().__init__("Applying FLIRT signatures", instance, on_finish=on_finish)
+    priority = JobPriority.BACKGROUND
+    mutates_kb = True
+
+    def __init__(self, instance: Instance, on_finish=None, depends_on: Iterable[Job] | None = None) -> None:
+        super().__init__("Applying FLIRT signatures", instance, on_finish=on_finish, depends_on=depends_on)
 
     def run(self, _: JobContext) -> None:
         if self.instance.project.arch.name.lower() in angr.flirt.FLIRT_SIGNATURES_BY_ARCH:
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from angr.utils.mp import Initializer
+
+from angrmanagement.config import Conf
+from angrmanagement.logic.threads import gui_thread_schedule
+
+from .job import InstanceJob, JobPriority
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import angr
+    from angr.knowledge_plugins.functions import Function
+
+    from angrmanagement.data.instance import Instance
+    from angrmanagement.logic.jobmanager import JobContext
+
+    from .job import Job
+
+
+_l = logging.getLogger(name=__name__)
+
+# the project and job context of the current pool worker process
+_worker_project: angr.Project | None = None
+_worker_context: Any = None
+
+
+def _init_worker(project: angr.Project, context: Any) -> None:
+    global _worker_project, _worker_context  # pylint:disable=global-statement
+    _worker_project = project
+    _worker_context = context
+    Initializer.get().initialize()
+
+
+def _process_chunk(job_cls: type[FunctionBatchJob], func_addrs: list[int]) -> list[tuple[int, Any]]:
+    """
+    Process a chunk of functions in a pool worker process.
+    """
+    assert _worker_project is not None
+    results = []
+    for func_addr in func_addrs:
+        func = _worker_project.kb.functions.function(addr=func_addr)
+        if func is not None:
+            results.append((func_addr, job_cls.process_function(_worker_project, func, _worker_context)))
+    return results
+
+
+def default_function_batch_workers() -> int:
+    """
+    The number of pool workers to use for function batch jobs, as configured by `function_batch_workers`.
+    """
+    workers = Conf.function_batch_workers
+    if workers < 0:
+        workers = multiprocessing.cpu_count() - 1
+    return max(workers, 0)
+
+
+class FunctionBatchJob(InstanceJob):
+    """
+    The base class of jobs that run the same, independent analysis on many functions of the knowledge base.
+
+    The functions are processed either in the job's worker thread, or in chunks on a pool of worker processes that
+    each own a forked (or, on platforms that do not support fork, an unpickled) copy of the project. Results computed
+    by pool workers are merged back into the knowledge base on the GUI thread. The job is preemptible between
+    functions (or chunks of functions).
+    """
+
+    priority = JobPriority.BACKGROUND
+    preemptible = True
+    mutates_kb = True
+
+    # spawning a pool is not worth it for a handful of functions
+    MIN_FUNCTIONS_PER_WORKER = 64
+    CHUNKS_PER_WORKER = 8
+
+    def __init__(
+        self,
+        name: str,
+        instance: Instance,
+        on_finish=None,
+        workers: int | None = None,
+        depends_on: Iterable[Job] | None = None,
+    ) -> None:
+        super().__init__(name, instance, on_finish=on_finish, depends_on=depends_on)
+        self.workers = default_function_batch_workers() if workers is None else workers
+
+        # kept across suspensions so that a resumed job continues with the next unprocessed function
+        self._func_addrs: list[int] | None = None
+        self._next_idx = 0
+
+    def select_function(self, func: Function) -> bool:
+        """
+        Decide if a function should be processed. This method is called in the job's worker thread.
+        """
+        return True
+
+    def collect_function_addrs(self) -> list[int]:
+        """
+        Get the addresses of all functions to process, in processing order. This method is called in the job's worker
+        thread when the job starts (but not when it is resumed).
+        """
+        return [func.addr for func in self.instance.kb.functions.values() if self.select_function(func)]
+
+    def worker_context(self) -> Any:
+        """
+        Extra state that process_function() needs, in addition to the project. It is handed to each pool worker once.
+        """
+        return None
+
+    @staticmethod
+    def process_function(project: angr.Project, func: Function, context: Any) -> Any:
+        """
+        Process a function and return a picklable result. This method may be called in another process.
+        """
+        raise NotImplementedError
+
+    def process_function_locally(self, func: Function, context: Any) -> Any:
+        """
+        Process a function in the job's worker thread, which is done when no pool is used. The result is handed to
+        apply_result() as is, so it may refer to the live objects of this session instead of being picklable.
+        """
+        return self.process_function(self.instance.project.am_obj, func, context)
+
+    def apply_result(self, func: Function, result: Any) -> None:
+        """
+        Store the result of process_function() or process_function_locally() for a function.
+        """
+        raise NotImplementedError
+
+    def run(self, ctx: JobContext) -> None:
+        if self._func_addrs is None:
+            self._func_addrs = self.collect_function_addrs()
+
+        workers = min(self.workers, len(self._func_addrs) // self.MIN_FUNCTIONS_PER_WORKER)
+        if workers <= 1:
+            self._run_serially(ctx)
+        else:
+            self._run_in_pool(ctx, workers)
+
+    def _run_serially(self, ctx: JobContext) -> None:
+        func_count = len(self._func_addrs)
+        context = self.worker_context()
+        while self._next_idx < func_count:
+            ctx.checkpoint()
+            func = self.instance.kb.functions.function(addr=self._func_addrs[self._next_idx])
+            self._next_idx += 1
+            if func is not None:
+                self.apply_result(func, self.process_function_locally(func, context))
+
+            ctx.set_progress(self._next_idx / func_count * 100)
+
+    def _run_in_pool(self, ctx: JobContext, workers: int) -> None:
+        func_count = len(self._func_addrs)
+        remaining = self._func_addrs[self._next_idx :]
+        chunk_size = max(len(remaining) // (workers * self.CHUNKS_PER_WORKER), 1)
+        chunks = [remaining[i : i + chunk_size] for i in range(0, len(remaining), chunk_size)]
+
+        mp_context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+        _l.info("%s: processing %d functions on %d pool workers", self.name, len(remaining), workers)
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self.instance.project.am_obj, self.worker_context()),
+        )
+        try:
+            # results are consumed in submission order, so _next_idx always points to the first unprocessed function
+            all_results = executor.map(_process_chunk, [type(self)] * len(chunks), chunks)
+            for chunk, results in zip(chunks, all_results, strict=True):
+                gui_thread_schedule(self._apply_results, args=(results,))
+                self._next_idx += len(chunk)
+                ctx.set_progress(self._next_idx / func_count * 100)
+                ctx.checkpoint()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _apply_results(self, results: list[tuple[int, Any]]) -> None:
+        for func_addr, result in results:
+            func = self.instance.kb.functions.function(addr=func_addr)
+            if func is not None:
+                self.apply_result(func, result)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .job import InstanceJob, JobPriority
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from angrmanagement.data.instance import Instance
+    from angrmanagement.data.strings_index import StringsIndex
+    from angrmanagement.logic.jobmanager import JobContext
+
+    from .job import Job
+
+
+class IndexSymbolsJob(InstanceJob):
+    """
+    Bring the symbol index and the strings index of an instance up to date. The result is the strings index that was
+    synchronized, and whether any string was added or removed.
+
+    The job only reads the knowledge base, so it does not hold up the jobs that write to it. It should depend on the
+    job that recovers the CFG, which adds to the knowledge base all the time.
+    """
+
+    priority = JobPriority.BACKGROUND
+
+    def __init__(
+        self,
+        instance: Instance,
+        rebuild_references: bool = False,
+        on_finish: Callable[[tuple[StringsIndex, bool]], None] | None = None,
+        depends_on: Iterable[Job] | None = None,
+    ) -> None:
+        """
+        :param rebuild_references:  Find the functions that reference each string again.
+        """
+        super().__init__("Indexing symbols and strings", instance, on_finish=on_finish, depends_on=depends_on)
+        self.rebuild_references = rebuild_references
+
+    def run(self, ctx: JobContext) -> tuple[StringsIndex, bool]:
+        self.instance.update_symbol_index()
+        index = self.instance.strings_index.am_obj
+        return index, self.instance.update_strings_index(rebuild_references=self.rebuild_references)
+
+    def __repr__(self) -> str:
+        return "IndexSymbolsJob"
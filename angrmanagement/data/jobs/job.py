@@ -3,14 +3,14 @@ from __future__ import annotations
 import datetime
 import logging
 import time
-from enum import Enum
+from enum import Enum, IntEnum
 from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 from angrmanagement.logic import GlobalInfo
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
 
     from IPython.extensions.autoreload import ModuleReloader
 
@@ -48,6 +48,18 @@ class JobState(Enum):
     FAILED = 4
 
 
+class JobPriority(IntEnum):
+    """
+    The scheduling priority of a job. Jobs with a lower value are dispatched first.
+    """
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    # work that the user may or may not need soon, e.g., prefetching neighbors of the current function
+    SPECULATIVE = 2
+    BACKGROUND = 3
+
+
 class Job:
     """
     The base class of all Jobs in angr management.
@@ -59,10 +71,24 @@ class Job:
     start_at: float
     blocking: bool
     state: JobState = JobState.PENDING
+    priority: JobPriority = JobPriority.NORMAL
+    # preemptible jobs call JobContext.checkpoint() regularly and can resume from their last checkpoint
+    preemptible: bool = False
+    # jobs that write to the knowledge base are never run concurrently with each other
+    mutates_kb: bool = False
+    suspend_requested: bool
+    suspend_count: int
+    dependencies: list[Job]
     _on_finish: Callable[[Any], None] | None
     result: Any
 
-    def __init__(self, name: str, on_finish: Callable[[Any], None] | None = None, blocking: bool = False) -> None:
+    def __init__(
+        self,
+        name: str,
+        on_finish: Callable[[Any], None] | None = None,
+        blocking: bool = False,
+        depends_on: Iterable[Job] | None = None,
+    ) -> None:
         self.name = name
         self.progress_percentage = 0.0
         self.last_text = None
@@ -70,6 +96,10 @@ class Job:
         self.blocking = blocking
         self.cancelled = False
         self.result = None
+        # jobs that must have finished (including their finish callbacks) before this job is dispatched
+        self.dependencies = list(depends_on) if depends_on is not None else []
+        self.suspend_requested = False
+        self.suspend_count = 0
 
         # callbacks
         self._on_finish = on_finish
@@ -108,7 +138,12 @@ class InstanceJob(Job):
     instance: Instance
 
     def __init__(
-        self, name: str, instance: Instance, on_finish: Callable[[Any], None] | None = None, blocking: bool = False
+        self,
+        name: str,
+        instance: Instance,
+        on_finish: Callable[[Any], None] | None = None,
+        blocking: bool = False,
+        depends_on: Iterable[Job] | None = None,
     ):
-        super().__init__(name, on_finish, blocking)
+        super().__init__(name, on_finish, blocking, depends_on=depends_on)
         self.instance = instance
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from capstone import CS_OP_IMM, CS_OP_MEM
+
+from angrmanagement.data.operand_index import OperandValueIndex, function_fingerprint
+
+from .function_batch import FunctionBatchJob
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import angr
+    from angr.knowledge_plugins.functions import Function
+
+    from angrmanagement.data.instance import Instance
+    from angrmanagement.logic.jobmanager import JobContext
+
+    from .job import Job
+
+
+class OperandIndexingJob(FunctionBatchJob):
+    """
+    Job for indexing the immediate and displacement operand values of the instructions of all functions. The job
+    results in an OperandValueIndex.
+    """
+
+    # the index is collected in the job, not stored in the knowledge base
+    mutates_kb = False
+
+    def __init__(
+        self, instance: Instance, on_finish=None, workers: int | None = None, depends_on: Iterable[Job] | None = None
+    ) -> None:
+        super().__init__("Indexing operands", instance, on_finish=on_finish, workers=workers, depends_on=depends_on)
+        self._entries: list[tuple[int, int, int]] = []
+        self._fingerprint = 0
+
+    def collect_function_addrs(self) -> list[int]:
+        self._fingerprint = function_fingerprint(self.instance.kb.functions.function_addrs_set)
+        return super().collect_function_addrs()
+
+    def select_function(self, func: Function) -> bool:
+        return not func.is_simprocedure and not func.is_syscall and not func.is_alignment
+
+    @staticmethod
+    def process_function(
+        project: angr.Project, func: Function, context: None  # pylint:disable=unused-argument
+    ) -> list[tuple[int, int, int]]:
+        bits = project.arch.bits
+        entries = []
+        for block in func.blocks:
+            for insn in block.capstone.insns:
+                for op_idx, op in enumerate(getattr(insn, "operands", ())):
+                    if op.type == CS_OP_IMM:
+                        value = op.imm
+                        # immediates are sign-extended by capstone. only x86 operands know their widths
+                        width = getattr(op, "size", 0) * 8
+                        if not 0 < width < bits:
+                            width = bits
+                    elif op.type == CS_OP_MEM and op.mem.disp != 0:
+                        value = op.mem.disp
+                        width = bits
+                    else:
+                        continue
+                    entries.append((value & ((1 << width) - 1), insn.address, op_idx))
+        return entries
+
+    def apply_result(self, func: Function, result: list[tuple[int, int, int]]) -> None:
+        self._entries.extend(result)
+
+    def run(self, ctx: JobContext) -> OperandValueIndex:
+        super().run(ctx)
+        return OperandValueIndex(self._entries, fingerprint=self._fingerprint)
+
+    def __repr__(self) -> str:
+        return "OperandIndexingJob"
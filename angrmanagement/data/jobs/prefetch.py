@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from angrmanagement.logic import GlobalInfo
+from angrmanagement.logic.threads import gui_thread_schedule_async
+
+from .decompile_function import decompile_function
+from .job import InstanceJob, JobPriority, JobState
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from angr.knowledge_plugins.functions import Function
+
+    from angrmanagement.data.instance import Instance
+    from angrmanagement.logic.jobmanager import JobContext
+    from angrmanagement.logic.prefetcher import Prefetcher
+
+
+_l = logging.getLogger(name=__name__)
+
+
+class PrefetchFunctionsJob(InstanceJob):
+    """
+    Speculatively disassemble, and optionally decompile, functions that the user is likely to open next. The list of
+    functions can be replaced while the job is pending or running (see retarget()), in which case the functions that
+    have not been processed yet are dropped.
+
+    Decompiling writes to the knowledge bases, so the job never runs concurrently with other jobs that do.
+    """
+
+    priority = JobPriority.SPECULATIVE
+    preemptible = True
+    mutates_kb = True
+
+    def __init__(
+        self,
+        instance: Instance,
+        prefetcher: Prefetcher,
+        func_addrs: Iterable[int],
+        decompiler_args: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        :param decompiler_args: Arguments to the Decompiler analysis, or None to only prefetch disassembly.
+        """
+        super().__init__("Prefetching", instance)
+        self.prefetcher = prefetcher
+
+        self._lock = threading.Lock()
+        self._queue: deque[int] = deque(func_addrs)
+        self._decompiler_args = decompiler_args
+        self._processed = 0
+        # set once the job has run out of functions. it will not pick up new ones after that
+        self._exhausted = False
+
+    def retarget(self, func_addrs: Iterable[int], decompiler_args: dict[str, Any] | None) -> bool:
+        """
+        Replace the functions that are still to be prefetched. Returns False if the job is done (or about to be), in
+        which case a new job must be created.
+        """
+        with self._lock:
+            if self._exhausted or self.state not in (JobState.PENDING, JobState.RUNNING):
+                return False
+            self._queue = deque(func_addrs)
+            self._decompiler_args = decompiler_args
+            self._processed = 0
+            return True
+
+    def _next_function(self) -> tuple[int | None, dict[str, Any] | None]:
+        with self._lock:
+            if not self._queue:
+                self._exhausted = True
+                return None, None
+            return self._queue.popleft(), self._decompiler_args
+
+    def run(self, ctx: JobContext) -> None:
+        while True:
+            ctx.checkpoint()
+            func_addr, decompiler_args = self._next_function()
+            if func_addr is None:
+                break
+            func = self.instance.kb.functions.function(addr=func_addr)
+            if func is not None:
+                try:
+                    self._prefetch(func, decompiler_args)
+                except Exception:  # pylint:disable=broad-except
+                    # prefetching is best-effort. the view will report the error when the function is opened
+                    _l.debug("Failed to prefetch function %s", func.name, exc_info=True)
+
+            self._processed += 1
+            ctx.set_progress(self._processed / (self._processed + len(self._queue)) * 100)
+
+    def _prefetch(self, func: Function, decompiler_args: dict[str, Any] | None) -> None:
+        if not self.prefetcher.has_disassembly(func.addr):
+            disasm = self.instance.project.analyses.Disassembly(function=func)
+            self.prefetcher.store_disassembly(func.addr, disasm)
+
+        # functions whose calling conventions are not known yet are left alone. CodeView runs variable recovery on
+        # them first, and doing that speculatively would be too expensive
+        if (
+            decompiler_args is not None
+            and func.ran_cca
+            and "pseudocode" not in self.instance.kb.decompilations.available_flavors(func.addr)
+        ):
+            decompile_function(self.instance, func, decompiler_args)
+            self.prefetcher.mark_decompiled(func.addr)
+            gui_thread_schedule_async(GlobalInfo.main_window.workspace.plugins.decompile_callback, args=(func,))
+
+    def __repr__(self) -> str:
+        return "PrefetchFunctionsJob"
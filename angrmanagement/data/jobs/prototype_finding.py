@@ -1,26 +1,44 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from .job import InstanceJob
+from .function_batch import FunctionBatchJob
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import angr
+    from angr.knowledge_plugins.functions import Function
+
     from angrmanagement.data.instance import Instance
-    from angrmanagement.logic.jobmanager import JobContext
 
+    from .job import Job
+
+
+class PrototypeFindingJob(FunctionBatchJob):
+    # attributes of a function that Function.find_declaration() may update
+    DECLARATION_ATTRS = ("prototype", "prototype_libname", "is_prototype_guessed", "calling_convention")
+
+    def __init__(
+        self, instance: Instance, on_finish=None, workers: int | None = None, depends_on: Iterable[Job] | None = None
+    ) -> None:
+        super().__init__(
+            "Function prototype finding", instance, on_finish=on_finish, workers=workers, depends_on=depends_on
+        )
 
-class PrototypeFindingJob(InstanceJob):
-    def __init__(self, instance: Instance, on_finish=None) -> None:
-        super().__init__("Function prototype finding", instance, on_finish=on_finish)
+    def select_function(self, func: Function) -> bool:
+        return func.is_simprocedure or func.is_plt
 
-    def run(self, ctx: JobContext) -> None:
-        func_count = len(self.instance.kb.functions)
-        for i, func in enumerate(self.instance.kb.functions.values()):
-            if func.is_simprocedure or func.is_plt:
-                func.find_declaration()
+    @staticmethod
+    def process_function(
+        project: angr.Project, func: Function, context: None  # pylint:disable=unused-argument
+    ) -> dict[str, Any]:
+        func.find_declaration()
+        return {attr: getattr(func, attr) for attr in PrototypeFindingJob.DECLARATION_ATTRS if hasattr(func, attr)}
 
-            percentage = i / func_count * 100
-            ctx.set_progress(percentage)
+    def apply_result(self, func: Function, result: dict[str, Any]) -> None:
+        for attr, value in result.items():
+            setattr(func, attr, value)
 
     def __repr__(self) -> str:
         return "PrototypeFindingJob"
@@ -1,21 +1,34 @@
 from __future__ import annotations
 
+import functools
 from typing import TYPE_CHECKING
 
+import networkx
+from angr.utils.graph import GraphUtils
+
 from angrmanagement.logic.threads import gui_thread_schedule_async
 
-from .job import InstanceJob
+from .job import InstanceJob, JobPriority
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from angrmanagement.data.instance import Instance
     from angrmanagement.logic.jobmanager import JobContext
 
+    from .job import Job
+
+# the number of functions handed to each worker process between two checkpoints of a whole-program recovery
+FUNCTIONS_PER_WORKER = 64
+
 
 class VariableRecoveryJob(InstanceJob):
     """
     Identify variables and recover calling convention for a specific, or all function if no function is specified.
     """
 
+    mutates_kb = True
+
     def __init__(
         self,
         instance: Instance,
@@ -24,9 +37,18 @@ class VariableRecoveryJob(InstanceJob):
         workers: int | None = None,
         func_addr: int | None = None,
         auto_start: bool = False,
+        depends_on: Iterable[Job] | None = None,
         **kwargs,
     ) -> None:
-        super().__init__("Variable Recovery", instance, on_finish=on_finish)
+        super().__init__("Variable Recovery", instance, on_finish=on_finish, depends_on=depends_on)
+
+        # recovering variables of a single function is usually requested by the user (e.g., before decompiling it)
+        self.priority = JobPriority.INTERACTIVE if func_addr is not None else JobPriority.BACKGROUND
+        # CompleteCallingConventions commits its results to the knowledge base function by function and skips functions
+        # that it has already analyzed, so a suspended whole-program recovery resumes where it stopped when re-run.
+        # with worker processes, functions are analyzed in batches, and the job is only suspended between two batches,
+        # after the workers of the last batch are gone
+        self.preemptible = func_addr is None
 
         self.variable_recovery_args = kwargs
         self.on_variable_recovered = on_variable_recovered
@@ -37,23 +59,26 @@ class VariableRecoveryJob(InstanceJob):
         self.func_addr = func_addr
         self.func_addrs_to_prioritize = set() if func_addr is None else {func_addr}
 
+        self._analyzed_func_addrs: set[int] = set()
         self._last_progress_callback_triggered = None
 
+    @property
+    def _batched(self) -> bool:
+        return self.func_addr is None and bool(self.workers)
+
     def prioritize_function(self, func_addr: int) -> None:
         """
         Prioritize the specified function and its callee functions.
 
         :param func_addr:   Address of the function to prioritize.
         """
-        if not self.started:
-            # hasn't started - cache all requests
+        if not self.started or self.ccc is None or self._batched:
+            # hasn't started, is suspended, or picks the functions of its next batch - cache all requests
             self.func_addrs_to_prioritize.add(func_addr)
             return
 
         if self.instance is None:
             return
-        if self.ccc is None:
-            return
 
         # find its callee functions
         callees = set(self.instance.kb.functions.callgraph.successors(func_addr))
@@ -63,6 +88,9 @@ class VariableRecoveryJob(InstanceJob):
         self.started = True
 
         cc_callback = self._cc_callback if self.on_variable_recovered is not None else None
+        if self._batched:
+            self._run_batches(ctx, cc_callback)
+            return
 
         # update addrs to prioritize with their callees
         func_addrs_to_prioritize = set()
@@ -76,7 +104,7 @@ class VariableRecoveryJob(InstanceJob):
             recover_variables=True,
             low_priority=True,
             cfg=self.instance.cfg.am_obj,
-            progress_callback=ctx.set_progress,
+            progress_callback=functools.partial(self._progress_callback, ctx),
             cc_callback=cc_callback,
             analyze_callsites=True,
             max_function_blocks=300,
@@ -87,9 +115,91 @@ class VariableRecoveryJob(InstanceJob):
             auto_start=self.auto_start,
             **self.variable_recovery_args,
         )
-        self.ccc.work()
+        try:
+            self.ccc.work()
+        finally:
+            self.ccc = None
 
-        self.ccc = None
+    def _run_batches(self, ctx: JobContext, cc_callback) -> None:
+        """
+        Recover variables of all functions with worker processes, one batch of functions at a time. Each batch is
+        finished and its workers are joined before the job checks whether it should suspend.
+        """
+        kb = self.instance.kb
+        force = self.variable_recovery_args.get("force", False)
+        # callees go first, so that their prototypes are known when their callers are analyzed
+        sorted_funcs = GraphUtils.quasi_topological_sort_nodes(networkx.DiGraph(kb.functions.callgraph))
+        remaining = {}
+        for func_addr in reversed(sorted_funcs):
+            if func_addr in self._analyzed_func_addrs or func_addr not in kb.functions:
+                continue
+            func = kb.functions.get_by_addr(func_addr)
+            if func.is_alignment or (not force and func.calling_convention is not None and func.prototype is not None):
+                continue
+            remaining[func_addr] = None
+
+        batch_size = self.workers * FUNCTIONS_PER_WORKER
+        total = len(self._analyzed_func_addrs) + len(remaining)
+        while remaining:
+            ctx.checkpoint()
+
+            batch = [func_addr for func_addr in self._take_prioritized_functions() if func_addr in remaining]
+            for func_addr in remaining:
+                if len(batch) >= batch_size:
+                    break
+                if func_addr not in batch:
+                    batch.append(func_addr)
+            for func_addr in batch:
+                del remaining[func_addr]
+
+            self.ccc = self.instance.project.analyses.CompleteCallingConventions(
+                recover_variables=True,
+                low_priority=True,
+                cfg=self.instance.cfg.am_obj,
+                progress_callback=functools.partial(
+                    self._batch_progress_callback, ctx, len(self._analyzed_func_addrs), len(batch), total
+                ),
+                cc_callback=cc_callback,
+                analyze_callsites=True,
+                max_function_blocks=300,
+                max_function_size=4096,
+                workers=self.workers,
+                prioritize_func_addrs=set(batch),
+                skip_other_funcs=True,
+                auto_start=False,
+                **self.variable_recovery_args,
+            )
+            try:
+                self.ccc.work()
+            finally:
+                self.ccc = None
+            self._analyzed_func_addrs.update(batch)
+
+    def _take_prioritized_functions(self) -> list[int]:
+        """
+        Get the functions that have been prioritized since the last batch started, with their callees first.
+        """
+        kb = self.instance.kb
+        prioritized = set(self.func_addrs_to_prioritize)
+        self.func_addrs_to_prioritize -= prioritized
+        func_addrs = []
+        for func_addr in prioritized:
+            if func_addr in kb.functions:
+                func_addrs.extend(kb.functions.callgraph.successors(func_addr))
+                func_addrs.append(func_addr)
+        return list(dict.fromkeys(func_addrs))
+
+    @staticmethod
+    def _batch_progress_callback(
+        ctx: JobContext, done: int, batch_size: int, total: int, percentage: float, text: str = ""
+    ) -> None:
+        # the workers of the batch are still running, so the job must not suspend here
+        ctx.set_progress((done + batch_size * percentage / 100.0) / total * 100.0, text)
+
+    def _progress_callback(self, ctx: JobContext, percentage: float, text: str = "") -> None:
+        ctx.set_progress(percentage, text)
+        if self.preemptible:
+            ctx.checkpoint()
 
     def _cc_callback(self, func_addr: int) -> None:
         gui_thread_schedule_async(self.on_variable_recovered, args=(func_addr,))
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class LineIndex:
+    """
+    Maps the objects of a linear listing, keyed by their address, to the lines they are displayed on. Each object takes
+    a number of lines, and the objects are laid out in the order of their addresses.
+
+    Line counts are kept in a Fenwick tree, so changing the line count of an object, finding the first line of an
+    object, and finding the object on a line take O(log n). Objects that are added after the index was built are
+    merged into the tree in one go the next time the index is queried.
+    """
+
+    def __init__(self, items: Iterable[tuple[int, int]] = ()) -> None:
+        """
+        :param items:   Pairs of object addresses and line counts.
+        """
+        self._addrs: list[int] = []
+        self._lines: list[int] = []
+        self._tree: list[int] = [0]
+        self._positions: dict[int, int] = {}
+        # objects that have not been merged into the tree yet
+        self._pending: dict[int, int] = {}
+        self._build(dict(items))
+
+    def __len__(self) -> int:
+        self._flush()
+        return len(self._addrs)
+
+    def __contains__(self, addr: int) -> bool:
+        return addr in self._positions or addr in self._pending
+
+    @property
+    def total_lines(self) -> int:
+        self._flush()
+        return self._prefix_sum(len(self._addrs))
+
+    def lines(self, addr: int) -> int | None:
+        """
+        Get the line count of the object at `addr`, or None if there is no object at `addr`.
+        """
+        if addr in self._pending:
+            return self._pending[addr]
+        pos = self._positions.get(addr, None)
+        return None if pos is None else self._lines[pos]
+
+    def set_lines(self, addr: int, lines: int) -> None:
+        """
+        Set the line count of the object at `addr`, adding the object if it is not in the index.
+        """
+        lines = max(lines, 0)
+        pos = self._positions.get(addr, None)
+        if pos is None:
+            self._pending[addr] = lines
+            return
+        delta = lines - self._lines[pos]
+        if delta:
+            self._lines[pos] = lines
+            self._update(pos, delta)
+
+    def line_of(self, addr: int) -> int:
+        """
+        Get the first line of the object at `addr`, or of the last object before `addr` if there is no object at
+        `addr`. Addresses before the first object are on line 0.
+        """
+        self._flush()
+        pos = bisect.bisect_right(self._addrs, addr) - 1
+        if pos < 0:
+            return 0
+        return self._prefix_sum(pos)
+
+    def locate(self, line: int) -> tuple[int, int] | None:
+        """
+        Find the object that is displayed on a line.
+
+        :return:    The address of the object and the line within the object, or None if the index is empty. Lines
+                    past the end are located in the last object.
+        """
+        self._flush()
+        n = len(self._addrs)
+        if n == 0:
+            return None
+        line = max(line, 0)
+
+        # find the last position whose prefix sum is at most `line`
+        pos = 0
+        remaining = line
+        step = 1 << n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= n and self._tree[nxt] <= remaining:
+                pos = nxt
+                remaining -= self._tree[nxt]
+            step >>= 1
+        # objects without lines are skipped by the search
+        if pos >= n:
+            pos = n - 1
+            remaining = line - self._prefix_sum(pos)
+        return self._addrs[pos], remaining
+
+    #
+    # Private methods
+    #
+
+    def _build(self, items: dict[int, int]) -> None:
+        self._addrs = sorted(items)
+        self._lines = [max(items[addr], 0) for addr in self._addrs]
+        self._positions = {addr: pos for pos, addr in enumerate(self._addrs)}
+        # build the Fenwick tree in linear time
+        tree = [0, *self._lines]
+        for i in range(1, len(tree)):
+            j = i + (i & -i)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self._tree = tree
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        items = dict(zip(self._addrs, self._lines, strict=True))
+        items.update(self._pending)
+        self._pending = {}
+        self._build(items)
+
+    def _update(self, pos: int, delta: int) -> None:
+        i = pos + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix_sum(self, count: int) -> int:
+        """
+        Sum the line counts of the first `count` objects.
+        """
+        total = 0
+        i = count
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
@@ -1,17 +1,66 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
 import traceback
+from typing import TYPE_CHECKING, Any
 
 from angrmanagement.utils.namegen import NameGenerator
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
 log = logging.getLogger(__name__)
 
 
+class ListenerStats:
+    """
+    How often a listener was called, and how long it took.
+    """
+
+    __slots__ = ("calls", "max_time", "total_time")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+    def __repr__(self) -> str:
+        return f"<ListenerStats calls={self.calls} total={self.total_time:.3f}s max={self.max_time:.3f}s>"
+
+
 class EventSentinel:
+    """
+    Notifies subscribers of events.
+
+    Sentinels can opt into coalescing events (see am_coalesce()), in which case the events that are posted in a short
+    window are delivered at once, on the GUI thread.
+    """
+
+    # schedules a callable to run on the GUI thread after a delay (in seconds). it is set up by the GUI, and events are
+    # not coalesced without it
+    am_scheduler: Callable[[Callable[[], None], float], None] | None = None
+    # record how long each listener takes to handle events, in am_listener_stats
+    am_profiling: bool = False
+
     def __init__(self, logging_permitted: bool = True) -> None:
         self.am_subscribers = []
         self.am_logging_permitted: bool = logging_permitted
+        # listener name -> stats
+        self.am_listener_stats: dict[str, ListenerStats] = {}
+
+        # coalescing. None if events are delivered as they are posted
+        self._am_coalesce_window: float | None = None
+        self._am_batch_keys: frozenset[str] = frozenset()
+        self._am_pending_lock = threading.Lock()
+        # the kwargs names of an event -> the merged kwargs of the pending events of this kind, in posting order
+        self._am_pending: dict[frozenset[str], dict[str, Any]] = {}
 
     def am_subscribe(self, listener) -> None:
         if listener is not None:
@@ -28,8 +77,60 @@ class EventSentinel:
                     print("Double-unsubscribe of listener")  # No f-string in case str uses logging
                     traceback.print_exc()
 
+    def am_coalesce(self, window: float = 0.0, batch_keys: Iterable[str] = ()) -> None:
+        """
+        Coalesce the events of this sentinel. Events with the same kwargs names that are posted within `window`
+        seconds (or within one iteration of the event loop, by default) are delivered once, on the GUI thread. The
+        delivered event carries the kwargs of the last of these events, except for the kwargs in `batch_keys`, which
+        carry the list of the values of all of them.
+
+        Subscribers must expect lists for the kwargs in `batch_keys`, whether or not events are actually coalesced.
+        """
+        self._am_coalesce_window = window
+        self._am_batch_keys = frozenset(batch_keys)
+
     def am_event(self, **kwargs) -> None:
+        if self._am_coalesce_window is None:
+            self._am_deliver(kwargs)
+            return
+
+        for key in self._am_batch_keys.intersection(kwargs):
+            kwargs[key] = [kwargs[key]]
+        if EventSentinel.am_scheduler is None:
+            self._am_deliver(kwargs)
+            return
+
+        kind = frozenset(kwargs)
+        with self._am_pending_lock:
+            pending = self._am_pending.get(kind, None)
+            if pending is not None:
+                for key, value in kwargs.items():
+                    if key in self._am_batch_keys:
+                        pending[key].extend(value)
+                    else:
+                        pending[key] = value
+                return
+            schedule = not self._am_pending
+            self._am_pending[kind] = kwargs
+        if schedule:
+            EventSentinel.am_scheduler(self._am_flush, self._am_coalesce_window)
+
+    def am_flush(self) -> None:
+        """
+        Deliver the pending coalesced events right away.
+        """
+        self._am_flush()
+
+    def _am_flush(self) -> None:
+        with self._am_pending_lock:
+            pending = list(self._am_pending.values())
+            self._am_pending.clear()
+        for kwargs in pending:
+            self._am_deliver(kwargs)
+
+    def _am_deliver(self, kwargs: dict[str, Any]) -> None:
         for listener in self.am_subscribers:
+            start = time.perf_counter() if EventSentinel.am_profiling else None
             try:
                 listener(**kwargs)
             except Exception:  # pylint: disable=broad-except
@@ -38,6 +139,15 @@ class EventSentinel:
                 else:
                     print("Error raised from event")  # No f-string in case str uses logging
                     traceback.print_exc()
+            if start is not None:
+                self._am_record(listener, time.perf_counter() - start)
+
+    def _am_record(self, listener, elapsed: float) -> None:
+        name = getattr(listener, "__qualname__", None) or repr(listener)
+        stats = self.am_listener_stats.get(name, None)
+        if stats is None:
+            stats = self.am_listener_stats[name] = ListenerStats()
+        stats.record(elapsed)
 
 
 class ObjectContainer(EventSentinel):
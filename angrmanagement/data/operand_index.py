@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import base64
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+MAX_VALUE = (1 << 64) - 1
+
+
+def function_fingerprint(func_addrs: Iterable[int]) -> int:
+    """
+    Summarize the addresses of the functions of a knowledge base, to tell if an index was built for them.
+    """
+    addrs = array("Q", sorted(func_addrs))
+    return (len(addrs) << 32) | zlib.crc32(addrs.tobytes())
+
+
+class OperandValueIndex:
+    """
+    Maps the immediate and displacement operand values of instructions to the instructions and operands they appear in.
+
+    The values are kept in a sorted array, with the instruction addresses and the operand indices in parallel arrays,
+    so that exact and range queries are binary searches. Values are unsigned 64-bit integers; negative operands are
+    expected to be stored in the two's complement of their width.
+
+    Each match is a (value, instruction address, operand index) tuple.
+    """
+
+    _HEADER = struct.Struct("<IIQ")
+    VERSION = 1
+
+    def __init__(self, entries: Iterable[tuple[int, int, int]] = (), fingerprint: int = 0) -> None:
+        """
+        :param entries:     Tuples of operand values, instruction addresses and operand indices, in any order.
+        :param fingerprint: The fingerprint of the functions that the entries were collected from.
+        """
+        entries = sorted((value & MAX_VALUE, insn_addr, op_idx) for value, insn_addr, op_idx in entries)
+        self.fingerprint = fingerprint
+        self._values = array("Q", (e[0] for e in entries))
+        self._insn_addrs = array("Q", (e[1] for e in entries))
+        self._op_indices = array("B", (e[2] for e in entries))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def find(self, value: int) -> list[tuple[int, int, int]]:
+        """
+        Find the operands with a value.
+        """
+        return self.find_range(value, value)
+
+    def find_range(self, lo: int, hi: int) -> list[tuple[int, int, int]]:
+        """
+        Find the operands with values between `lo` and `hi`, inclusive, sorted by their values.
+        """
+        lo = max(lo, 0)
+        hi = min(hi, MAX_VALUE)
+        if lo > hi:
+            return []
+        start = bisect_left(self._values, lo)
+        end = bisect_right(self._values, hi, lo=start)
+        return self._matches(range(start, end))
+
+    def find_masked(self, value: int, mask: int) -> list[tuple[int, int, int]]:
+        """
+        Find the operands whose values have the same bits as `value` where `mask` is set, sorted by their values.
+        """
+        mask &= MAX_VALUE
+        value &= mask
+        # the set bits of the mask above its highest clear bit select a range of values
+        low_bits = (~mask & MAX_VALUE).bit_length()
+        low_mask = (1 << low_bits) - 1
+        lo = value & ~low_mask
+        if mask == MAX_VALUE ^ low_mask:
+            # the mask has no other set bits
+            return self.find_range(lo, lo | low_mask)
+
+        # scan the range for the values that match the rest of the mask
+        start = bisect_left(self._values, lo)
+        end = bisect_right(self._values, lo | low_mask, lo=start)
+        values = self._values
+        return self._matches(i for i in range(start, end) if values[i] & mask == value)
+
+    #
+    # Serialization
+    #
+
+    def dumps(self) -> str:
+        """
+        Serialize the index to a string.
+        """
+        header = self._HEADER.pack(self.VERSION, len(self), self.fingerprint)
+        values, insn_addrs = self._values, self._insn_addrs
+        if sys.byteorder == "big":
+            values, insn_addrs = array("Q", values), array("Q", insn_addrs)
+            values.byteswap()
+            insn_addrs.byteswap()
+        data = header + values.tobytes() + insn_addrs.tobytes() + self._op_indices.tobytes()
+        return base64.b64encode(zlib.compress(data)).decode("ascii")
+
+    @classmethod
+    def loads(cls, s: str) -> OperandValueIndex:
+        """
+        Deserialize an index from a string that dumps() created.
+
+        :raises ValueError: If the string is not a serialized index of this version.
+        """
+        try:
+            data = zlib.decompress(base64.b64decode(s))
+        except (ValueError, zlib.error) as ex:
+            raise ValueError("Corrupted operand index") from ex
+        if len(data) < cls._HEADER.size:
+            raise ValueError("Corrupted operand index")
+        version, count, fingerprint = cls._HEADER.unpack_from(data)
+        if version != cls.VERSION:
+            raise ValueError(f"Unsupported operand index version {version}")
+        if len(data) != cls._HEADER.size + count * 17:
+            raise ValueError("Corrupted operand index")
+
+        index = cls(fingerprint=fingerprint)
+        offset = cls._HEADER.size
+        index._values.frombytes(data[offset : offset + count * 8])
+        offset += count * 8
+        index._insn_addrs.frombytes(data[offset : offset + count * 8])
+        offset += count * 8
+        index._op_indices.frombytes(data[offset:])
+        if sys.byteorder == "big":
+            index._values.byteswap()
+            index._insn_addrs.byteswap()
+        return index
+
+    #
+    # Private methods
+    #
+
+    def _matches(self, indices: Iterable[int]) -> list[tuple[int, int, int]]:
+        values, insn_addrs, op_indices = self._values, self._insn_addrs, self._op_indices
+        return [(values[i], insn_addrs[i], op_indices[i]) for i in indices]
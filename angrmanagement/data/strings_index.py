@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import re
+import threading
+from typing import TYPE_CHECKING
+
+from angrmanagement.utils import filter_string_for_display
+
+from .trigram_index import TrigramIndex
+
+if TYPE_CHECKING:
+    from angr.knowledge_plugins.cfg import CFGModel
+    from angr.knowledge_plugins.xrefs import XRefManager
+    from cle import Loader
+
+
+# the encodings of the sorts of memory data that are strings
+STRING_ENCODINGS = {"string": "utf-8", "unicode": "utf_16_le"}
+
+_REGEX_META = set(".^$*+?{}[]()|\\")
+_QUANTIFIER_RE = re.compile(r"\{\d*(?:,\d*)?\}")
+
+
+def required_literal(pattern: str) -> str:
+    """
+    Find a run of literal characters that every match of a regular expression contains, for prefiltering. The run is
+    empty if none can be found, e.g., if the pattern has alternatives.
+
+    Literals in groups count only if the group must match once or more. Lookarounds, backreferences, and groups that
+    are optional or may repeat zero times contribute nothing, and inline flags make the run empty.
+    """
+    if "|" in pattern:
+        return ""
+    # the best run found outside of each group that is being parsed, and whether that group contributes its runs
+    stack: list[tuple[str, bool]] = []
+    contributes = True
+    best = run = ""
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "(":
+            stack.append((max(best, run, key=len), contributes))
+            best = run = ""
+            i += 1
+            if pattern[i : i + 1] == "?":
+                ext = pattern[i + 1 : i + 3]
+                if ext[:1] == ":":
+                    i += 2
+                elif ext == "P<":
+                    end = pattern.find(">", i)
+                    i = len(pattern) if end < 0 else end + 1
+                elif ext[:1] in ("=", "!", "<") or ext == "P=":
+                    # lookarounds and backreferences
+                    contributes = False
+                    i += 1
+                else:
+                    # inline flags, e.g., (?i), change how literals match
+                    return ""
+            continue
+        if c == ")":
+            if not stack:
+                return ""
+            group_best = max(best, run, key=len)
+            i += 1
+            if not contributes or pattern[i : i + 1] in ("?", "*", "{"):
+                # the group may match nothing
+                group_best = ""
+            best, contributes = stack.pop()
+            best = max(best, group_best, key=len)
+            run = ""
+            continue
+
+        if c == "\\":
+            escaped = pattern[i + 1 : i + 2]
+            # escaped punctuation is literal, while escaped letters and digits are classes, anchors or references
+            ch = escaped if escaped and not escaped.isalnum() else None
+            i += 2
+        elif c == "[":
+            # skip the character class. a "]" right after "[" or "[^" is a literal
+            j = i + 1
+            if pattern[j : j + 1] == "^":
+                j += 1
+            end = pattern.find("]", j + 1)
+            ch = None
+            i = len(pattern) if end < 0 else end + 1
+        elif c == "{":
+            # a brace that does not start a quantifier is a literal
+            m = _QUANTIFIER_RE.match(pattern, i)
+            ch = None if m is not None else c
+            i = m.end() if m is not None else i + 1
+        elif c in _REGEX_META:
+            ch = None
+            i += 1
+        else:
+            ch = c
+            i += 1
+
+        quantifier = pattern[i : i + 1]
+        if ch is not None and quantifier in ("?", "*", "{"):
+            # the character is optional
+            ch = None
+        if ch is None:
+            best = max(best, run, key=len)
+            run = ""
+        else:
+            run += ch
+            if quantifier == "+":
+                # the character may repeat, so the run cannot go on
+                best = max(best, run, key=len)
+                run = ""
+    if stack:
+        return ""
+    return max(best, run, key=len)
+
+
+def wildcard_to_regex(pattern: str) -> str:
+    """
+    Convert a wildcard pattern with "*" and "?" to an unanchored regular expression.
+    """
+    return "".join(".*" if c == "*" else "." if c == "?" else re.escape(c) for c in pattern)
+
+
+class StringEntry:
+    """
+    A string in the memory data of a CFG.
+    """
+
+    __slots__ = ("addr", "display", "encoding", "functions", "section", "size", "text")
+
+    def __init__(
+        self, addr: int, size: int, encoding: str, text: str, section: str | None, functions: frozenset[int]
+    ) -> None:
+        self.addr = addr
+        self.size = size
+        self.encoding = encoding
+        self.text = text
+        # the text with unprintable characters escaped
+        self.display = filter_string_for_display(text)
+        self.section = section
+        # the addresses of the functions that reference the string
+        self.functions = functions
+
+    @property
+    def length(self) -> int:
+        return len(self.text)
+
+
+class StringsIndex:
+    """
+    Indexes the strings in the memory data of a CFG, with where they are and which functions reference them, and
+    searches them by substring, wildcard or regular expression.
+
+    Strings are prefiltered with a trigram index over their display texts. Regular expressions are prefiltered with a
+    run of literal characters that all of their matches contain.
+
+    sync() only looks at strings that it has not looked at before, or whose sort or size changed, unless the CFG was
+    replaced. It may be called in a background thread: the index is only locked while the changes are applied.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cfg_model: CFGModel | None = None
+        # address -> StringEntry
+        self._entries: dict[int, StringEntry] = {}
+        # address -> the sort and size of the strings that were looked at
+        self._seen: dict[int, tuple[str, int]] = {}
+        # function address -> addresses of the strings it references
+        self._by_function: dict[int, set[int]] = {}
+        # address -> display text, in lowercase
+        self._texts: TrigramIndex = TrigramIndex()
+        # all entries, sorted by address. dropped whenever entries change
+        self._sorted: list[StringEntry] | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def cfg_model(self) -> CFGModel | None:
+        return self._cfg_model
+
+    def get(self, addr: int) -> StringEntry | None:
+        return self._entries.get(addr, None)
+
+    def entries(self, func_addr: int | None = None) -> list[StringEntry]:
+        """
+        Get the strings, or only the strings referenced by a function, sorted by their addresses.
+        """
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(self._entries.values(), key=lambda e: e.addr)
+            if func_addr is None:
+                return self._sorted
+            addrs = self._by_function.get(func_addr, ())
+            return sorted((self._entries[addr] for addr in addrs), key=lambda e: e.addr)
+
+    def search(self, pattern: str | re.Pattern, func_addr: int | None = None) -> list[StringEntry]:
+        """
+        Find the strings whose display texts match a pattern, ignoring case. String patterns are wildcard patterns,
+        which match anywhere in the text.
+        """
+        if isinstance(pattern, re.Pattern):
+            regex = re.compile(pattern.pattern, pattern.flags | re.IGNORECASE)
+        elif not pattern:
+            return self.entries(func_addr)
+        elif "*" in pattern or "?" in pattern:
+            regex = re.compile(wildcard_to_regex(pattern), re.IGNORECASE | re.DOTALL)
+        else:
+            regex = None
+
+        literal = pattern if regex is None else required_literal(regex.pattern)
+        with self._lock:
+            if func_addr is not None:
+                candidates = self._by_function.get(func_addr, set())
+                if literal:
+                    candidates = candidates & self._texts.search(literal)
+            elif literal:
+                candidates = self._texts.search(literal)
+            else:
+                candidates = self._entries.keys()
+            entries = [self._entries[addr] for addr in candidates]
+
+        if regex is not None:
+            entries = [e for e in entries if regex.search(e.display) is not None]
+        entries.sort(key=lambda e: e.addr)
+        return entries
+
+    def sync(
+        self,
+        cfg_model: CFGModel | None,
+        xrefs: XRefManager | None = None,
+        loader: Loader | None = None,
+        rebuild_references: bool = False,
+    ) -> bool:
+        """
+        Bring the index up to date with the memory data of a CFG.
+
+        :param xrefs:               The cross references to find the functions that reference each string with.
+        :param loader:              The loader to find the section of each string with.
+        :param rebuild_references:  Find the functions that reference each string again, e.g., once the CFG has been
+                                    recovered and more cross references are known.
+        :return:                    True if any string was added, removed or changed.
+        """
+        with self._lock:
+            replaced = cfg_model is not self._cfg_model
+            seen = {} if replaced else dict(self._seen)
+            entries = {} if replaced else dict(self._entries)
+        if cfg_model is None:
+            if replaced:
+                with self._lock:
+                    self._reset(None)
+            return replaced
+
+        # strings whose sort or size changed are looked at again, and memory data that is not a string is looked at
+        # every time, since it may turn out to be a string later on
+        current = {}
+        changed = []
+        for addr, item in list(cfg_model.memory_data.items()):
+            if item.sort not in STRING_ENCODINGS:
+                continue
+            signature = item.sort, item.size
+            current[addr] = signature
+            if seen.get(addr) != signature:
+                changed.append(item)
+        removed = seen.keys() - current.keys()
+        new_entries = [self._make_entry(item, cfg_model, xrefs, loader) for item in changed]
+
+        referenced = []
+        if rebuild_references and xrefs is not None:
+            changed_addrs = {item.addr for item in changed}
+            for addr, entry in entries.items():
+                if addr in changed_addrs or addr in removed:
+                    continue
+                functions = self._referencing_functions(addr, cfg_model, xrefs)
+                if functions != entry.functions:
+                    referenced.append((entry, functions))
+
+        if not removed and not changed and not referenced and not replaced:
+            return False
+
+        with self._lock:
+            if replaced:
+                self._reset(cfg_model)
+            for addr in removed:
+                self._remove(addr)
+            for item, entry in zip(changed, new_entries, strict=True):
+                self._remove(item.addr)
+                if entry is not None:
+                    # strings without content are looked at again
+                    self._seen[item.addr] = item.sort, item.size
+                    self._add(entry)
+            for entry, functions in referenced:
+                self._set_functions(entry, functions)
+            self._sorted = None
+        return True
+
+    #
+    # Private methods
+    #
+
+    def _reset(self, cfg_model: CFGModel | None) -> None:
+        self._cfg_model = cfg_model
+        self._entries = {}
+        self._seen = {}
+        self._by_function = {}
+        self._texts = TrigramIndex()
+        self._sorted = None
+
+    def _add(self, entry: StringEntry) -> None:
+        self._entries[entry.addr] = entry
+        self._texts.set(entry.addr, entry.display)
+        for func_addr in entry.functions:
+            self._by_function.setdefault(func_addr, set()).add(entry.addr)
+
+    def _remove(self, addr: int) -> None:
+        self._seen.pop(addr, None)
+        entry = self._entries.pop(addr, None)
+        if entry is None:
+            return
+        self._texts.discard(addr)
+        for func_addr in entry.functions:
+            addrs = self._by_function.get(func_addr, None)
+            if addrs is not None:
+                addrs.discard(addr)
+
+    def _set_functions(self, entry: StringEntry, functions: frozenset[int]) -> None:
+        for func_addr in entry.functions - functions:
+            addrs = self._by_function.get(func_addr, None)
+            if addrs is not None:
+                addrs.discard(entry.addr)
+        for func_addr in functions - entry.functions:
+            self._by_function.setdefault(func_addr, set()).add(entry.addr)
+        entry.functions = functions
+
+    @staticmethod
+    def _make_entry(item, cfg_model: CFGModel, xrefs: XRefManager | None, loader: Loader | None) -> StringEntry | None:
+        encoding = STRING_ENCODINGS.get(item.sort)
+        if encoding is None or item.content is None:
+            return None
+        text = item.content.decode(encoding, errors="replace")
+
+        section = None
+        if loader is not None:
+            sec = loader.find_section_containing(item.addr)
+            if sec is not None:
+                section = sec.name
+
+        functions = (
+            StringsIndex._referencing_functions(item.addr, cfg_model, xrefs) if xrefs is not None else frozenset()
+        )
+        return StringEntry(item.addr, item.size, encoding, text, section, functions)
+
+    @staticmethod
+    def _referencing_functions(addr: int, cfg_model: CFGModel, xrefs: XRefManager) -> frozenset[int]:
+        functions = set()
+        for xref in xrefs.xrefs_by_dst.get(addr, ()):
+            if xref.block_addr is None:
+                continue
+            node = cfg_model.get_any_node(xref.block_addr)
+            if node is not None and node.function_address is not None:
+                functions.add(node.function_address)
+        return frozenset(functions)
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import contextlib
+import heapq
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+
+    from angr import KnowledgeBase
+    from angr.knowledge_plugins.cfg import CFGModel
+
+
+def _char_mask(text: str) -> int:
+    mask = 0
+    for ch in set(text):
+        mask |= 1 << (ord(ch) & 63)
+    return mask
+
+
+def fuzzy_score(query: str, key: str) -> float | None:
+    """
+    Score how well a lowercase query matches a lowercase key, between 0 and 100, or None if the characters of the
+    query do not appear in the key in order. Exact matches score highest, followed by prefixes, substrings and
+    subsequences. Within each of them, shorter keys score higher.
+    """
+    if key == query:
+        return 100.0
+    ratio = len(query) / len(key) if key else 0.0
+    if key.startswith(query):
+        return 80 + 20 * ratio
+    if query in key:
+        return 60 + 20 * ratio
+
+    # the characters of the query may be spread over the key
+    start = pos = key.find(query[0])
+    if pos < 0:
+        return None
+    pos += 1
+    for ch in query[1:]:
+        pos = key.find(ch, pos)
+        if pos < 0:
+            return None
+        pos += 1
+    return 40 * len(query) / (pos - start) + 20 * ratio
+
+
+def _max_score(query_length: int, key_length: int) -> float:
+    """
+    The highest score a query may get for a key of a given length.
+    """
+    if key_length == query_length:
+        return 100.0
+    return 80 + 20 * query_length / key_length
+
+
+class _SyncChanges:
+    """
+    The changes that bring a symbol index up to date, and what the index is synchronized with afterwards.
+    """
+
+    def __init__(self, kb: KnowledgeBase | None, cfg_model: CFGModel | None) -> None:
+        self.kb = kb
+        self.cfg_model = cfg_model
+        # whether the index is cleared before the changes are applied
+        self.reset = False
+        # (kind, addr, caption) of the symbols to set, or to discard if the caption is None
+        self.ops: list[tuple[str, int, str | None]] = []
+        self.func_addrs: set[int] = set()
+        self.labels: dict[int, str] = {}
+        self.strings: dict[int, tuple] = {}
+
+
+class Symbol:
+    """
+    A named location that can be navigated to.
+    """
+
+    __slots__ = ("addr", "caption", "key", "kind", "mask")
+
+    def __init__(self, kind: str, addr: int, caption: str) -> None:
+        self.kind = kind
+        self.addr = addr
+        self.caption = caption
+        # the normalized caption that queries are matched against
+        self.key = caption.lower()
+        # the characters of the key, for quickly skipping keys that cannot match
+        self.mask = _char_mask(self.key)
+
+    def __repr__(self) -> str:
+        return f"<Symbol {self.kind} {self.caption} @ {self.addr:#x}>"
+
+
+class SymbolIndex:
+    """
+    A fuzzy search index over the functions, labels and strings of a knowledge base.
+
+    Symbols are kept in buckets by the length of their keys. Queries visit the buckets from the shortest keys to the
+    longest, since shorter keys score higher, and stop as soon as no key in the remaining buckets can score high
+    enough to make it into the results.
+
+    The index is brought up to date with sync(), which only does work for the symbols that changed since the last
+    sync.
+    """
+
+    FUNCTION = "function"
+    LABEL = "label"
+    STRING = "string"
+
+    # strings are matched against their first characters only
+    MAX_STRING_CAPTION = 80
+
+    def __init__(self) -> None:
+        # (kind, addr) -> Symbol
+        self._symbols: dict[tuple[str, int], Symbol] = {}
+        # key length -> (kind, addr) -> Symbol
+        self._buckets: dict[int, dict[tuple[str, int], Symbol]] = {}
+        # kind -> symbols of that kind, sorted by address. dropped whenever symbols of that kind change
+        self._sorted: dict[str, list[Symbol]] = {}
+
+        # what was indexed from the knowledge base
+        self._kb: KnowledgeBase | None = None
+        self._func_addrs: set[int] = set()
+        self._labels: dict[int, str] = {}
+        self._cfg_model: CFGModel | None = None
+        # the sort and size of the memory data that was looked at, whether it is a string or not
+        self._strings: dict[int, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def get(self, kind: str, addr: int) -> Symbol | None:
+        return self._symbols.get((kind, addr), None)
+
+    def set(self, kind: str, addr: int, caption: str) -> None:
+        """
+        Add a symbol, or change the caption of a symbol.
+        """
+        k = kind, addr
+        old = self._symbols.get(k, None)
+        if old is not None:
+            if old.caption == caption:
+                return
+            del self._buckets[len(old.key)][k]
+        symbol = Symbol(kind, addr, caption)
+        self._symbols[k] = symbol
+        bucket = self._buckets.get(len(symbol.key), None)
+        if bucket is None:
+            bucket = self._buckets[len(symbol.key)] = {}
+        bucket[k] = symbol
+        self._sorted.pop(kind, None)
+
+    def discard(self, kind: str, addr: int) -> None:
+        k = kind, addr
+        symbol = self._symbols.pop(k, None)
+        if symbol is not None:
+            del self._buckets[len(symbol.key)][k]
+            self._sorted.pop(kind, None)
+
+    def clear(self) -> None:
+        self._symbols.clear()
+        self._buckets.clear()
+        self._sorted.clear()
+        self._kb = None
+        self._func_addrs = set()
+        self._labels = {}
+        self._cfg_model = None
+        self._strings = {}
+
+    def symbols(self, kind: str) -> list[Symbol]:
+        """
+        Get all symbols of a kind, sorted by their addresses.
+        """
+        r = self._sorted.get(kind, None)
+        if r is None:
+            r = sorted((s for s in self._symbols.values() if s.kind == kind), key=lambda s: s.addr)
+            self._sorted[kind] = r
+        return r
+
+    def search(self, query: str, limit: int = 50, kinds: set[str] | None = None) -> list[Symbol]:
+        """
+        Find the symbols that match a query best, from the best match to the worst.
+        """
+        query = query.lower()
+        if not query:
+            return []
+        query_mask = _char_mask(query)
+
+        # a min-heap of the best matches so far: (score, -order, symbol)
+        best: list[tuple[float, int, Symbol]] = []
+        order = 0
+        for length in sorted(self._buckets):
+            if length < len(query):
+                continue
+            if len(best) >= limit and best[0][0] >= _max_score(len(query), length):
+                # no remaining symbol can beat the worst match
+                break
+            for symbol in self._buckets[length].values():
+                if symbol.mask & query_mask != query_mask or (kinds is not None and symbol.kind not in kinds):
+                    continue
+                score = fuzzy_score(query, symbol.key)
+                if score is None:
+                    continue
+                # earlier symbols win ties
+                order -= 1
+                if len(best) < limit:
+                    heapq.heappush(best, (score, order, symbol))
+                elif (score, order) > best[0][:2]:
+                    heapq.heapreplace(best, (score, order, symbol))
+
+        return [symbol for _, _, symbol in sorted(best, key=lambda t: t[:2], reverse=True)]
+
+    #
+    # Synchronization with the knowledge base
+    #
+
+    def sync(
+        self, kb: KnowledgeBase | None, cfg_model: CFGModel | None = None, lock: AbstractContextManager | None = None
+    ) -> None:
+        """
+        Bring the index up to date with the functions and labels of a knowledge base, and the strings of a CFG model.
+
+        The changes are collected first, and `lock` is only held while they are applied, so that the index can be
+        searched in the meantime. Syncs must not run concurrently with each other.
+        """
+        changes = self._collect_changes(kb, cfg_model)
+        with lock if lock is not None else contextlib.nullcontext():
+            self._apply_changes(changes)
+
+    def _collect_changes(self, kb: KnowledgeBase | None, cfg_model: CFGModel | None) -> _SyncChanges:
+        changes = _SyncChanges(kb, cfg_model)
+        changes.reset = kb is not self._kb
+        if kb is None:
+            return changes
+        old_func_addrs = set() if changes.reset else self._func_addrs
+        old_labels = {} if changes.reset else self._labels
+        ops = changes.ops
+
+        functions = kb.functions
+        func_addrs = set(functions.function_addrs_set)
+        for addr in old_func_addrs - func_addrs:
+            ops.append((self.FUNCTION, addr, None))
+        for addr in func_addrs - old_func_addrs:
+            ops.append((self.FUNCTION, addr, functions.get_by_addr(addr).name))
+            ops.append((self.LABEL, addr, None))
+        changes.func_addrs = func_addrs
+
+        # functions are renamed through their labels
+        labels = dict(kb.labels.items())
+        if labels != old_labels:
+            for addr in old_labels.keys() - labels.keys():
+                ops.append((self.LABEL, addr, None))
+            for addr, name in labels.items() - old_labels.items():
+                if addr in func_addrs:
+                    ops.append((self.FUNCTION, addr, functions.get_by_addr(addr).name))
+                else:
+                    ops.append((self.LABEL, addr, name))
+        changes.labels = labels
+
+        old_strings = self._strings
+        if changes.reset or cfg_model is not self._cfg_model:
+            if not changes.reset:
+                for addr in old_strings:
+                    ops.append((self.STRING, addr, None))
+            old_strings = {}
+        if cfg_model is not None:
+            changes.strings = self._collect_string_changes(cfg_model, old_strings, ops)
+        return changes
+
+    def _collect_string_changes(
+        self, cfg_model: CFGModel, old_strings: dict[int, tuple], ops: list[tuple[str, int, str | None]]
+    ) -> dict[int, tuple]:
+        """
+        Find the memory data whose sort or size changed since it was looked at, which includes memory data that turns
+        out to be a string later on.
+        """
+        strings = {}
+        for addr, item in list(cfg_model.memory_data.items()):
+            signature = item.sort, item.size
+            strings[addr] = signature
+            if old_strings.get(addr) != signature:
+                ops.append((self.STRING, addr, self._string_caption(item)))
+        for addr in old_strings.keys() - strings.keys():
+            ops.append((self.STRING, addr, None))
+        return strings
+
+    def _apply_changes(self, changes: _SyncChanges) -> None:
+        if changes.reset:
+            self.clear()
+        self._kb = changes.kb
+        self._func_addrs = changes.func_addrs
+        self._labels = changes.labels
+        self._cfg_model = changes.cfg_model
+        self._strings = changes.strings
+        for kind, addr, caption in changes.ops:
+            if caption is None:
+                self.discard(kind, addr)
+            else:
+                self.set(kind, addr, caption)
+
+    def _string_caption(self, item) -> str | None:
+        if item.sort == "string":
+            encoding = "utf-8"
+        elif item.sort == "unicode":
+            encoding = "utf_16_le"
+        else:
+            return None
+        content = item.content
+        if not content:
+            return None
+        text = content[: self.MAX_STRING_CAPTION * 2].decode(encoding, errors="replace")
+        text = text[: self.MAX_STRING_CAPTION].replace("\n", "\\n").replace("\r", "\\r")
+        return text if text.strip() else None
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sortedcontainers import SortedDict
+from sortedcontainers import SortedDict, SortedKeyList
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -114,3 +114,65 @@ class TaggedIntervalMap:
             yield (start_addr, addr - start_addr, tags)
             tags = self._map[addr]
             start_addr = addr
+
+
+class IntervalIndex:
+    """
+    Indexes items by the intervals they cover, to look up the items intersecting an address range in O(log n + k).
+
+    Intervals are sorted by their start addresses. The longest interval bounds how far before a range an interval that
+    intersects the range may start, so intervals longer than LONG_INTERVAL_SIZE are kept aside and checked one by one.
+    """
+
+    LONG_INTERVAL_SIZE = 0x1000
+
+    def __init__(self) -> None:
+        # (addr, end, seq, item), sorted by addr
+        self._intervals: SortedKeyList = SortedKeyList(key=lambda interval: interval[0])
+        self._long_intervals: list[tuple[int, int, int, Any]] = []
+        self._max_size: int = 0
+        self._seq: int = 0
+
+    def __len__(self) -> int:
+        return len(self._intervals) + len(self._long_intervals)
+
+    def clear(self) -> None:
+        self._intervals.clear()
+        self._long_intervals.clear()
+        self._max_size = 0
+        self._seq = 0
+
+    def add(self, addr: int, size: int, item: Any) -> None:
+        """
+        Add an item covering the interval starting at `addr` of `size` bytes. Empty intervals are ignored.
+        """
+        if size <= 0:
+            return
+        interval = (addr, addr + size, self._seq, item)
+        self._seq += 1
+        if size > self.LONG_INTERVAL_SIZE:
+            self._long_intervals.append(interval)
+        else:
+            self._intervals.add(interval)
+            self._max_size = max(self._max_size, size)
+
+    def overlapping(self, min_addr: int, max_addr: int) -> list:
+        """
+        Get the items whose intervals intersect [min_addr, max_addr], in the order they were added.
+        """
+        found = [
+            interval
+            for interval in self._intervals.irange_key(min_addr - self._max_size + 1, max_addr)
+            if interval[1] > min_addr
+        ]
+        found.extend(
+            interval for interval in self._long_intervals if interval[0] <= max_addr and interval[1] > min_addr
+        )
+        found.sort(key=lambda interval: interval[2])
+        return [interval[3] for interval in found]
+
+    def at(self, addr: int) -> list:
+        """
+        Get the items whose intervals contain `addr`, in the order they were added.
+        """
+        return self.overlapping(addr, addr)
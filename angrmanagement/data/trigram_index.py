@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable
+
+
+class TrigramIndex:
+    """
+    A case-insensitive substring search index over the texts of a set of keys.
+
+    Each text is split into its trigrams, and each trigram maps to the ids of the texts that contain it. Queries of at
+    least three characters only look at the texts that contain the rarest trigram of the query; shorter queries scan
+    all texts. A query that extends the previous query only looks at the results of the previous query.
+
+    Removed and replaced texts leave stale ids in the trigram lists, which are skipped and dropped when there are too
+    many of them.
+    """
+
+    def __init__(self, items: Iterable[tuple[Hashable, str]] = ()) -> None:
+        """
+        :param items:   Pairs of keys and their texts.
+        """
+        # text id -> key, or None if the text was removed
+        self._keys: list[Hashable | None] = []
+        # text id -> lowercase text
+        self._texts: list[str | None] = []
+        # key -> text id
+        self._ids: dict[Hashable, int] = {}
+        # trigram -> ids of the texts that contain it
+        self._trigrams: dict[str, array] = {}
+        self._stale = 0
+
+        # the last query and the ids it matched
+        self._last_query: str | None = None
+        self._last_ids: list[int] = []
+
+        for key, text in items:
+            self.set(key, text)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._ids
+
+    def text(self, key: Hashable) -> str | None:
+        """
+        Get the lowercase text of a key, or None if the key is not in the index.
+        """
+        text_id = self._ids.get(key, None)
+        return None if text_id is None else self._texts[text_id]
+
+    def set(self, key: Hashable, text: str) -> None:
+        """
+        Add a key to the index, or replace its text.
+        """
+        text = text.lower()
+        text_id = self._ids.get(key, None)
+        if text_id is not None:
+            if self._texts[text_id] == text:
+                return
+            self._remove(text_id)
+            self._maybe_compact()
+
+        text_id = len(self._texts)
+        self._keys.append(key)
+        self._texts.append(text)
+        self._ids[key] = text_id
+        trigrams = self._trigrams
+        for trigram in {text[i : i + 3] for i in range(len(text) - 2)}:
+            ids = trigrams.get(trigram, None)
+            if ids is None:
+                trigrams[trigram] = array("l", (text_id,))
+            else:
+                ids.append(text_id)
+        self._last_query = None
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Remove a key from the index if it is in the index.
+        """
+        text_id = self._ids.get(key, None)
+        if text_id is not None:
+            self._remove(text_id)
+            self._last_query = None
+            self._maybe_compact()
+
+    def search(self, query: str) -> set[Hashable]:
+        """
+        Find the keys whose texts contain `query`, ignoring case.
+        """
+        query = query.lower()
+        if not query:
+            return set(self._ids)
+
+        # a query that extends the previous query narrows down the previous results
+        candidates = self._last_ids if self._last_query is not None and self._last_query in query else None
+        if len(query) >= 3:
+            ids = min((self._trigrams.get(query[i : i + 3], ()) for i in range(len(query) - 2)), key=len)
+            if candidates is None or len(ids) < len(candidates):
+                candidates = ids
+        if candidates is None:
+            candidates = range(len(self._texts))
+
+        texts = self._texts
+        result_ids = [text_id for text_id in candidates if (text := texts[text_id]) is not None and query in text]
+        self._last_query = query
+        self._last_ids = result_ids
+        keys = self._keys
+        return {keys[text_id] for text_id in result_ids}
+
+    #
+    # Private methods
+    #
+
+    def _remove(self, text_id: int) -> None:
+        del self._ids[self._keys[text_id]]
+        self._keys[text_id] = None
+        self._texts[text_id] = None
+        self._stale += 1
+
+    def _maybe_compact(self) -> None:
+        if self._stale > len(self._ids) and self._stale > 1024:
+            self._compact()
+
+    def _compact(self) -> None:
+        items = [(key, text) for key, text in zip(self._keys, self._texts, strict=True) if text is not None]
+        self._keys = []
+        self._texts = []
+        self._ids = {}
+        self._trigrams = {}
+        self._stale = 0
+        for key, text in items:
+            self.set(key, text)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from angr.knowledge_plugins.xrefs import XRef, XRefManager
+
+
+# the type of references whose type is not known
+UNKNOWN_TYPE = -1
+
+
+class XRefColumns:
+    """
+    The references to an address, as columns of source addresses and reference types that are sorted by the source
+    addresses.
+    """
+
+    __slots__ = ("srcs", "types")
+
+    def __init__(self, srcs: array | None = None, types: array | None = None) -> None:
+        self.srcs = array("Q") if srcs is None else srcs
+        self.types = array("b") if types is None else types
+
+    def __len__(self) -> int:
+        return len(self.srcs)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, int]]) -> XRefColumns:
+        """
+        Create columns from pairs of source addresses and reference types, in any order.
+        """
+        rows = sorted(rows)
+        return cls(array("Q", (src for src, _ in rows)), array("b", (ty for _, ty in rows)))
+
+    @classmethod
+    def from_xrefs(cls, xrefs: Iterable[XRef]) -> XRefColumns:
+        """
+        Create columns from XRef objects. References without instruction addresses are sourced at their blocks.
+        """
+        return cls.from_rows(
+            (
+                xref.ins_addr if xref.ins_addr is not None else xref.block_addr or 0,
+                xref.type if xref.type is not None else UNKNOWN_TYPE,
+            )
+            for xref in xrefs
+        )
+
+    def merge(self, other: XRefColumns) -> XRefColumns:
+        """
+        Create columns with the references of both columns.
+        """
+        if not other:
+            return self
+        if not self:
+            return other
+        rows = list(heapq.merge(zip(self.srcs, self.types, strict=True), zip(other.srcs, other.types, strict=True)))
+        return XRefColumns(array("Q", (src for src, _ in rows)), array("b", (ty for _, ty in rows)))
+
+
+class XRefIndex:
+    """
+    A reverse index of the references in an XRefManager, from their targets to their columns.
+
+    The columns of a target are built the first time the target is looked up, and are rebuilt when its references are
+    added or removed. A reference that replaces another reference from the same instruction is not noticed until the
+    index is cleared, which should be done whenever the CFG is regenerated.
+    """
+
+    def __init__(self) -> None:
+        self._xrefs: XRefManager | None = None
+        # target -> (the set of references, its size when the columns were built, the columns)
+        self._columns: dict[int, tuple[set, int, XRefColumns]] = {}
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def clear(self) -> None:
+        self._xrefs = None
+        self._columns.clear()
+
+    def references_to(self, xrefs: XRefManager, dst: int) -> XRefColumns:
+        """
+        Get the columns of the references to an address.
+        """
+        if xrefs is not self._xrefs:
+            self.clear()
+            self._xrefs = xrefs
+
+        refs = xrefs.xrefs_by_dst.get(dst)
+        if refs is None:
+            self._columns.pop(dst, None)
+            return XRefColumns()
+        cached = self._columns.get(dst)
+        if cached is not None and cached[0] is refs and cached[1] == len(refs):
+            return cached[2]
+
+        columns = XRefColumns.from_xrefs(refs)
+        self._columns[dst] = refs, len(refs), columns
+        return columns
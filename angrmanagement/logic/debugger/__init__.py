@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from .debugger import Debugger, DebuggerListManager, DebuggerManager, DebuggerWatcher
+from .memory_snapshot import DebuggerMemorySnapshot
 
 __all__ = [
     "Debugger",
     "DebuggerListManager",
     "DebuggerManager",
+    "DebuggerMemorySnapshot",
     "DebuggerWatcher",
 ]
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from angr.errors import SimMemoryMissingError
+
+from angrmanagement.utils.cache import SmartLRUCache
+
+if TYPE_CHECKING:
+    from angr import SimState
+
+
+_l = logging.getLogger(name=__name__)
+
+
+class MemoryPage:
+    """
+    The contents of one page of debugger memory. Bytes without a concrete value are listed in `unknown` by their
+    offset, with "S" for symbolic bytes and "?" for bytes that could not be read.
+    """
+
+    __slots__ = ("addr", "data", "unknown")
+
+    def __init__(self, addr: int, data: bytes, unknown: dict[int, str]) -> None:
+        self.addr = addr
+        self.data = data
+        self.unknown = unknown
+
+    def value(self, offset: int) -> int | str:
+        v = self.unknown.get(offset, None) if self.unknown else None
+        return v if v is not None else self.data[offset]
+
+
+class DebuggerMemorySnapshot:
+    """
+    Reads the memory of debugger states a page at a time and keeps the pages that were read. When the debugger moves
+    to another state, only the pages that were written since the last state are dropped and read again.
+
+    Written pages are found by their identity: the memory of a state shares its pages with the memory it was copied
+    from until they are written to. The snapshot keeps a copy of the memory of the last state, so that the pages of
+    that state stay shared, and a page of the next state that is not the same object as the corresponding page of the
+    last state has been written to.
+    """
+
+    DEFAULT_PAGE_SIZE = 0x1000
+    MAX_PAGES = 256
+
+    def __init__(self) -> None:
+        self._state: SimState | None = None
+        # the memory of the last state. it shares its pages with that state
+        self._memory = None
+        self._page_size: int = self.DEFAULT_PAGE_SIZE
+        # page address -> MemoryPage
+        self._pages: SmartLRUCache = SmartLRUCache(maxsize=self.MAX_PAGES)
+
+    @property
+    def page_size(self) -> int:
+        return self._page_size
+
+    def clear(self) -> None:
+        self._state = None
+        self._memory = None
+        self._pages = SmartLRUCache(maxsize=self.MAX_PAGES)
+
+    def update(self, state: SimState | None) -> dict[int, MemoryPage]:
+        """
+        Move the snapshot to a new state.
+
+        :return:    The pages that were read before and might have changed, by their address, with their old contents.
+        """
+        if state is None:
+            self.clear()
+            return {}
+
+        old_memory = self._memory
+        self._state = state
+        self._page_size = getattr(state.memory, "page_size", self.DEFAULT_PAGE_SIZE)
+        try:
+            self._memory = state.memory.copy({})
+        except Exception:  # pylint:disable=broad-except
+            _l.debug("Failed to copy the memory of the debugger state.", exc_info=True)
+            self._memory = None
+
+        dirty = self._dirty_pages(old_memory, state.memory)
+        if dirty is None:
+            dirty = dict(self._pages.items())
+            self._pages = SmartLRUCache(maxsize=self.MAX_PAGES)
+        else:
+            for page_addr in dirty:
+                del self._pages[page_addr]
+        return dirty
+
+    def _dirty_pages(self, old_memory, new_memory) -> dict[int, MemoryPage] | None:
+        """
+        Find the cached pages whose memory pages are not shared between two memories, or None if this cannot be told.
+        """
+        # pylint:disable=protected-access
+        old_pages = getattr(old_memory, "_pages", None)
+        new_pages = getattr(new_memory, "_pages", None)
+        if old_pages is None or new_pages is None or getattr(old_memory, "page_size", None) != self._page_size:
+            return None
+
+        dirty = {}
+        for page_addr, page in self._pages.items():
+            pageno = page_addr // self._page_size
+            if old_pages.get(pageno, None) is not new_pages.get(pageno, None):
+                dirty[page_addr] = page
+        return dirty
+
+    def read_page(self, page_addr: int) -> MemoryPage:
+        """
+        Get the page of memory at `page_addr`, which must be aligned to the page size.
+        """
+        page = self._pages.get(page_addr, None)
+        if page is None:
+            page = self._load_page(page_addr)
+            self._pages[page_addr] = page
+        return page
+
+    def read(self, addr: int, size: int) -> tuple[bytes, dict[int, str]]:
+        """
+        Read a range of memory.
+
+        :return:    The bytes of the range, and the unknown bytes of the range by their offset.
+        """
+        data = bytearray(size)
+        unknown = {}
+        pos, end = addr, addr + size
+        while pos < end:
+            page = self.read_page(pos - pos % self._page_size)
+            lo = pos - page.addr
+            hi = min(end - page.addr, self._page_size)
+            data[pos - addr : pos - addr + hi - lo] = page.data[lo:hi]
+            for offset, v in page.unknown.items():
+                if lo <= offset < hi:
+                    unknown[page.addr + offset - addr] = v
+            pos = page.addr + hi
+        return bytes(data), unknown
+
+    def _load_page(self, page_addr: int) -> MemoryPage:
+        size = self._page_size
+        state = self._state
+        data = bytearray(size)
+        unknown = {}
+        if state is None:
+            return MemoryPage(page_addr, bytes(size), dict.fromkeys(range(size), "?"))
+        self._load_range(state, page_addr, 0, size, data, unknown)
+        return MemoryPage(page_addr, bytes(data), unknown)
+
+    @staticmethod
+    def _load_range(
+        state: SimState, page_addr: int, offset: int, size: int, data: bytearray, unknown: dict[int, str]
+    ) -> None:
+        """
+        Read a range of a page into `data` and `unknown`. Bytes that were never written are skipped, and other ranges
+        that cannot be read as a whole, e.g. because parts of them are unmapped, are split in halves until the
+        unreadable bytes are found.
+
+        Bytes that were never written are not filled: loading them would store new symbolic variables in the memory of
+        the state, which is not ours to change.
+        """
+        if size <= 0:
+            return
+        try:
+            r = state.memory.load(page_addr + offset, size, inspect=False, disable_actions=True, fill_missing=False)
+            if not r.symbolic:
+                data[offset : offset + size] = state.solver.eval(r, cast_to=bytes)
+                return
+            for i, byte in enumerate(r.chop(8)):
+                if byte.symbolic:
+                    unknown[offset + i] = "S"
+                else:
+                    data[offset + i] = state.solver.eval(byte)
+            return
+        except SimMemoryMissingError as ex:
+            if isinstance(ex.missing_addr, int) and isinstance(ex.missing_size, int):
+                gap_start = max(ex.missing_addr - page_addr, offset)
+                gap_end = min(ex.missing_addr - page_addr + ex.missing_size, offset + size)
+                if gap_start < gap_end:
+                    # the bytes that were never written are unknown, and the bytes around them are read again
+                    for i in range(gap_start, gap_end):
+                        unknown[i] = "?"
+                    DebuggerMemorySnapshot._load_range(state, page_addr, offset, gap_start - offset, data, unknown)
+                    DebuggerMemorySnapshot._load_range(
+                        state, page_addr, gap_end, offset + size - gap_end, data, unknown
+                    )
+                    return
+            if size == 1:
+                unknown[offset] = "?"
+                return
+        except Exception:  # pylint:disable=broad-except
+            if size == 1:
+                unknown[offset] = "?"
+                return
+        half = size // 2
+        DebuggerMemorySnapshot._load_range(state, page_addr, offset, half, data, unknown)
+        DebuggerMemorySnapshot._load_range(state, page_addr, offset + half, size - half, data, unknown)
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
 import sys
+import threading
 import time
 from typing import TYPE_CHECKING
 
 from PySide6.QtCore import QObject, QThread, Signal, Slot
 from PySide6.QtWidgets import QApplication
 
+from angrmanagement.config import Conf
 from angrmanagement.data.jobs.job import Job, JobState
 
 if TYPE_CHECKING:
@@ -23,6 +27,10 @@ class JobCancelled(BaseException):
     """Raised when a job is cancelled."""
 
 
+class JobSuspended(BaseException):
+    """Raised at a checkpoint of a preemptible job when the job manager asked it to yield its worker."""
+
+
 class JobContext:
     """Passed to each job to allow it to report progress."""
 
@@ -53,6 +61,16 @@ class JobContext:
             self._last_reported_timestamp = time.time()
             self._job_worker.job_progressed.emit(self._job, percentage, text)
 
+    def checkpoint(self) -> None:
+        """
+        Mark a point where a preemptible job may be suspended. The job must have saved everything it needs to resume
+        from this point, because its run() method is called again from the start when it is resumed.
+        """
+        if self._job.state == JobState.CANCELLED:
+            raise JobCancelled
+        if self._job.suspend_requested:
+            raise JobSuspended
+
 
 class Worker(QObject):
     """Executes jobs."""
@@ -61,24 +79,34 @@ class Worker(QObject):
     job_progressed = Signal(Job, float, str)
     job_exception = Signal(Job, BaseException)
     job_finished = Signal(Job)
+    job_skipped = Signal(Job)
+    job_suspended = Signal(Job)
+
+    # emitted by the job manager (from the GUI thread) to hand a job to this worker
+    job_dispatched = Signal(Job)
 
     def __init__(self, job_manager: JobManager):
         super().__init__()
         self.job_manager = job_manager
+        self.current_job: Job | None = None
+        self.job_dispatched.connect(self.execute_job)
 
     @Slot(Job)
     def execute_job(self, job: Job) -> None:
         if job.state != JobState.PENDING:
+            # the job was cancelled after it was dispatched but before this worker picked it up
+            self.job_skipped.emit(job)
             return
 
         self.job_starting.emit(job)
 
         try:
+            resumed = job.suspend_count > 0
             job.state = JobState.RUNNING
             job.start_at = time.time()
-            log.info('Job "%s" started', job.name)
+            log.info('Job "%s" %s', job.name, "resumed" if resumed else "started")
             ctx = JobContext(self, job)
-            ctx.set_progress(0.0)
+            ctx.set_progress(job.progress_percentage if resumed else 0.0)
             job.start(ctx)
             duration = time.time() - job.start_at
             log.info('Job "%s" completed after %.2f seconds', job.name, duration)
@@ -88,6 +116,16 @@ class Worker(QObject):
                 ctx.set_progress(100.0)
             self.job_finished.emit(job)
 
+        except JobSuspended:
+            job.suspend_requested = False
+            with self.job_manager.state_lock:
+                # the job may have been cancelled after the checkpoint. it must not be queued again then
+                if job.state == JobState.RUNNING:
+                    log.info('Job "%s" suspended at %.2f%%', job.name, job.progress_percentage)
+                    job.suspend_count += 1
+                    job.state = JobState.PENDING
+            self.job_suspended.emit(job)
+
         except JobCancelled as e:
             log.exception("Job successfully cancelled")
             self.job_exception.emit(job, e)
@@ -99,7 +137,19 @@ class Worker(QObject):
 
 
 class JobManager(QObject):
-    """Manages job execution in a worker thread."""
+    """
+    Manages job execution on a pool of worker threads.
+
+    Pending jobs are dispatched by priority (see JobPriority), and in submission order among jobs of the same priority.
+    A job is only dispatched once all jobs it depends on have finished and their finish callbacks have run on the GUI
+    thread. If a dependency fails or is cancelled, all jobs that (transitively) depend on it are cancelled.
+
+    Jobs that mutate the knowledge base (see Job.mutates_kb) are dispatched one at a time, so that they never run
+    concurrently with each other, regardless of the number of workers.
+
+    When a job is ready but all workers are busy, a running preemptible job of lower priority is asked to suspend at its
+    next checkpoint (see JobContext.checkpoint). The suspended job is queued again and resumed once a worker is free.
+    """
 
     workspace: Workspace
     jobs: list[Job]
@@ -110,47 +160,83 @@ class JobManager(QObject):
     job_progressed = Signal(Job, float, str)
     job_exception = Signal(Job, BaseException)
     job_finished = Signal(Job)
+    job_suspended = Signal(Job)
 
-    _worker_thread: QThread
-    _worker: Worker
+    _worker_threads: list[QThread]
+    _workers: list[Worker]
+    _idle_workers: list[Worker]
+    _pending: list[tuple[int, int, Job]]
 
-    def __init__(self, workspace: Workspace):
+    def __init__(self, workspace: Workspace, worker_count: int | None = None):
         super().__init__()
 
         self.workspace = workspace
         self.jobs = []
-        self._current_job: Job | None = None
         self.job_worker_exception_callback = None
-
-        self._worker_thread = QThread()
-        self._worker = Worker(self)
-        self._worker.moveToThread(self._worker_thread)
-        self._worker.job_starting.connect(self._on_job_starting)
-        self._worker.job_progressed.connect(self._on_job_progress)
-        self._worker.job_exception.connect(self._on_job_exception)
-        self._worker.job_finished.connect(self._on_job_finished)
-        self.job_added.connect(self._worker.execute_job)
-        self._worker_thread.start()
+        # guards state changes that the GUI thread and the workers may make to the same job at the same time
+        self.state_lock = threading.Lock()
+
+        if worker_count is None:
+            worker_count = Conf.job_worker_count
+        worker_count = max(1, worker_count)
+
+        self._pending = []
+        self._job_counter = itertools.count()
+        # submission order of each job, so that a suspended job keeps its place among jobs of the same priority
+        self._job_order: dict[Job, int] = {}
+
+        self._worker_threads = []
+        self._workers = []
+        for _ in range(worker_count):
+            thread = QThread()
+            worker = Worker(self)
+            worker.moveToThread(thread)
+            worker.job_starting.connect(self._on_job_starting)
+            worker.job_progressed.connect(self._on_job_progress)
+            worker.job_exception.connect(self._on_job_exception)
+            worker.job_finished.connect(self._on_job_finished)
+            worker.job_skipped.connect(self._on_job_skipped)
+            worker.job_suspended.connect(self._on_job_suspended)
+            thread.start()
+            self._worker_threads.append(thread)
+            self._workers.append(worker)
+        self._idle_workers = list(self._workers)
 
     def quit(self):
-        self._worker_thread.quit()
-        self._worker_thread.wait()
+        for thread in self._worker_threads:
+            thread.quit()
+        for thread in self._worker_threads:
+            thread.wait()
+
+    @property
+    def running_jobs(self) -> list[Job]:
+        return [worker.current_job for worker in self._workers if worker.current_job is not None]
 
     def add_job(self, job: Job) -> None:
         self.jobs.append(job)
+        self._job_order[job] = next(self._job_counter)
+        heapq.heappush(self._pending, (job.priority, self._job_order[job], job))
         self.job_added.emit(job)
+        self._schedule()
 
-    @staticmethod
-    def cancel_job(job: Job) -> None:
+    def cancel_job(self, job: Job) -> None:
         """
         Cancel a job.
         """
-        job.state = JobState.CANCELLED
+        with self.state_lock:
+            job.state = JobState.CANCELLED
+        # jobs that are still waiting for their dependencies will never be dispatched, so clean them up now
+        self._schedule()
 
     def interrupt_current_job(self) -> None:
-        """Notify the current running job that the user requested an interrupt. The job may ignore it."""
-        if self._current_job:
-            self._current_job.state = JobState.CANCELLED
+        """
+        Notify the running job the user is most likely waiting for (a blocking job, otherwise the most recently
+        started one) that the user requested an interrupt. The job may ignore it.
+        """
+        running = self.running_jobs
+        if running:
+            with self.state_lock:
+                max(running, key=lambda j: (j.blocking, j.start_at)).state = JobState.CANCELLED
 
     def join_all_jobs(self, wait_period: float = 2.0) -> None:
         """
@@ -166,8 +252,109 @@ class JobManager(QObject):
                 last_has_job = time.time()
                 time.sleep(0.05)
 
+    #
+    # Scheduling
+    #
+
+    def _dependencies_met(self, job: Job) -> bool | None:
+        """
+        Check if all dependencies of a job are satisfied.
+
+        :return:    True if the job may run, False if it must keep waiting, or None if it can never run.
+        """
+        for dep in job.dependencies:
+            if dep.state in (JobState.CANCELLED, JobState.FAILED):
+                return None
+            if dep.state != JobState.FINISHED or dep in self.jobs:
+                # a job is only removed from self.jobs after its finish callback has run on the GUI thread
+                return False
+        return True
+
+    def _schedule(self) -> None:
+        """
+        Dispatch ready jobs to idle workers, and drop pending jobs that have been cancelled or whose dependencies can
+        no longer be satisfied.
+        """
+        dropped = []
+        rescan = True
+        while rescan:
+            # dropping a job cancels the jobs depending on it, which may have been visited earlier in this pass
+            rescan = False
+            pending, self._pending = self._pending, []
+            waiting = []
+            ready = []
+            while pending:
+                item = heapq.heappop(pending)
+                job = item[2]
+                if job.state != JobState.PENDING:
+                    # cancelled before it was dispatched
+                    dropped.append(job)
+                    continue
+                met = self._dependencies_met(job)
+                if met is None:
+                    job.state = JobState.CANCELLED
+                    dropped.append(job)
+                    rescan = True
+                elif met and self._idle_workers and not (job.mutates_kb and self._kb_busy()):
+                    worker = self._idle_workers.pop(0)
+                    worker.current_job = job
+                    worker.job_dispatched.emit(job)
+                else:
+                    if met:
+                        ready.append(job)
+                    waiting.append(item)
+            for item in waiting:
+                heapq.heappush(self._pending, item)
+
+        self._preempt(ready)
+
+        for job in dropped:
+            self._on_job_skipped(job)
+
+    def _kb_busy(self) -> bool:
+        return any(job.mutates_kb for job in self.running_jobs)
+
+    def _preempt(self, ready: list[Job]) -> None:
+        """
+        Ask running preemptible jobs of lower priority to yield their workers to jobs that are ready but waiting.
+
+        :param ready:   Jobs whose dependencies are met but could not be dispatched, ordered by priority.
+        """
+        kb_busy = self._kb_busy()
+        candidates = [job for job in self.running_jobs if job.preemptible and job.state == JobState.RUNNING]
+        # a suspension that has been requested but not yet honored will free a worker soon
+        pending_yields = sum(1 for job in candidates if job.suspend_requested)
+        candidates = [job for job in candidates if not job.suspend_requested]
+
+        for job in ready[pending_yields:]:
+            victims = [victim for victim in candidates if victim.priority > job.priority]
+            if job.mutates_kb and kb_busy:
+                # only the job that is mutating the knowledge base can make room for this job
+                victims = [victim for victim in victims if victim.mutates_kb]
+            if not victims:
+                continue
+            victim = max(victims, key=lambda j: (j.priority, j.start_at))
+            log.info('Suspending job "%s" in favor of job "%s"', victim.name, job.name)
+            victim.suspend_requested = True
+            candidates.remove(victim)
+
+    def _release_worker(self, job: Job) -> None:
+        for worker in self._workers:
+            if worker.current_job is job:
+                worker.current_job = None
+                self._idle_workers.append(worker)
+
+    def _retire_job(self, job: Job) -> None:
+        if job in self.jobs:
+            self.jobs.remove(job)
+        self._job_order.pop(job, None)
+        self._release_worker(job)
+
+    #
+    # Worker callbacks
+    #
+
     def _on_job_starting(self, job):
-        self._current_job = job
         self.job_starting.emit(job)
 
     def _on_job_progress(self, job: Job, percentage: float, text: str = "") -> None:
@@ -177,8 +364,7 @@ class JobManager(QObject):
         if self.job_worker_exception_callback is not None:
             self.job_worker_exception_callback(job, e)
 
-        if job in self.jobs:
-            self.jobs.remove(job)
+        self._retire_job(job)
 
         # Store exception for console debugging
         sys.last_traceback = e.__traceback__
@@ -186,14 +372,29 @@ class JobManager(QObject):
         sys.last_type = type(e)
         sys.last_exc = e
 
-        self._current_job = None
         self.job_exception.emit(job, e)
+        self._schedule()
+
+    def _on_job_skipped(self, job: Job) -> None:
+        self._retire_job(job)
+        self.job_exception.emit(job, JobCancelled())
+        self._schedule()
+
+    def _on_job_suspended(self, job: Job) -> None:
+        self._release_worker(job)
+        if job.state == JobState.PENDING:
+            heapq.heappush(self._pending, (job.priority, self._job_order[job], job))
+        else:
+            # cancelled while it was being suspended
+            self._retire_job(job)
+            self.job_exception.emit(job, JobCancelled())
+        self.job_suspended.emit(job)
+        self._schedule()
 
     def _on_job_finished(self, job):
         job.finish()  # Job finished handler (GUI thread only)
 
-        if job in self.jobs:
-            self.jobs.remove(job)
+        self._retire_job(job)
 
-        self._current_job = None
         self.job_finished.emit(job)
+        self._schedule()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from angrmanagement.config import Conf
+from angrmanagement.data.jobs import PrefetchFunctionsJob
+from angrmanagement.utils.cache import SmartLRUCache
+
+if TYPE_CHECKING:
+    from angr.analyses import Disassembly
+    from angr.knowledge_plugins.functions import Function
+
+    from angrmanagement.ui.workspace import Workspace
+
+
+_l = logging.getLogger(name=__name__)
+
+
+class Prefetcher:
+    """
+    Speculatively prepares the functions that the user is likely to navigate to next: the callees, callers, and
+    adjacent functions of the function in focus. Their disassembly is kept here until a view consumes it, and their
+    decompilation goes to kb.decompilations. Prefetching runs at JobPriority.SPECULATIVE, and moving the focus to
+    another function drops whatever has not been prefetched yet.
+
+    Hits and misses are counted per kind of artifact ("disassembly" and "decompilation") to tune the prefetcher.
+    """
+
+    # prefetched disassembly that has not been consumed is dropped in LRU order
+    MAX_DISASSEMBLIES = 64
+
+    def __init__(self, workspace: Workspace) -> None:
+        self.workspace = workspace
+        self.instance = workspace.main_instance
+
+        self._lock = threading.Lock()
+        self._disassemblies: SmartLRUCache = SmartLRUCache(maxsize=self.MAX_DISASSEMBLIES)
+        self._decompiled: set[int] = set()
+        self._job: PrefetchFunctionsJob | None = None
+        self._focus_addr: int | None = None
+
+        self.hits: dict[str, int] = {"disassembly": 0, "decompilation": 0}
+        self.misses: dict[str, int] = {"disassembly": 0, "decompilation": 0}
+
+        # anything that was prefetched before may be stale now
+        self.instance.cfg.am_subscribe(self._on_invalidated)
+        self.instance.patches.am_subscribe(self._on_invalidated)
+
+    @property
+    def enabled(self) -> bool:
+        return Conf.prefetch_function_count > 0
+
+    def hit_rate(self, kind: str) -> float | None:
+        """
+        The fraction of accesses of a kind of artifact that were served by the prefetcher, or None if there were no
+        accesses yet.
+        """
+        total = self.hits[kind] + self.misses[kind]
+        return self.hits[kind] / total if total else None
+
+    #
+    # Focus
+    #
+
+    def focus(self, func: Function | None) -> None:
+        """
+        Start prefetching the neighbors of a function, replacing the previous prefetch targets.
+        """
+        if not self.enabled or func is None or func.addr == self._focus_addr:
+            return
+        if self.instance.kb is None or self.instance.cfg.am_none:
+            return
+        self._focus_addr = func.addr
+
+        func_addrs = self._neighbors(func)
+        decompiler_args = self._decompiler_args()
+        if self._job is not None and self._job.retarget(func_addrs, decompiler_args):
+            return
+        if not func_addrs:
+            return
+        self._job = PrefetchFunctionsJob(self.instance, self, func_addrs, decompiler_args=decompiler_args)
+        self.workspace.job_manager.add_job(self._job)
+
+    def _neighbors(self, func: Function) -> list[int]:
+        """
+        The functions to prefetch for a function, most likely next function first.
+        """
+        functions = self.instance.kb.functions
+        callgraph = functions.callgraph
+
+        candidates: list[int] = []
+        if func.addr in callgraph:
+            candidates += sorted(callgraph.successors(func.addr))
+            candidates += sorted(callgraph.predecessors(func.addr))
+        for neighbor in (functions.floor_func(func.addr - 1), functions.ceiling_func(func.addr + 1)):
+            if neighbor is not None:
+                candidates.append(neighbor.addr)
+
+        func_addrs = []
+        seen = {func.addr}
+        for addr in candidates:
+            if addr in seen:
+                continue
+            seen.add(addr)
+            f = functions.function(addr=addr)
+            if f is None or f.is_plt or f.is_simprocedure or f.is_alignment or f.is_syscall:
+                continue
+            func_addrs.append(addr)
+            if len(func_addrs) >= Conf.prefetch_function_count:
+                break
+        return func_addrs
+
+    def _decompiler_args(self) -> dict | None:
+        if not Conf.prefetch_decompilation:
+            return None
+        view = self.workspace.view_manager.first_view_in_category("pseudocode")
+        if view is None:
+            return None
+        return view.decompiler_args()
+
+    #
+    # Artifacts. These methods are called from the prefetch job
+    #
+
+    def has_disassembly(self, func_addr: int) -> bool:
+        with self._lock:
+            return func_addr in self._disassemblies
+
+    def store_disassembly(self, func_addr: int, disasm: Disassembly) -> None:
+        with self._lock:
+            self._disassemblies[func_addr] = disasm
+
+    def mark_decompiled(self, func_addr: int) -> None:
+        with self._lock:
+            self._decompiled.add(func_addr)
+
+    #
+    # Consumers. These methods are called from views
+    #
+
+    def invalidate_disassembly(self) -> None:
+        """
+        Drop all prefetched disassembly. Called when labels, function names, or comments change, since they are part
+        of the disassembly of any function that refers to them.
+        """
+        with self._lock:
+            self._disassemblies.clear()
+
+    def take_disassembly(self, func_addr: int) -> Disassembly | None:
+        """
+        Get (and forget) the prefetched disassembly of a function, if there is any.
+        """
+        with self._lock:
+            disasm = self._disassemblies.pop(func_addr, None)
+        self._record("disassembly", disasm is not None)
+        return disasm
+
+    def record_decompilation_access(self, func_addr: int) -> None:
+        """
+        Count an access to the decompilation of a function as a hit if it was prefetched.
+        """
+        with self._lock:
+            hit = func_addr in self._decompiled
+            self._decompiled.discard(func_addr)
+        self._record("decompilation", hit)
+
+    def _record(self, kind: str, hit: bool) -> None:
+        if hit:
+            self.hits[kind] += 1
+        else:
+            self.misses[kind] += 1
+        _l.debug(
+            "Prefetch %s hit rate: %.1f%% (%d/%d)",
+            kind,
+            self.hit_rate(kind) * 100,
+            self.hits[kind],
+            self.hits[kind] + self.misses[kind],
+        )
+
+    def _on_invalidated(self, **kwargs) -> None:
+        delta = kwargs.get("delta")
+        if delta is not None:
+            # only the functions that got new blocks are stale
+            with self._lock:
+                for func_addr in delta.changed_functions:
+                    self._disassemblies.pop(func_addr, None)
+                    self._decompiled.discard(func_addr)
+            return
+        with self._lock:
+            self._disassemblies.clear()
+            self._decompiled.clear()
+        self._focus_addr = None
@@ -4,7 +4,7 @@ import contextlib
 import threading
 from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
-from PySide6.QtCore import QCoreApplication, QEvent, QThread
+from PySide6.QtCore import QCoreApplication, QEvent, QThread, QTimer
 
 from . import GlobalInfo
 
@@ -104,3 +104,13 @@ def gui_thread_schedule_async(
 
     with contextlib.suppress(RuntimeError):  # the application is exiting and the main window has been destroyed.
         QCoreApplication.postEvent(GlobalInfo.main_window, event)
+
+
+def gui_thread_schedule_later(func: Callable[[], Any], delay: float = 0.0) -> None:
+    """
+    Schedules the given callable to be executed on the GUI thread after `delay` seconds, or in the next iteration of
+    the event loop if `delay` is 0. This function may be called from any thread.
+
+    :returns: None
+    """
+    gui_thread_schedule_async(QTimer.singleShot, args=(int(delay * 1000), func))
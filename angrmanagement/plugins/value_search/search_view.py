@@ -72,6 +72,13 @@ class SearchView(InstanceView):
         self._value_table.filter_string = pattern
         self.reload()
 
+    def repeat_search(self) -> None:
+        """
+        Search again for the last query, e.g., when the results may have changed.
+        """
+        if self._value_table.filter_string is not None:
+            self._value_table.filter_string = self._value_table.filter_string
+
     def _on_string_selected(self, s: MemoryData) -> None:
         """
         A string reference is selected.
@@ -140,6 +147,9 @@ class SearchView(InstanceView):
 
     def _on_search_code_changed(self, state) -> None:
         self.should_search_code = state == 2
+        if self.should_search_code:
+            # index the operands of the code ahead of the first search
+            self.plugin.prepare_code_search()
 
     def _on_constant_selected(self) -> None:
         self._filter_string.setText(self.sender().data())
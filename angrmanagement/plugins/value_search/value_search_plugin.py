@@ -4,6 +4,9 @@ import logging
 import struct
 from typing import TYPE_CHECKING
 
+from angrmanagement.data.jobs import OperandIndexingJob
+from angrmanagement.data.jobs.job import JobState
+from angrmanagement.data.operand_index import OperandValueIndex, function_fingerprint
 from angrmanagement.plugins import BasePlugin
 
 from .search_view import SearchView
@@ -23,6 +26,11 @@ class ValueSearch(BasePlugin):
         super().__init__(workspace)
 
         self._endness_encoding = None
+        # operand values of all instructions, for searching code
+        self.operand_index: OperandValueIndex | None = None
+        # the CFG model that the operand index is known to be up to date with
+        self._operand_index_cfg = None
+        self._operand_index_job: OperandIndexingJob | None = None
         self._create_search_view()
 
     def _find_endness_encoding(self) -> None:
@@ -42,6 +50,18 @@ class ValueSearch(BasePlugin):
     def teardown(self) -> None:
         self._destroy_search_view()
 
+    def angrdb_store_entries(self):
+        if self.operand_index is not None:
+            yield ("operand_index", self.operand_index.dumps())
+
+    def angrdb_load_entry(self, key: str, value: str) -> None:
+        if key == "operand_index":
+            try:
+                self.operand_index = OperandValueIndex.loads(value)
+            except ValueError:
+                logger.warning("Failed to load the operand index. It will be rebuilt.", exc_info=True)
+            self._operand_index_cfg = None
+
     def _create_search_view(self) -> None:
         self.search_view = SearchView(self, self.workspace, "center", self.workspace.main_instance)
         self.workspace.add_view(self.search_view)
@@ -53,18 +73,79 @@ class ValueSearch(BasePlugin):
     # helpers
     #
 
-    def search_in_code(self, value: bytes):
-        imms = []
-        for func in self.workspace.main_instance.kb.functions.values():
-            for block in func.blocks:
-                for insn in block.capstone.insns:
-                    if hasattr(insn, "operands"):
-                        for op in insn.operands:
-                            if op.type == 2:
-                                imm = self._int_to_bytes(op.imm, strip_zeros=True)
-                                if imm == value:
-                                    imms.append(insn.address)
-        return imms
+    def prepare_code_search(self) -> bool:
+        """
+        Make sure that the operand index is up to date, and start indexing in the background if it is not.
+
+        :return: True if the index is up to date.
+        """
+        instance = self.workspace.main_instance
+        if instance.cfg.am_none:
+            return False
+        if self.operand_index is not None and self._operand_index_cfg is not instance.cfg.am_obj:
+            # the index was loaded, or the CFG was regenerated since the index was built
+            if self.operand_index.fingerprint == function_fingerprint(instance.kb.functions.function_addrs_set):
+                self._operand_index_cfg = instance.cfg.am_obj
+            else:
+                self.operand_index = None
+        if self.operand_index is not None:
+            return True
+
+        job = self._operand_index_job
+        if job is None or job.state in (JobState.CANCELLED, JobState.FAILED):
+            self._operand_index_job = OperandIndexingJob(instance, on_finish=self._on_operand_index_built)
+            self.workspace.job_manager.add_job(self._operand_index_job)
+        return False
+
+    def _on_operand_index_built(self, index: OperandValueIndex | None) -> None:
+        self._operand_index_job = None
+        if index is None:
+            return
+        self.operand_index = index
+        self._operand_index_cfg = None
+        if self.search_view.should_search_code:
+            self.search_view.repeat_search()
+
+    def search_in_code(self, query: str, value_bytes: bytes | None) -> list[int]:
+        """
+        Find the instructions with an immediate or displacement operand that matches a query.
+
+        :param query:       The query. Without the encoded value, it is an integer, a range of integers ("lo..hi") or
+                            an integer with a mask ("value&mask").
+        :param value_bytes: The encoded value to search for, if the query is not an integer.
+        """
+        if not self.prepare_code_search():
+            logger.info("Indexing instruction operands. The search will be repeated when indexing is done.")
+            return []
+
+        if value_bytes is None:
+            matches = self._search_int_operands(query)
+        elif 0 < len(value_bytes) <= 8:
+            # look for the encoded value as an immediate
+            if self._endness_encoding is None:
+                self._find_endness_encoding()
+            byteorder = "big" if self._endness_encoding == ">" else "little"
+            matches = self.operand_index.find(int.from_bytes(value_bytes, byteorder))
+        else:
+            return []
+        return sorted({insn_addr for _, insn_addr, _ in matches})
+
+    def _search_int_operands(self, value: str) -> list[tuple[int, int, int]]:
+        if ".." in value:
+            lo, hi = value.split("..", 1)
+            return self.operand_index.find_range(int(lo, 0), int(hi, 0))
+        if "&" in value:
+            v, mask = value.split("&", 1)
+            return self.operand_index.find_masked(int(v, 0), int(mask, 0))
+
+        i_val = int(value, 0)
+        if i_val >= 0:
+            return self.operand_index.find(i_val)
+        # negative values are stored in the two's complement of their operand widths
+        matches = []
+        for width in {8, 16, 32, self.workspace.main_instance.project.arch.bits}:
+            matches += self.operand_index.find(i_val & ((1 << width) - 1))
+        return matches
 
     def search_by_bytes(self, value: bytes, alignment: int):
         if value is None:
@@ -116,6 +197,11 @@ class ValueSearch(BasePlugin):
     #
 
     def on_search_trigger(self, value: str, type_: str, alignment: int, should_search_code: bool):
+        if should_search_code and type_ == "int":
+            # integer queries on code may be ranges or masks, which are not encoded
+            return self.search_in_code(value, None), value.encode()
+
+        query = value
         if type_ == "int":
             i_val = int(value, 0)
             value = self._int_to_bytes(i_val)
@@ -131,6 +217,6 @@ class ValueSearch(BasePlugin):
             value = value.encode().decode("unicode_escape").encode("latin-1")
 
         if should_search_code:
-            return self.search_in_code(value), value
+            return self.search_in_code(query, value), value
         else:
             return self.search_by_bytes(value, alignment), value
@@ -9,10 +9,10 @@ from PySide6.QtWidgets import QDialog, QLineEdit, QListView, QStyle, QStyledItem
 from thefuzz import process
 
 from angrmanagement.config import Conf
+from angrmanagement.data.symbol_index import SymbolIndex
 
 if TYPE_CHECKING:
-    from angr.knowledge_plugins.functions import Function
-
+    from angrmanagement.data.symbol_index import Symbol
     from angrmanagement.logic.commands import Command
     from angrmanagement.ui.workspace import Workspace
 
@@ -27,9 +27,7 @@ class PaletteModel(QAbstractItemModel):
         super().__init__()
         self.workspace: Workspace = workspace
         self._available_items: list[Any] = self.get_items()
-        self._item_to_caption: dict[Any, str] = {
-            item: self.get_caption_for_item(item) for item in self._available_items
-        }
+        self._item_to_caption: dict[Any, str] | None = None
         self._filtered_items: list[Any] = self._available_items
         self._filter_text: str = ""
 
@@ -60,9 +58,17 @@ class PaletteModel(QAbstractItemModel):
         if query == "":
             self._filtered_items = self._available_items
         else:
-            self._filtered_items = [item for _, _, item in process.extract(query, self._item_to_caption, limit=50)]
+            self._filtered_items = self.search(query, limit=50)
         self.endResetModel()
 
+    def search(self, query: str, limit: int) -> list[Any]:
+        """
+        Find the items whose captions match `query` best.
+        """
+        if self._item_to_caption is None:
+            self._item_to_caption = {item: self.get_caption_for_item(item) for item in self._available_items}
+        return [item for _, _, item in process.extract(query, self._item_to_caption, limit=limit)]
+
     def get_items(self) -> list[Any]:  # pylint:disable=no-self-use
         return []
 
@@ -100,34 +106,40 @@ class GotoPaletteModel(PaletteModel):
     Data provider for goto palette.
     """
 
-    def get_items(self) -> list[Function]:
-        items = []
+    ICON_TEXTS = {SymbolIndex.FUNCTION: "f", SymbolIndex.LABEL: "l", SymbolIndex.STRING: "s"}
 
+    def get_items(self) -> list[Symbol]:
         instance = self.workspace.main_instance
-        if instance and not instance.project.am_none:
-            project = instance.project.am_obj
-            assert project is not None
-            items.extend([func for _, func in project.kb.functions.items()])
-
-        return items
-
-    def get_icon_color_and_text_for_item(self, item: Function) -> tuple[QColor | None, str]:
-        if item.is_syscall:
-            color = Conf.function_table_syscall_color
-        elif item.is_plt:
-            color = Conf.function_table_plt_color
-        elif item.is_simprocedure:
-            color = Conf.function_table_simprocedure_color
-        elif item.is_alignment:
-            color = Conf.function_table_alignment_color
-        else:
-            color = QColor(Qt.GlobalColor.gray)
-        return (color, "f")
+        if not instance or instance.project.am_none:
+            return []
+        # the symbol index is shared by all goto-style dialogs and is only updated where symbols changed
+        return instance.indexed_symbols(SymbolIndex.FUNCTION)
 
-    def get_caption_for_item(self, item: Function) -> str:
-        return item.name
+    def search(self, query: str, limit: int) -> list[Symbol]:
+        instance = self.workspace.main_instance
+        if not instance or instance.project.am_none:
+            return []
+        return instance.search_symbols(query, limit=limit)
+
+    def get_icon_color_and_text_for_item(self, item: Symbol) -> tuple[QColor | None, str]:
+        color = QColor(Qt.GlobalColor.gray)
+        functions = self.workspace.main_instance.kb.functions
+        if item.kind == SymbolIndex.FUNCTION and item.addr in functions:
+            func = functions[item.addr]
+            if func.is_syscall:
+                color = Conf.function_table_syscall_color
+            elif func.is_plt:
+                color = Conf.function_table_plt_color
+            elif func.is_simprocedure:
+                color = Conf.function_table_simprocedure_color
+            elif func.is_alignment:
+                color = Conf.function_table_alignment_color
+        return (color, self.ICON_TEXTS.get(item.kind, ""))
+
+    def get_caption_for_item(self, item: Symbol) -> str:
+        return item.caption
 
-    def get_annotation_for_item(self, item: Function) -> str:
+    def get_annotation_for_item(self, item: Symbol) -> str:
         return f"{item.addr:x}"
 
 
@@ -261,5 +261,8 @@ class RenameNode(QDialog):
                 else:
                     ty.label = node_name
 
+            # prefetched disassembly and cached decompilations may show the old name
+            workspace.prefetcher.invalidate_disassembly()
+            self._code_view.instance.decompilation_cache.invalidate_globals_digest()
             self._code_view.codegen.am_event()
             self.close()
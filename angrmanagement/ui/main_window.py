@@ -16,6 +16,7 @@ from PySide6.QtCore import QEvent, QObject, QSize, Qt, QUrl
 from PySide6.QtGui import QDesktopServices, QIcon, QKeySequence, QShortcut, QWindow
 from PySide6.QtWidgets import (
     QFileDialog,
+    QInputDialog,
     QMainWindow,
     QMessageBox,
     QWidget,
@@ -25,6 +26,7 @@ from angrmanagement.config import Conf, save_config
 from angrmanagement.consts import IMG_LOCATION
 from angrmanagement.daemon import daemon_conn, daemon_exists, run_daemon_process
 from angrmanagement.daemon.client import ClientService
+from angrmanagement.data.graph_layout_cache import GRAPH_LAYOUT_CACHE_DB_KEY
 from angrmanagement.data.jobs import DependencyAnalysisJob
 from angrmanagement.data.jobs.loading import LoadAngrDBJob, LoadBinaryJob
 from angrmanagement.data.library_docs import LibraryDocs
@@ -798,6 +800,19 @@ class MainWindow(QMainWindow):
         if self.workspace is not None:
             self.workspace.decompile_current_function()
 
+    def decompile_all_functions(self) -> None:
+        if self.workspace is not None:
+            self.workspace.decompile_functions()
+
+    def decompile_hottest_functions(self) -> None:
+        if self.workspace is None:
+            return
+        limit, ok = QInputDialog.getInt(
+            self, "Decompile hottest functions", "Number of functions (most callers first):", 100, 1, 1000000
+        )
+        if ok:
+            self.workspace.decompile_functions(limit=limit)
+
     def view_proximity_for_current_function(self) -> None:
         if self.workspace is not None:
             self.workspace.view_proximity_for_current_function()
@@ -879,6 +894,8 @@ class MainWindow(QMainWindow):
         else:
             self.workspace.main_instance.initialize_pseudocode_variable_kb()
         self.workspace.main_instance.project.am_event(initialized=True)
+        if GRAPH_LAYOUT_CACHE_DB_KEY in job.extra_info:
+            self.workspace.main_instance.graph_layout_cache.loads(job.extra_info[GRAPH_LAYOUT_CACHE_DB_KEY])
 
         # trigger callbacks
         self.workspace.reload()
@@ -893,6 +910,7 @@ class MainWindow(QMainWindow):
 
         angrdb = AngrDB(project=self.workspace.main_instance.project)
         extra_info = self.workspace.plugins.angrdb_store_entries()
+        extra_info[GRAPH_LAYOUT_CACHE_DB_KEY] = self.workspace.main_instance.graph_layout_cache.dumps()
         angrdb.dump(
             file_path,
             kbs=[
@@ -929,6 +947,9 @@ class MainWindow(QMainWindow):
             self._progress_dialog.setLabelText(text)
             self._progress_dialog.setValue(round(percentage))
 
-    def _on_job_finished(self, job: Job) -> None:  # pylint:disable=unused-argument
-        self._status_bar.progress_done()
-        self._progress_dialog.reset()
+    def _on_job_finished(self, job: Job) -> None:
+        # other jobs may still be running on the remaining workers
+        if not self.workspace.job_manager.running_jobs:
+            self._status_bar.progress_done()
+        if job.blocking:
+            self._progress_dialog.reset()
@@ -31,6 +31,8 @@ class AnalyzeMenu(Menu):
                     shortcut=QKeySequence(Qt.Key.Key_F5),
                     icon=icon("pseudocode-view"),
                 ),
+                MenuEntry("Decompile &All Functions", main_window.decompile_all_functions),
+                MenuEntry("Decompile &Hottest Functions...", main_window.decompile_hottest_functions),
                 MenuEntry(
                     "View in Proximity &Browser",
                     main_window.view_proximity_for_current_function,
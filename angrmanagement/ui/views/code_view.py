@@ -164,14 +164,10 @@ class CodeView(FunctionView):
             job = DecompileFunctionJob(
                 self.instance,
                 self._function.am_obj,
-                cfg=self.instance.cfg,
-                options=self._options.option_and_values,
-                optimization_passes=self._options.selected_passes,
-                peephole_optimizations=self._options.selected_peephole_opts,
-                inline_functions=self.instance.functions_to_inline,
-                vars_must_struct=self.vars_must_struct,
+                **self.decompiler_args(),
                 on_finish=decomp_ready,
                 blocking=True,
+                use_disk_cache=not reset_cache,
                 regen_clinic=regen_clinic,
             )
             self.workspace.job_manager.add_job(job)
@@ -188,6 +184,19 @@ class CodeView(FunctionView):
         else:
             decomp()
 
+    def decompiler_args(self) -> dict[str, Any]:
+        """
+        The decompiler arguments for the options currently selected in this view.
+        """
+        return {
+            "cfg": self.instance.cfg,
+            "options": self._options.option_and_values,
+            "optimization_passes": self._options.selected_passes,
+            "peephole_optimizations": self._options.selected_peephole_opts,
+            "inline_functions": self.instance.functions_to_inline,
+            "vars_must_struct": self.vars_must_struct,
+        }
+
     def highlight_chunks(self, chunks) -> None:
         extra_selections = []
         for start, end in chunks:
@@ -361,6 +370,8 @@ class CodeView(FunctionView):
         if not self.codegen.am_none and self._last_function is self._function.am_obj:
             self._focus_core(focus, focus_addr)
             return
+        self.workspace.prefetcher.record_decompilation_access(self._function.addr)
+        self.workspace.prefetcher.focus(self._function.am_obj)
         available = self.instance.kb.decompilations.available_flavors(self._function.addr)
         self._update_available_views(available)
         should_decompile = True
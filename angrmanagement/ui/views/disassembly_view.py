@@ -345,6 +345,9 @@ class DisassemblyView(SynchronizedFunctionView):
         if not kwargs:
             self._reload_current_function_if_changed()
             self._linear_viewer.reload()
+        elif "object_added" in kwargs:
+            # the events are coalesced, so this runs in the GUI thread with the whole batch
+            self._linear_viewer.on_cfb_objects_added(kwargs["object_added"])
 
     #
     # UI
@@ -657,6 +660,7 @@ class DisassemblyView(SynchronizedFunctionView):
             self.instance.variable_recovery_job.prioritize_function(function.addr)
         self.jump_history.jump_to(function.addr)
         self._display_function(function)
+        self.workspace.prefetcher.focus(function)
 
     def decompile_current_function(self) -> None:
         if self.function.am_obj is not None:
@@ -784,6 +788,8 @@ class DisassemblyView(SynchronizedFunctionView):
             # callback first
             if self.instance.label_rename_callback:
                 self.instance.label_rename_callback(addr=addr, new_name=new_name)
+            self.workspace.prefetcher.invalidate_disassembly()
+            self.instance.decompilation_cache.invalidate_globals_digest()
 
             if full_refresh:
                 # redraw the entire graph. required if a data address is renamed.
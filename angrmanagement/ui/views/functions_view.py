@@ -9,6 +9,7 @@ from angrmanagement.ui.widgets.qfunction_table import QFunctionTable
 from .view import InstanceView
 
 if TYPE_CHECKING:
+    from angrmanagement.data.cfg_delta import CFGDelta
     from angrmanagement.data.instance import Instance
     from angrmanagement.ui.workspace import Workspace
 
@@ -24,7 +25,7 @@ class FunctionsView(InstanceView):
         self.base_caption = "Functions"
         self._function_table: QFunctionTable
 
-        self.instance.cfg.am_subscribe(self.reload)
+        self.instance.cfg.am_subscribe(self._on_cfg_event)
 
         self._init_widgets()
 
@@ -44,6 +45,8 @@ class FunctionsView(InstanceView):
         # XXX: yes this is bad, however, the cache is not being updated properly and is documented
         # in https://github.com/angr/angr-management/pull/1023. Until that is fixed, this is what we got.
         self._function_table._table_view._model._data_cache = {}
+        # function names may have changed
+        self._function_table._table_view._model.invalidate_search_index()
         self.refresh()
 
     def refresh(self) -> None:
@@ -75,6 +78,14 @@ class FunctionsView(InstanceView):
 
         self.setLayout(vlayout)
 
+    def _on_cfg_event(self, **kwargs) -> None:
+        delta: CFGDelta | None = kwargs.get("delta")
+        if delta is not None:
+            # the CFG is being recovered
+            self._function_table.apply_delta(delta)
+        else:
+            self.reload()
+
     def _on_function_selected(self, func) -> None:
         """
         A new function is on selection right now. Update the disassembly view that is currently at front.
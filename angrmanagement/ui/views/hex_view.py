@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import functools
 import logging
+import math
 from collections.abc import Callable, Sequence
 from enum import Enum
 from typing import TYPE_CHECKING
@@ -12,7 +13,7 @@ from angr import Block
 from angr.knowledge_plugins.cfg import MemoryData, MemoryDataSort
 from angr.knowledge_plugins.patches import Patch
 from PySide6.QtCore import QEvent, QMarginsF, QPointF, QRectF, QSizeF, Qt, QTimer, Signal
-from PySide6.QtGui import QAction, QColor, QCursor, QFont, QPainterPath, QPen, QWheelEvent
+from PySide6.QtGui import QAction, QColor, QCursor, QFont, QPainter, QPainterPath, QPen, QPixmap, QWheelEvent
 from PySide6.QtWidgets import (
     QAbstractScrollArea,
     QAbstractSlider,
@@ -31,21 +32,24 @@ from PySide6.QtWidgets import (
     QMenu,
     QMessageBox,
     QPushButton,
+    QStyleOptionGraphicsItem,
     QVBoxLayout,
 )
 
 from angrmanagement.config import Conf
 from angrmanagement.data.breakpoint import Breakpoint, BreakpointType
-from angrmanagement.logic.debugger import DebuggerWatcher
+from angrmanagement.data.tagged_interval_map import IntervalIndex
+from angrmanagement.logic.debugger import DebuggerMemorySnapshot, DebuggerWatcher
+from angrmanagement.logic.threads import gui_thread_schedule_async
 from angrmanagement.ui.dialogs.input_prompt import InputPromptDialog
 from angrmanagement.ui.dialogs.jumpto import JumpTo
 from angrmanagement.utils import is_printable
+from angrmanagement.utils.cache import SmartLRUCache
 
 from .view import SynchronizedInstanceView
 
 if TYPE_CHECKING:
-    from PySide6.QtGui import QPainter
-    from PySide6.QtWidgets import QStyleOptionGraphicsItem, QWidget
+    from PySide6.QtWidgets import QWidget
 
     from angrmanagement.data.instance import Instance
     from angrmanagement.ui.workspace import Workspace
@@ -59,6 +63,52 @@ HexDataBuffer = bytes | bytearray
 HexDataProvider = Callable[[HexAddress], HexByteValue]
 
 
+class HexDataRange:
+    """
+    The contents of a contiguous range of memory. Bytes without a known value (e.g. unmapped or symbolic bytes) are
+    listed in `unknown` by their offset, with the character to display for them.
+    """
+
+    __slots__ = ("addr", "data", "unknown")
+
+    def __init__(self, addr: HexAddress, data: bytes, unknown: dict[int, str] | None = None) -> None:
+        self.addr = addr
+        self.data = data
+        self.unknown = unknown if unknown is not None else {}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def value(self, addr: HexAddress) -> HexByteValue:
+        """
+        Get the value of the byte at `addr`, in the format of HexDataProvider.
+        """
+        offset = addr - self.addr
+        if self.unknown:
+            v = self.unknown.get(offset, None)
+            if v is not None:
+                return v
+        return self.data[offset]
+
+    @classmethod
+    def from_provider(cls, read_func: HexDataProvider, addr: HexAddress, size: int) -> HexDataRange:
+        """
+        Read a range byte by byte, for data sources that cannot read ranges.
+        """
+        data = bytearray(size)
+        unknown = {}
+        for offset in range(size):
+            v = read_func(addr + offset)
+            if isinstance(v, int):
+                data[offset] = v
+            else:
+                unknown[offset] = v
+        return cls(addr, bytes(data), unknown)
+
+
+HexRangeProvider = Callable[[HexAddress, int], HexDataRange]
+
+
 class HexDataSource(Enum):
     """
     Data source to be displayed in the hex view.
@@ -248,6 +298,9 @@ class HexGraphicsObject(QGraphicsObject):
     cursor_changed = Signal()
     viewport_changed = Signal()
 
+    # the number of rendered rows of text to keep
+    ROW_CACHE_SIZE = 512
+
     def __init__(self) -> None:
         super().__init__()
         self.setFlag(
@@ -263,6 +316,7 @@ class HexGraphicsObject(QGraphicsObject):
         self.num_bytes: int = 0
         self.end_addr: HexAddress = 0  # Exclusive
         self.read_func: HexDataProvider | None = None
+        self.read_range_func: HexRangeProvider | None = None
         self.write_func: Callable[[HexAddress, HexByteValue], bool] = None
         self.data: HexDataBuffer | None = None
         self.addr_offset: int = 0
@@ -290,6 +344,12 @@ class HexGraphicsObject(QGraphicsObject):
         self.ascii_column_active: bool = False
         self.cursor_blink_state: bool = True
         self.highlighted_regions: Sequence[HexHighlightRegion] = []
+        self._highlight_index: IntervalIndex = IntervalIndex()
+        self._active_highlight_regions: list[HexHighlightRegion] = []
+        # (row address, row values) -> rendered text of the row. rows are rendered again when their bytes change
+        self._row_cache: SmartLRUCache = SmartLRUCache(maxsize=self.ROW_CACHE_SIZE)
+        # everything other than the bytes that the rendered rows depend on
+        self._row_cache_style = None
 
         self.cursor_blink_timer: QTimer = QTimer(self)
         self.cursor_blink_timer.timeout.connect(self.toggle_cursor_blink)
@@ -390,6 +450,13 @@ class HexGraphicsObject(QGraphicsObject):
         """
         return self.data[addr - self.start_addr]
 
+    def _simple_read_range_callback(self, addr: HexAddress, size: int) -> HexDataRange:
+        """
+        Handler for simple data buffers.
+        """
+        offset = addr - self.start_addr
+        return HexDataRange(addr, bytes(self.data[offset : offset + size]))
+
     # pylint:disable=unused-argument,no-self-use
     def _simple_write_callback(self, addr: HexAddress, value: HexByteValue) -> bool:
         """
@@ -405,20 +472,38 @@ class HexGraphicsObject(QGraphicsObject):
         self.start_addr = start_addr
         self.num_bytes = num_bytes if num_bytes is not None else len(data)
         self.read_func = self._simple_read_callback
+        self.read_range_func = self._simple_read_range_callback
         self.write_func = self._simple_write_callback
         self._set_data_common()
 
-    def set_data_callback(self, write_func, read_func: HexDataProvider, start_addr: HexAddress, num_bytes: int) -> None:
+    def set_data_callback(
+        self,
+        write_func,
+        read_func: HexDataProvider,
+        start_addr: HexAddress,
+        num_bytes: int,
+        read_range_func: HexRangeProvider | None = None,
+    ) -> None:
         """
-        Assign the buffer to be displayed using a callback function.
+        Assign the buffer to be displayed using callback functions. If `read_range_func` is not provided, ranges are
+        read byte by byte with `read_func`.
         """
         self.data = None
         self.start_addr = start_addr
         self.num_bytes = num_bytes
         self.write_func = write_func
         self.read_func = read_func
+        self.read_range_func = read_range_func
         self._set_data_common()
 
+    def read_range(self, addr: HexAddress, size: int) -> HexDataRange:
+        """
+        Read `size` bytes at `addr`.
+        """
+        if self.read_range_func is not None:
+            return self.read_range_func(addr, size)
+        return HexDataRange.from_provider(self.read_func, addr, size)
+
     def clear(self) -> None:
         """
         Clear the current buffer.
@@ -553,25 +638,23 @@ class HexGraphicsObject(QGraphicsObject):
             minaddr = min(self.cursor, self.selection_start)
             maxaddr = max(self.cursor, self.selection_start)
 
-        for region in self.highlighted_regions:
-            region_end = region.addr + region.size - 1
-            region.active = not (region.addr > maxaddr or minaddr > region_end)
+        for region in self._active_highlight_regions:
+            region.active = False
+        self._active_highlight_regions = self._highlight_index.overlapping(minaddr, maxaddr)
+        for region in self._active_highlight_regions:
+            region.active = True
 
     def get_active_highlight_regions(self) -> Sequence[HexHighlightRegion]:
         """
         Get currently active highlight regions.
         """
-        return [rgn for rgn in self.highlighted_regions if rgn.active]
+        return list(self._active_highlight_regions)
 
     def get_highlight_regions_at_addr(self, addr: HexAddress) -> Sequence[HexHighlightRegion]:
         """
         Return the highlight regions at specified address.
         """
-        regions = []
-        for region in self.highlighted_regions:
-            if region.addr <= addr < (region.addr + region.size):
-                regions.append(region)
-        return regions
+        return self._highlight_index.at(addr)
 
     def get_highlight_regions_under_cursor(self) -> Sequence[HexHighlightRegion]:
         """
@@ -885,6 +968,11 @@ class HexGraphicsObject(QGraphicsObject):
         Sets the list of highlighted regions.
         """
         self.highlighted_regions = regions
+        self._highlight_index = IntervalIndex()
+        for region in regions:
+            region.active = False
+            self._highlight_index.add(region.addr, region.size, region)
+        self._active_highlight_regions = []
         self.update_active_highlight_regions()
         self.update()
 
@@ -939,7 +1027,7 @@ class HexGraphicsObject(QGraphicsObject):
             painter.setBrush(Conf.palette_base if row_addr & 0x10 else Conf.palette_alternatebase)
             painter.drawRect(QRectF(0, pt.y(), self.boundingRect().width(), self.row_height))
 
-        for region in self.highlighted_regions:
+        for region in self._highlight_index.overlapping(self.row_to_addr(min_row), self.row_to_addr(max_row + 1) - 1):
             self.paint_highlighted_region(painter, region)
 
         # Paint selection
@@ -965,66 +1053,30 @@ class HexGraphicsObject(QGraphicsObject):
             painter.drawPath(self.build_selection_path(minaddr, maxaddr, True, half_pen_width))
 
         # Paint text
-        painter.setFont(self.font)
+        # Read the bytes of all exposed rows at once
+        data_start = max(self.row_to_addr(min_row), self.display_start_addr)
+        data_end = min(self.row_to_addr(max_row + 1), self.display_end_addr)
+        data = self.read_range(data_start, data_end - data_start) if data_start < data_end else None
+
+        scale = painter.device().devicePixelRatioF() * QStyleOptionGraphicsItem.levelOfDetailFromTransform(
+            painter.worldTransform()
+        )
+        self._update_row_cache_style(scale)
 
         for row in range(min_row, max_row + 1):
             row_addr = self.row_to_addr(row)
             if row_addr >= self.display_end_addr:
                 break
 
-            pt = self.row_to_point(row)
-            pt.setY(pt.y() + self.row_height - self.row_padding)
-
-            # Paint address
-            addr_text = f"{row_addr:08x}"
-            pt.setX(self.addr_offset)
-            painter.setPen(Conf.disasm_view_node_address_color)
-            painter.drawText(pt, addr_text)
-
-            # Paint byte values
-            for col in range(16):
-                addr = self.row_col_to_addr(row, col)
-                if addr < self.display_start_addr or addr >= self.display_end_addr:
-                    continue
-                val = self.read_func(addr)
-                pt.setX(self.byte_column_offsets[col])
-
-                if isinstance(val, int):
-                    if is_printable(val):
-                        color = Conf.disasm_view_printable_byte_color
-                    else:
-                        color = Conf.disasm_view_unprintable_byte_color
-                    byte_text = f"{val:02x}"
-                else:
-                    byte_text = val * 2 if isinstance(val, str) and len(val) == 1 else "??"
-                    color = Conf.disasm_view_unknown_byte_color
-
-                pt.setX(self.byte_column_offsets[col])
-                painter.setPen(color)
-                painter.drawText(pt, byte_text)
-
-            # Paint ASCII representation
-            for col in range(16):
-                addr = self.row_col_to_addr(row, col)
-                if addr < self.display_start_addr or addr >= self.display_end_addr:
-                    continue
-                val = self.read_func(addr)
-                pt.setX(self.ascii_column_offsets[col])
-
-                if isinstance(val, int):
-                    if is_printable(val):
-                        color = Conf.disasm_view_printable_character_color
-                        ch = chr(val)
-                    else:
-                        color = Conf.disasm_view_unprintable_character_color
-                        ch = "."
-                else:
-                    color = Conf.disasm_view_unknown_character_color
-                    ch = val if isinstance(val, str) and len(val) == 1 else "?"
-
-                pt.setX(self.ascii_column_offsets[col])
-                painter.setPen(color)
-                painter.drawText(pt, ch)
+            row_values = tuple(
+                data.value(addr) if data_start <= addr < data_end else None for addr in range(row_addr, row_addr + 16)
+            )
+            key = row_addr, row_values
+            pixmap = self._row_cache.get(key, None)
+            if pixmap is None:
+                pixmap = self._render_row(row_addr, row_values, scale)
+                self._row_cache[key] = pixmap
+            painter.drawPixmap(self.row_to_point(row), pixmap)
 
         # Paint cursor
         if self.show_cursor and (self.display_start_addr <= self.cursor < self.display_end_addr):
@@ -1054,6 +1106,93 @@ class HexGraphicsObject(QGraphicsObject):
             tl.setY(tl.y() + self.row_height - cursor_height)
             painter.drawRect(QRectF(tl, QSizeF(self.ascii_width, cursor_height)))
 
+    def _update_row_cache_style(self, scale: float) -> None:
+        """
+        Drop all rendered rows if the font, colors, layout, or scale changed.
+        """
+        colors = (
+            Conf.disasm_view_node_address_color,
+            Conf.disasm_view_printable_byte_color,
+            Conf.disasm_view_unprintable_byte_color,
+            Conf.disasm_view_unknown_byte_color,
+            Conf.disasm_view_printable_character_color,
+            Conf.disasm_view_unprintable_character_color,
+            Conf.disasm_view_unknown_character_color,
+        )
+        style = (
+            scale,
+            self.font.key(),
+            self.row_height,
+            self.row_padding,
+            self.addr_offset,
+            tuple(self.byte_column_offsets),
+            tuple(self.ascii_column_offsets),
+            tuple(QColor(c).rgba() for c in colors),
+        )
+        if style != self._row_cache_style:
+            self._row_cache.clear()
+            self._row_cache_style = style
+
+    def _render_row(self, row_addr: HexAddress, row_values: Sequence[HexByteValue | None], scale: float) -> QPixmap:
+        """
+        Render the text of a row into a transparent pixmap. Values of None are not displayed.
+        """
+        pixmap = QPixmap(math.ceil(self.max_x * scale), math.ceil(self.row_height * scale))
+        pixmap.setDevicePixelRatio(scale)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setFont(self.font)
+        pt = QPointF(0, self.row_height - self.row_padding)
+
+        # Paint address
+        addr_text = f"{row_addr:08x}"
+        pt.setX(self.addr_offset)
+        painter.setPen(Conf.disasm_view_node_address_color)
+        painter.drawText(pt, addr_text)
+
+        # Paint byte values
+        for col, val in enumerate(row_values):
+            if val is None:
+                continue
+
+            if isinstance(val, int):
+                if is_printable(val):
+                    color = Conf.disasm_view_printable_byte_color
+                else:
+                    color = Conf.disasm_view_unprintable_byte_color
+                byte_text = f"{val:02x}"
+            else:
+                byte_text = val * 2 if isinstance(val, str) and len(val) == 1 else "??"
+                color = Conf.disasm_view_unknown_byte_color
+
+            pt.setX(self.byte_column_offsets[col])
+            painter.setPen(color)
+            painter.drawText(pt, byte_text)
+
+        # Paint ASCII representation
+        for col, val in enumerate(row_values):
+            if val is None:
+                continue
+
+            if isinstance(val, int):
+                if is_printable(val):
+                    color = Conf.disasm_view_printable_character_color
+                    ch = chr(val)
+                else:
+                    color = Conf.disasm_view_unprintable_character_color
+                    ch = "."
+            else:
+                color = Conf.disasm_view_unknown_character_color
+                ch = val if isinstance(val, str) and len(val) == 1 else "?"
+
+            pt.setX(self.ascii_column_offsets[col])
+            painter.setPen(color)
+            painter.drawText(pt, ch)
+
+        painter.end()
+        return pixmap
+
     def boundingRect(self) -> PySide6.QtCore.QRectF:
         return QRectF(0, 0, self.max_x, self.max_y)
 
@@ -1264,11 +1403,11 @@ class HexGraphicsView(QAbstractScrollArea):
         self.update_scene_rect()
         self.update_display_num_rows()
 
-    def set_region_callback(self, write, mem, addr: int, size: int) -> None:
+    def set_region_callback(self, write, mem, addr: int, size: int, mem_range=None) -> None:
         """
         Set current buffer.
         """
-        self.hex.set_data_callback(write, mem, addr, size)
+        self.hex.set_data_callback(write, mem, addr, size, read_range_func=mem_range)
         self.update_scene_rect()
         self.set_display_offset(0)
 
@@ -1343,12 +1482,14 @@ class HexView(SynchronizedInstanceView):
         self._patch_highlights: Sequence[PatchHighlightRegion] = []
         self._changed_data_highlights: Sequence[HexHighlightRegion] = []
         self._breakpoint_highlights: Sequence[BreakpointHighlightRegion] = []
+        # the address range [start, end) that _cfb_highlights were created for
+        self._cfb_highlight_window: tuple[int, int] | None = None
 
         self._init_widgets()
         self.instance.cfb.am_subscribe(self._on_cfb_event)
         self.instance.patches.am_subscribe(self._update_highlight_regions_from_patches)
         self.instance.breakpoint_mgr.breakpoints.am_subscribe(self._update_highlight_regions_from_breakpoints)
-        self._data_cache = {}
+        self._debugger_memory = DebuggerMemorySnapshot()
 
         self._reload_data()
 
@@ -1359,6 +1500,14 @@ class HexView(SynchronizedInstanceView):
     def _on_cfb_event(self, **kwargs) -> None:
         if not kwargs:
             self._reload_data()
+        elif "object_added" in kwargs:
+            # the highlight regions are only out of date if an added object overlaps their window
+            window = self._cfb_highlight_window
+            if window is not None and any(
+                addr < window[1] and window[0] < addr + (obj.size or 0) for addr, obj in kwargs["object_added"]
+            ):
+                self._cfb_highlight_window = None
+                gui_thread_schedule_async(self._update_cfb_highlight_regions, args=(True,))
 
     def closeEvent(self, event) -> None:
         self._dbg_watcher.shutdown()
@@ -1369,6 +1518,7 @@ class HexView(SynchronizedInstanceView):
         Clear all highlight regions
         """
         self._cfb_highlights = []
+        self._cfb_highlight_window = None
         self._sync_view_highlights = []
         self._patch_highlights = []
         self._changed_data_highlights = []
@@ -1392,15 +1542,18 @@ class HexView(SynchronizedInstanceView):
                 self.project_memory_read_func,
                 loader.min_addr,
                 loader.max_addr - loader.min_addr + 1,
+                mem_range=self.project_memory_read_range_func,
             )
             self._update_highlight_regions_from_patches()
         elif source == HexDataSource.Debugger:
-            self._data_cache = {}
+            self._debugger_memory.clear()
+            self._debugger_memory.update(self._current_debugger_state())
             self.inner_widget.set_region_callback(
                 self.debugger_memory_write_func,
                 self.debugger_memory_read_func,
                 0,
                 0x10000000000000000,  # FIXME: Get actual ranges and add them
+                mem_range=self.debugger_memory_read_range_func,
             )
         else:
             raise NotImplementedError
@@ -1408,36 +1561,42 @@ class HexView(SynchronizedInstanceView):
         self.inner_widget.set_display_start_addr(start)
         self.inner_widget.hex.set_cursor(cursor)
         self._update_highlight_regions_from_synchronized_views()
-        self._update_cfb_highlight_regions()
+        self._update_cfb_highlight_regions(force=True)
         self._set_highlighted_regions()
 
     def _data_source_changed(self, index: int) -> None:  # pylint:disable=unused-argument
         self._reload_data()
 
+    def _current_debugger_state(self) -> angr.SimState | None:
+        dbg = self.instance.debugger_mgr.debugger
+        return None if dbg.am_none else dbg.simstate
+
     def _on_debugger_state_updated(self) -> None:
         source = self._data_source_combo.currentData()
         if source == HexDataSource.Debugger:
             #
-            # Calculate differences in state memory and highlight
+            # Calculate differences in state memory and highlight. Only the pages that were written to since the last
+            # state are read again
             #
-            previous_data = self._data_cache
-            self._data_cache = {}
-            addr = self.inner_widget.hex.display_start_addr
+            dirty_pages = self._debugger_memory.update(self._current_debugger_state())
+            start = self.inner_widget.hex.display_start_addr
+            end = self.inner_widget.hex.display_end_addr
             regions = []
-            r = None
-            while addr < self.inner_widget.hex.display_end_addr:
-                if addr in previous_data:
-                    differs = self.debugger_memory_read_func(addr) != previous_data[addr]
-                else:
-                    differs = False
-                if differs:
-                    if r is None:
-                        r = HexHighlightRegion(Qt.GlobalColor.red, addr, 0)
-                        regions.append(r)
-                    r.size += 1
-                else:
-                    r = None
-                addr += 1
+            for page_addr in sorted(dirty_pages):
+                old_page = dirty_pages[page_addr]
+                lo = max(start, page_addr)
+                hi = min(end, page_addr + len(old_page.data))
+                if lo >= hi:
+                    continue
+                new_page = self._debugger_memory.read_page(page_addr)
+                r = None
+                for addr in range(lo, hi):
+                    offset = addr - page_addr
+                    if new_page.value(offset) != old_page.value(offset):
+                        if r is None or r.addr + r.size != addr:
+                            r = HexHighlightRegion(Qt.GlobalColor.red, addr, 0)
+                            regions.append(r)
+                        r.size += 1
             self._changed_data_highlights = regions
             self.inner_widget.hex.update()
             self._set_highlighted_regions()
@@ -1446,23 +1605,17 @@ class HexView(SynchronizedInstanceView):
         """
         Callback to populate hex view with bytes from debugger state.
         """
-        if addr not in self._data_cache:
-            dbg = self.instance.debugger_mgr.debugger
-            if dbg.am_none:
-                v = "?"
-            else:
-                state: angr.SimState | None = dbg.simstate
-                if state is None:
-                    v = "?"
-                else:
-                    try:
-                        r = state.memory.load(addr, 1)
-                        v = "S" if r.symbolic else state.solver.eval(r)
-                    except Exception:  # pylint:disable=broad-except
-                        log.exception("Failed to read @ %#x", addr)
-                        v = "?"
-            self._data_cache[addr] = v
-        return self._data_cache[addr]
+        page_size = self._debugger_memory.page_size
+        page = self._debugger_memory.read_page(addr - addr % page_size)
+        return page.value(addr - page.addr)
+
+    def debugger_memory_read_range_func(self, addr: int, size: int) -> HexDataRange:
+        """
+        Callback to populate hex view with a range of bytes from debugger state. The range is read in whole pages,
+        which are kept until the debugger state changes and they are written to.
+        """
+        data, unknown = self._debugger_memory.read(addr, size)
+        return HexDataRange(addr, data, unknown)
 
     def debugger_memory_write_func(self, addr: int, value: int) -> bool:  # pylint:disable=unused-argument,no-self-use
         """
@@ -1487,6 +1640,41 @@ class HexView(SynchronizedInstanceView):
         except KeyError:
             return "?"
 
+    def project_memory_read_range_func(self, addr: int, size: int) -> HexDataRange:
+        """
+        Callback to populate hex view with a range of bytes. The range is read from the loader in as few chunks as
+        possible, and patches are applied on top of it.
+        """
+        p = self.instance.project
+        memory = p.loader.memory
+        data = bytearray(size)
+        unknown = {}
+
+        pos, end = addr, addr + size
+        while pos < end:
+            try:
+                chunk = memory.load(pos, end - pos)
+            except KeyError:
+                chunk = b""
+            if chunk:
+                data[pos - addr : pos - addr + len(chunk)] = chunk
+                pos += len(chunk)
+                continue
+            # skip the unmapped bytes up to the next backer
+            gap_end = min(next((start for start, _ in memory.backers(pos) if start > pos), end), end)
+            for a in range(pos, gap_end):
+                unknown[a - addr] = "?"
+            pos = gap_end
+
+        for patch in p.kb.patches.get_all_patches(addr, size):
+            lo = max(patch.addr, addr)
+            hi = min(patch.addr + len(patch), end)
+            data[lo - addr : hi - addr] = patch.new_bytes[lo - patch.addr : hi - patch.addr]
+            for a in range(lo, hi):
+                unknown.pop(a - addr, None)
+
+        return HexDataRange(addr, bytes(data), unknown)
+
     def auto_patch(self, addr: int, new_bytes: bytearray):
         """
         Automatically update or create patches to ensure new_bytes are patched at addr.
@@ -1551,7 +1739,7 @@ class HexView(SynchronizedInstanceView):
         Control whether smart highlighting is enabled or not.
         """
         self.smart_highlighting_enabled = enable
-        self._update_cfb_highlight_regions()
+        self._update_cfb_highlight_regions(force=True)
 
     def _init_widgets(self) -> None:
         """
@@ -1672,11 +1860,10 @@ class HexView(SynchronizedInstanceView):
         minaddr, maxaddr = sel
         num_bytes_selected = maxaddr - minaddr + 1
 
-        self._clipboard = bytearray(num_bytes_selected)
-        for addr in range(minaddr, maxaddr + 1):
-            d = self.project_memory_read_func(addr)  # FIXME: Support multibyte read
-            if isinstance(d, int):
-                self._clipboard[addr - minaddr] = d
+        data = self.project_memory_read_range_func(minaddr, num_bytes_selected)
+        self._clipboard = bytearray(data.data)
+        for offset in data.unknown:
+            self._clipboard[offset] = 0
 
     def _paste_copied_bytes_at_cursor(self) -> None:
         """
@@ -1842,20 +2029,32 @@ class HexView(SynchronizedInstanceView):
         """
         self._update_highlight_regions_from_synchronized_views()
 
-    def _update_cfb_highlight_regions(self) -> None:
+    def _update_cfb_highlight_regions(self, force: bool = False) -> None:
         """
-        Update cached list of highlight regions under cursor.
+        Update cached list of highlight regions around the displayed range. Regions are created for the displayed range
+        plus a margin, and only created again when the displayed range leaves it, or when `force` is set.
         """
+        hex_obj = self.inner_widget.hex
+        display_start, display_end = hex_obj.display_start_addr, hex_obj.display_end_addr
+        window = self._cfb_highlight_window
+        if not force and window is not None and window[0] <= display_start and display_end <= window[1]:
+            return
+
+        margin = max(4 * (display_end - display_start), 0x1000)
+        window_start = max(display_start - margin, hex_obj.start_addr)
+        window_end = display_end + margin
+        self._cfb_highlight_window = window_start, window_end
+
         regions = []
         cfb = self.instance.cfb
         if self.smart_highlighting_enabled and not cfb.am_none:
-            for item in cfb.floor_items(self.inner_widget.hex.display_start_addr):
+            for item in cfb.floor_items(window_start):
                 item_addr, item = item
                 if item.size is None:
                     continue
-                if (item_addr + item.size) < self.inner_widget.hex.display_start_addr:
+                if (item_addr + item.size) < window_start:
                     continue
-                if item_addr >= self.inner_widget.hex.display_end_addr:
+                if item_addr >= window_end:
                     break
                 if isinstance(item, MemoryData):
                     is_string = item.sort in (MemoryDataSort.String, MemoryDataSort.UnicodeString)
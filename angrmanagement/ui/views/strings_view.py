@@ -13,9 +13,8 @@ from angrmanagement.ui.widgets.qstring_table import QStringTable
 from .view import InstanceView
 
 if TYPE_CHECKING:
-    from angr.knowledge_plugins.cfg.memory_data import MemoryData
-
     from angrmanagement.data.instance import Instance
+    from angrmanagement.data.strings_index import StringEntry
     from angrmanagement.ui.workspace import Workspace
 
 
@@ -30,6 +29,8 @@ class StringsView(InstanceView):
 
         self._selected_function = None
 
+        self.instance.strings_index.am_subscribe(self._on_strings_index_updated)
+
         self._init_widgets()
         self.reload()
 
@@ -40,8 +41,11 @@ class StringsView(InstanceView):
         if self.instance.kb is None:
             return
         self._function_list.functions = self.instance.kb.functions
-        self._string_table.cfg = self.instance.cfg
-        self._string_table.xrefs = self.instance.project.kb.xrefs
+        strings_index = self.instance.strings_index.am_obj
+        if strings_index.cfg_model is not self.instance.cfg.am_obj:
+            # the strings view is reloaded once the index is up to date
+            self.instance.update_indexes_async()
+        self._string_table.strings_index = strings_index
         self._string_table.function = self._selected_function
 
     def select_function(self, function) -> None:
@@ -61,7 +65,10 @@ class StringsView(InstanceView):
 
         self.reload()
 
-    def _on_string_selected(self, s: MemoryData) -> None:
+    def _on_strings_index_updated(self, **kwargs) -> None:  # pylint: disable=unused-argument
+        self.reload()
+
+    def _on_string_selected(self, s: StringEntry) -> None:
         """
         A string reference is selected.
 
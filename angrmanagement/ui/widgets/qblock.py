@@ -5,8 +5,8 @@ from typing import TYPE_CHECKING
 from angr.analyses.decompiler.clinic import Clinic
 from angr.analyses.disassembly import Instruction, IROp
 from angr.sim_variable import SimRegisterVariable
-from PySide6.QtCore import QMarginsF, QRectF
-from PySide6.QtGui import QPainterPath, QPen
+from PySide6.QtCore import QMarginsF, QRectF, Qt
+from PySide6.QtGui import QColor, QPainterPath, QPen
 
 from angrmanagement.config import Conf
 from angrmanagement.utils import get_block_objects, get_function_header, get_label_text, get_out_branches_for_insn
@@ -22,6 +22,8 @@ from .qphivariable import QPhiVariable
 from .qvariable import QVariable
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from PySide6.QtWidgets import QGraphicsPathItem
 
     from angrmanagement.data.instance import Instance
@@ -69,20 +71,22 @@ class QBlock(QCachedGraphicsItem):
         self.objects = []  # instructions and labels
         self._block_item: QPainterPath | None = None
         self._block_item_obj: QGraphicsPathItem | None = None
-        self.addr_to_insns = {}
+        self._addr_to_insns = {}
+        # the addresses of the instructions, which are kept when the child items are removed
+        self._insn_addrs: tuple[int, ...] = ()
         self.addr_to_labels = {}
         self.qblock_annotations = {}
 
         self._block_code_options: BlockTreeNodeOptions = BlockTreeNodeOptions()
         self._update_block_code_options()
 
-        self._init_widgets()
+        # whether the child items (instructions, labels, etc.) of this block exist. blocks are created without them
+        self._materialized = False
+        self._insn_addrs = self._collect_insn_addrs()
 
         self._objects_are_hidden = False
         self._objects_are_temporarily_hidden = False
 
-        self._create_block_item()
-
         self.setAcceptHoverEvents(True)
 
     #
@@ -101,10 +105,34 @@ class QBlock(QCachedGraphicsItem):
     def height(self):
         return self.boundingRect().height()
 
+    @property
+    def addr_to_insns(self) -> dict:
+        """
+        The instructions of this block, keyed by their addresses. The child items of the block are created if they do
+        not exist.
+        """
+        self.materialize()
+        return self._addr_to_insns
+
+    @property
+    def insn_addrs(self) -> tuple[int, ...]:
+        """
+        The addresses of the instructions of this block. Unlike addr_to_insns, this does not create the child items.
+        """
+        return self._insn_addrs
+
     #
     # Public methods
     #
 
+    def materialize(self) -> None:
+        """
+        Create the child items of this block if they do not exist.
+        """
+        if not self._materialized:
+            self._init_widgets()
+            self.update()
+
     def clear_cache(self) -> None:
         super().clear_cache()
         for obj in self.objects:
@@ -128,7 +156,7 @@ class QBlock(QCachedGraphicsItem):
             scene.removeItem(obj)
 
         self.objects.clear()
-        self.addr_to_insns.clear()
+        self._addr_to_insns.clear()
         self.addr_to_labels.clear()
         self.qblock_annotations.clear()
 
@@ -236,7 +264,7 @@ class QBlock(QCachedGraphicsItem):
             obj = QBlockCode(stmt.ins_addr, code_obj, self._config, self.instance, self.infodock, parent=self)
             code_obj.parent = obj  # Reparent
             self.objects.append(obj)
-            self.addr_to_insns[bn.addr] = obj
+            self._addr_to_insns[bn.addr] = obj
 
     def _init_disassembly_block_widgets(self) -> None:
         for obj in get_block_objects(self.disasm, self.cfg_nodes, self.func_addr):
@@ -254,7 +282,7 @@ class QBlock(QCachedGraphicsItem):
                     parent=self,
                 )
                 self.objects.append(insn)
-                self.addr_to_insns[obj.addr] = insn
+                self._addr_to_insns[obj.addr] = insn
             elif isinstance(obj, Label):
                 label = QBlockLabel(
                     obj.addr, obj.text, self._config, self.disasm_view, self.instance, self.infodock, parent=self
@@ -295,17 +323,41 @@ class QBlock(QCachedGraphicsItem):
                 )
                 self.objects.append(obj)
 
-    def _init_widgets(self) -> None:
-        if (scene := self.scene()) is not None:
-            for obj in self.objects:
+    def _remove_objects(self) -> None:
+        scene = self.scene()
+        for obj in self.objects:
+            if scene is not None:
                 scene.removeItem(obj)
+            else:
+                obj.setParentItem(None)
 
         self.objects.clear()
+        self._addr_to_insns.clear()
+        self.addr_to_labels.clear()
+
+    def _collect_insn_addrs(self) -> tuple[int, ...]:
+        """
+        Get the addresses of the instructions of this block without creating its child items.
+        """
+        if isinstance(self.disasm, Clinic):
+            return (self.cfg_nodes.addr,) if self.cfg_nodes.statements else ()
+        return tuple(
+            dict.fromkeys(
+                obj.addr
+                for obj in get_block_objects(self.disasm, self.cfg_nodes, self.func_addr)
+                if isinstance(obj, Instruction)
+            )
+        )
+
+    def _init_widgets(self) -> None:
+        self._remove_objects()
+        self._materialized = True
 
         if isinstance(self.disasm, Clinic):
             self._init_ail_block_widgets()
         else:
             self._init_disassembly_block_widgets()
+        self._insn_addrs = tuple(self._addr_to_insns)
 
         self.layout_widgets()
 
@@ -314,16 +366,96 @@ class QBlock(QCachedGraphicsItem):
 
 
 class QGraphBlock(QBlock):
+    """
+    A block in the graph view.
+
+    Blocks are created without child items for their instructions. QDisassemblyGraph materializes each block once to
+    measure it, and afterwards only keeps the child items of the blocks that are visible at a legible zoom level. A
+    dematerialized block keeps its size and draws the outline of its lines of text instead, which is also how blocks
+    are drawn when zoomed out.
+
+    Refreshing a dematerialized block does not rebuild its child items. The block keeps its last measured size and is
+    marked dirty, and it is measured again once it is materialized (see materialize()).
+    """
+
     MINIMUM_DETAIL_LEVEL = 0.4
     AIL_SHOW_CONDITIONAL_JUMP_TARGETS = False
     SHADOW_OFFSET_X = 5
     SHADOW_OFFSET_Y = 5
     BLOCK_ANNOTATIONS_LEFT_PADDING = 2
+    # the fraction of the height of a line that is covered by its outline
+    OUTLINE_LINE_RATIO = 0.6
+
+    # the rects of the lines of text relative to the block, set by layout_widgets()
+    _line_rects: tuple[QRectF, ...] = ()
+    _outline: QPainterPath | None = None
+    # the bounding rect of the child items when the block was dematerialized
+    _children_rect: QRectF = QRectF()
+    # whether the size of the block may be out of date, because it has never been materialized, or because it was
+    # refreshed while it was dematerialized
+    _dirty: bool = True
+    # called with the block whenever it is materialized, so that the graph can keep track of materialized blocks
+    on_materialize: Callable[[QGraphBlock], None] | None = None
 
     @property
     def mode(self) -> str:
         return "graph"
 
+    def materialize(self) -> bool:
+        """
+        Create the child items of this block if they do not exist.
+
+        :return:    True if the block was dirty and its size changed, in which case the graph must be laid out again.
+        """
+        if self.on_materialize is not None:
+            # this may dematerialize the blocks that the graph has not used for the longest time
+            self.on_materialize(self)
+        if self._materialized:
+            return False
+        old_rect = self.boundingRect()
+        super().materialize()
+        if not self._dirty:
+            return False
+        self._dirty = False
+        self.clear_cache()
+        self.recalculate_size()
+        self._create_block_item()
+        return self.boundingRect() != old_rect
+
+    def dematerialize(self) -> None:
+        """
+        Remove the child items of this block to save memory. The size of the block does not change.
+        """
+        if not self._materialized:
+            return
+        self._children_rect = self.childrenBoundingRect()
+        if self.qblock_annotations:
+            if self.qblock_annotations.scene():
+                self.qblock_annotations.scene().removeItem(self.qblock_annotations)
+            else:
+                self.qblock_annotations.setParentItem(None)
+        self.qblock_annotations = {}
+        self._remove_objects()
+        self._materialized = False
+        self._objects_are_hidden = False
+        self._objects_are_temporarily_hidden = False
+        self.update()
+
+    def refresh(self) -> None:
+        if not self._materialized:
+            self._update_block_code_options()
+            self._dirty = True
+            self.update()
+            return
+        super().refresh()
+
+    def reload(self) -> None:
+        if not self._materialized:
+            self._dirty = True
+            self.update()
+            return
+        super().reload()
+
     def layout_widgets(self) -> None:
         x, y = self.LEFT_PADDING, self.TOP_PADDING
 
@@ -343,6 +475,9 @@ class QGraphBlock(QBlock):
                     qinsn_annotation.setY(obj.y())
             y += obj.boundingRect().height()
 
+        self._line_rects = tuple(QRectF(obj.pos(), obj.boundingRect().size()) for obj in self.objects)
+        self._outline = None
+
     def hoverEnterEvent(self, event) -> None:
         self.infodock.hover_block(self.addr)
         event.accept()
@@ -402,10 +537,17 @@ class QGraphBlock(QBlock):
 
         self._block_item_obj = painter.drawPath(self._block_item)
 
-        # content drawing is handled by qt since children are actual child widgets
+        # content drawing is handled by qt since children are actual child widgets. without them, or if we are too far
+        # zoomed out, draw the outline of the text instead
+        if should_omit_text or not self._materialized:
+            painter.setPen(Qt.PenStyle.NoPen)
+            outline_color = QColor(self._config.disasm_view_node_mnemonic_color)
+            outline_color.setAlpha(0x50)
+            painter.setBrush(outline_color)
+            painter.drawPath(self._outline_path())
 
         # if we are too far zoomed out, do not draw the text
-        if self._objects_are_hidden != should_omit_text:
+        if self._materialized and self._objects_are_hidden != should_omit_text:
             self._set_block_objects_visibility(not should_omit_text)
             view = self.scene().parent()
             assert isinstance(view, QSaveableGraphicsView)
@@ -420,8 +562,16 @@ class QGraphBlock(QBlock):
     def on_selected(self) -> None:
         self.infodock.select_block(self.addr)
 
+    def _outline_path(self) -> QPainterPath:
+        if self._outline is None:
+            self._outline = QPainterPath()
+            for rect in self._line_rects:
+                height = rect.height() * self.OUTLINE_LINE_RATIO
+                self._outline.addRect(rect.x(), rect.y() + (rect.height() - height) / 2, rect.width(), height)
+        return self._outline
+
     def _boundingRect(self):
-        cbr = self.childrenBoundingRect()
+        cbr = self.childrenBoundingRect() if self._materialized else self._children_rect
         margins = QMarginsF(
             self.LEFT_PADDING,
             self.TOP_PADDING,
@@ -438,6 +588,9 @@ class QLinearBlock(QBlock):
         super().__init__(*args, **kwargs)
         self._height = 0
         self._width = 0
+        # linear blocks are only created to be displayed
+        self.materialize()
+        self._create_block_item()
 
     @property
     def mode(self) -> str:
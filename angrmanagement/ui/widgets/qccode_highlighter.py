@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import re
+import weakref
 from typing import TYPE_CHECKING
 
 from angr.analyses.decompiler.structured_codegen.c import (
@@ -21,12 +21,18 @@ from pyqodeng.core.api import SyntaxHighlighter
 from PySide6.QtGui import QBrush, QColor, QFont, QTextCharFormat
 
 from angrmanagement.config import Conf
+from angrmanagement.data.code_highlighting import CodeHighlighting
 
 if TYPE_CHECKING:
+    from angr.analyses.decompiler.structured_codegen.base import BaseStructuredCodeGenerator
+
     from angrmanagement.ui.documents import QCodeDocument
 
 FORMATS = {}
 
+# code generator -> the highlighting of its text
+_highlightings: weakref.WeakKeyDictionary[BaseStructuredCodeGenerator, CodeHighlighting] = weakref.WeakKeyDictionary()
+
 
 def create_char_format(color: QColor, weight: QFont.Weight, style: QFont.Style) -> QTextCharFormat:
     f = QTextCharFormat()
@@ -86,41 +92,41 @@ def reset_formats() -> None:
     )
 
 
-def _format_node(obj):
+def _format_name(obj) -> str:
     """
-    Return the format for the given node.
+    Return the name of the format for the given node.
     """
     if isinstance(obj, SimType):
-        return FORMATS["type"]
+        return "type"
     elif isinstance(obj, CFunctionCall):
         if obj.callee_func is not None and (
             obj.callee_func.is_simprocedure or obj.callee_func.is_plt or obj.callee_func.is_syscall
         ):
-            return FORMATS["library_function"]
-        return FORMATS["function"]
+            return "library_function"
+        return "function"
     elif isinstance(obj, CFunction):
-        return FORMATS["function"]
+        return "function"
     elif isinstance(obj, CLabel):
-        return FORMATS["label"]
+        return "label"
     elif isinstance(obj, CVariable):
         if type(obj.variable) is SimMemoryVariable:
-            return FORMATS["global_variable"]
-        return FORMATS["variable"]
+            return "global_variable"
+        return "variable"
     elif isinstance(obj, CArrayTypeLength):
         # This is the part that goes after a fixed-size array (the
         # "[20]" in "char foo[20];"), and it's highly unlikely
         # that anyone will want to change the color here. But if
         # you do, follow the format of the rest.
-        return FORMATS["normal"]
+        return "normal"
     elif isinstance(obj, CStructFieldNameDef):
         # This is the part that is a field name in a struct def,
         # and it's highly unlikely that anyone will want to change
         # the color here. But if you do, follow the format of the
         # rest.
-        return FORMATS["normal"]
+        return "normal"
     elif isinstance(obj, CClosingObject | CStatement | CConstant | CExpression):
-        return FORMATS["normal"]
-    return FORMATS["normal"]
+        return "normal"
+    return "normal"
 
 
 reset_formats()
@@ -130,6 +136,9 @@ class QCCodeHighlighter(SyntaxHighlighter):
     """
     A syntax highlighter for QCCodeEdit. Uses a custom lexing scheme to detect C constructs (functions, keywords,
     comments, and strings) and adds styling to them based on the current color scheme.
+
+    The format ranges of each line are computed once per text (see get_highlighting()), so highlighting a block only
+    applies the ranges of its line.
     """
 
     HIGHLIGHTING_RULES = [
@@ -194,87 +203,44 @@ class QCCodeHighlighter(SyntaxHighlighter):
         super().__init__(parent, color_scheme=color_scheme)
 
         self.doc: QCodeDocument = parent
-        self.comment_status = False
+        # the highlighting of documents that do not have a code generator, and the revision it was computed for
+        self._plain_highlighting: CodeHighlighting | None = None
+        self._plain_revision: int | None = None
 
     def highlight_block(self, text: str, block) -> None:
-        # this code makes the assumption that this function is only ever called on lines in sequence in order
-        # it might also fuck up if it ever calls it starting in the middle...
-        if block.previous() is None:
-            self.comment_status = False
-
-        mark_in = 0
-
-        quote_status = False
-        quote_mark = None
-        escape_counter = 0
-        for col, _ in enumerate(text):
-            if quote_status:
-                assert not self.comment_status
-                if escape_counter:
-                    escape_counter -= 1
-                elif text[col] == "\\":
-                    escape_counter = 1
-                elif text[col] == quote_mark:
-                    quote_status = False
-                    mark_out = col + 1
-                    self.setFormat(mark_in, mark_out - mark_in, FORMATS["quotation"])
-                    text = text[:mark_in] + " " * (mark_out - mark_in) + text[mark_out:]
-            else:
-                if self.comment_status:
-                    if text[col : col + 2] == "*/":
-                        mark_out = col + 2
-                        self.comment_status = False
-                        self.setFormat(mark_in, mark_out - mark_in, FORMATS["comment"])
-                        text = text[:mark_in] + " " * (mark_out - mark_in) + text[mark_out:]
-                else:
-                    # regular mode is here
-                    if text[col] in ('"', "'"):
-                        mark_in = col
-                        quote_status = True
-                        quote_mark = text[col]
-                    elif text[col : col + 2] == "/*":
-                        mark_in = col
-                        self.comment_status = True
-                    elif text[col : col + 2] == "//":
-                        # do not set comment_status. just format the line and break.
-                        mark_in = col
-                        mark_out = len(text)
-                        self.setFormat(mark_in, mark_out - mark_in, FORMATS["comment"])
-                        text = text[:mark_in] + " " * (mark_out - mark_in) + text[mark_out:]
-                        break
-        if self.comment_status:
-            # do not unset. this is a multiline comment
-            mark_out = len(text)
-            self.setFormat(mark_in, mark_out - mark_in, FORMATS["comment"])
-            text = text[:mark_in] + " " * (mark_out - mark_in) + text[mark_out:]
-
-        # Go through AST and see about marking styles
-        start_pos = block.position()
-        current_idx = 0
-        while current_idx < len(text):
-            # if we know it's whitespace (b/c that can happen above due to comments), just skip it
-            if text[current_idx] == " ":
-                current_idx += 1
-                continue
-
-            current_pos = start_pos + current_idx
-            element = self.doc.posmap.get_element(current_pos)
-            if not element:
-                current_idx += 1
-                continue
-
-            fmt = _format_node(element.obj)
-
-            # Because of skipping spaces, we might end up inside an element, so don't use current_idx in the following
-            if fmt:
-                self.setFormat(element.start - start_pos, element.length, fmt)
-            current_idx = (element.start - start_pos) + element.length
-
-        for pattern, format_id in self.HIGHLIGHTING_RULES:
-            for mo in list(re.finditer(pattern, text)):
-                start = mo.start()
-                end = mo.end()
-                self.setFormat(start, end - start, FORMATS[format_id])
-                # if format_id in {'quotation', 'comment'}:
-                #    # remove the formatted parts so that we do not end up highlighting these parts again
-                #    text = text[:start] + " " * (end-start) + text[end:]
+        highlighting = self._highlighting()
+        for col, length, format_name in highlighting.line(block.blockNumber()):
+            self.setFormat(col, length, FORMATS[format_name])
+
+    def _highlighting(self) -> CodeHighlighting:
+        codegen = getattr(self.doc, "_codegen", None)
+        if codegen is not None and codegen.text is not None:
+            return get_highlighting(codegen)
+
+        # other documents, e.g., source files, are only lexed
+        revision = self.doc.revision()
+        if self._plain_highlighting is None:
+            self._plain_highlighting = CodeHighlighting(
+                self.doc.toPlainText(), None, _format_name, self.HIGHLIGHTING_RULES
+            )
+        elif self._plain_revision != revision:
+            self._plain_highlighting.update(self.doc.toPlainText(), None)
+        self._plain_revision = revision
+        return self._plain_highlighting
+
+
+def get_highlighting(codegen: BaseStructuredCodeGenerator) -> CodeHighlighting:
+    """
+    Get the highlighting of the text of a code generator. The highlighting is computed once per decompilation, and is
+    cached for as long as the code generator is (usually, in kb.decompilations). When the text is re-rendered, only
+    the lines that changed are highlighted again.
+    """
+    highlighting = _highlightings.get(codegen)
+    if highlighting is None:
+        highlighting = CodeHighlighting(
+            codegen.text, codegen.map_pos_to_node, _format_name, QCCodeHighlighter.HIGHLIGHTING_RULES
+        )
+        _highlightings[codegen] = highlighting
+    elif highlighting.text is not codegen.text or highlighting.posmap is not codegen.map_pos_to_node:
+        highlighting.update(codegen.text, codegen.map_pos_to_node)
+    return highlighting
@@ -1,22 +1,30 @@
 from __future__ import annotations
 
+import functools
 import logging
 from typing import TYPE_CHECKING
 
 from angr.analyses.decompiler.utils import to_ail_supergraph
-from PySide6.QtCore import QEvent, QPointF, QRect, QRectF, QSize, Qt, QTimeLine
-from PySide6.QtWidgets import QFrame
+from PySide6.QtCore import QEvent, QPointF, QRect, QRectF, QSize, Qt, QTimeLine, QTimer
+from PySide6.QtWidgets import QFrame, QGraphicsSimpleTextItem, QStyleOptionGraphicsItem
 
 from angrmanagement.config import Conf
+from angrmanagement.data.jobs import DisassembleFunctionJob
+from angrmanagement.data.jobs.disassemble_function import disassemble_function
+from angrmanagement.data.jobs.job import JobState
+from angrmanagement.logic.threads import gui_thread_schedule_async
 from angrmanagement.utils import get_out_branches
+from angrmanagement.utils.cache import SmartLRUCache
 from angrmanagement.utils.cfg import categorize_edges
+from angrmanagement.utils.daemon_thread import start_daemon_thread
 from angrmanagement.utils.graph_layouter import GraphLayouter
+from angrmanagement.utils.scalable_graph_layouter import ScalableGraphLayouter
 
 from .qblock import QGraphBlock
 from .qdisasm_base_control import DisassemblyLevel, QDisassemblyBaseControl
 from .qgraph import QZoomableDraggableGraphicsView
 from .qgraph_arrow import QDisasmGraphArrow
-from .qminimap import QMiniMapView
+from .qminimap import MiniMapPrimitives, QMiniMapView
 
 if TYPE_CHECKING:
     from angrmanagement.data.instance import Instance
@@ -76,6 +84,23 @@ class QDisassemblyGraph(QDisassemblyBaseControl, QZoomableDraggableGraphicsView)
         self._arrows = []  # A list of references to QGraphArrow objects
 
         self.blocks = []
+        # blocks with child items, in LRU order. evicted blocks are dematerialized
+        self._materialized_blocks = self._create_materialized_block_cache()
+        # materializing blocks is deferred until the view stops changing within an event loop iteration
+        self._block_detail_timer = QTimer(self)
+        self._block_detail_timer.setSingleShot(True)
+        self._block_detail_timer.setInterval(0)
+        self._block_detail_timer.timeout.connect(self._update_block_details)
+        self.visible_scene_rect_changed.connect(self._on_visible_scene_rect_changed)
+
+        # incremented by every reload, so that the results of stale background reloads can be recognized
+        self._reload_seq = 0
+        # shown while the graph is prepared in the background
+        self._placeholder: QGraphicsSimpleTextItem | None = None
+        # the job that disassembles the function of the current reload in the background
+        self._prepare_job: DisassembleFunctionJob | None = None
+        # a show_instruction() request that arrived while the graph was being prepared
+        self._pending_show = None
 
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
@@ -119,26 +144,126 @@ class QDisassemblyGraph(QDisassemblyBaseControl, QZoomableDraggableGraphicsView)
         # view.
         selected_insns = old_infodock.selected_insns.am_obj if old_infodock is not None else set()
 
+        # results of earlier reloads that are still being prepared are discarded
+        self._reload_seq += 1
+        self._cancel_prepare_job()
+        self._pending_show = None
+        self._placeholder = None
         self._reset_scene()
         self._arrows.clear()
         self.blocks.clear()
+        # the old blocks have been deleted with the scene, so they must not be dematerialized
+        self._materialized_blocks = self._create_materialized_block_cache()
         self._insaddr_to_block.clear()
         if self._function_graph is None:
             self._minimap.reload_target_scene()
             return
 
-        scene = self.scene()
         assert self.instance.kb is not None
+        function_graph = self._function_graph
+        func = function_graph.function
+        level = self._disassembly_level
+
+        # the prefetcher only prepares machine code disassembly
+        disasm = (
+            self.disasm_view.workspace.prefetcher.take_disassembly(func.addr)
+            if level is DisassemblyLevel.MachineCode
+            else None
+        )
+        if len(func.block_addrs_set) < Conf.disasm_graph_async_threshold:
+            if disasm is None:
+                disasm = disassemble_function(
+                    self.instance,
+                    func,
+                    ail=level is DisassemblyLevel.AIL,
+                    include_ir=level is DisassemblyLevel.LifterIR,
+                )
+            self._create_blocks(disasm, self._supergraph_of(function_graph, disasm, level), level)
+            for block in self.blocks:
+                self.scene().addItem(block)
+            self.request_relayout()
+            self._finish_reload(selected_insns)
+            return
+
+        # large functions are disassembled by a job and laid out in the background, and only the graphics items are
+        # created on the GUI thread
+        self.disasm = None
+        self._show_placeholder(f"Loading {func.name}...")
+        on_prepared = functools.partial(
+            self._on_function_prepared, self._reload_seq, function_graph, level, selected_insns
+        )
+        if disasm is not None:
+            on_prepared(disasm)
+            return
+        self._prepare_job = DisassembleFunctionJob(
+            self.instance,
+            func,
+            ail=level is DisassemblyLevel.AIL,
+            include_ir=level is DisassemblyLevel.LifterIR,
+            on_finish=on_prepared,
+        )
+        self.disasm_view.workspace.job_manager.add_job(self._prepare_job)
+
+    def _cancel_prepare_job(self) -> None:
+        job = self._prepare_job
+        self._prepare_job = None
+        if job is not None and job.state in (JobState.PENDING, JobState.RUNNING):
+            self.disasm_view.workspace.job_manager.cancel_job(job)
+
+    @staticmethod
+    def _supergraph_of(function_graph, disasm, level: DisassemblyLevel):
+        if level is DisassemblyLevel.AIL:
+            return to_ail_supergraph(disasm.cc_graph)
+        return function_graph.supergraph
+
+    def _on_function_prepared(self, seq: int, function_graph, level: DisassemblyLevel, selected_insns, disasm) -> None:
+        if seq != self._reload_seq:
+            return
+        self._prepare_job = None
+        if disasm is None:
+            self._on_reload_failed(seq, function_graph.function)
+            return
+        supergraph = self._supergraph_of(function_graph, disasm, level)
+        # the blocks are only added to the scene once they have been laid out. their sizes are known already
+        self._create_blocks(disasm, supergraph, level)
+        start_daemon_thread(
+            self._layout_worker,
+            "Laying out function graph",
+            args=(seq, function_graph.function.addr, disasm, supergraph, self._node_sizes(), selected_insns),
+        )
+
+    def _layout_worker(self, seq: int, func_addr: int, disasm, supergraph, node_sizes, selected_insns) -> None:
+        try:
+            node_coords, edges = self._compute_layout(func_addr, disasm, supergraph, node_sizes)
+        except Exception:  # pylint:disable=broad-except
+            _l.exception("Failed to lay out the function graph")
+            gui_thread_schedule_async(self._on_reload_failed, args=(seq, None))
+            return
+        gui_thread_schedule_async(self._on_layout_ready, args=(seq, node_coords, edges, selected_insns))
+
+    def _on_layout_ready(self, seq: int, node_coords, edges, selected_insns) -> None:
+        if seq != self._reload_seq:
+            return
+        self._hide_placeholder()
+        scene = self.scene()
+        for block in self.blocks:
+            scene.addItem(block)
+        self._apply_layout(node_coords, edges)
+        self._finish_reload(selected_insns)
+
+    def _on_reload_failed(self, seq: int, func) -> None:
+        if seq != self._reload_seq:
+            return
+        self._hide_placeholder()
+        self.blocks.clear()
+        self._insaddr_to_block.clear()
+        self._show_placeholder(f"Failed to load {func.name}" if func is not None else "Failed to lay out the graph")
 
-        if self._disassembly_level is DisassemblyLevel.AIL:
-            func = self._function_graph.function
-            try:
-                # always check if decompiler has cached a clinic object first
-                self.disasm = self.instance.kb.decompilations[(func.addr, "pseudocode")].clinic
-            except (KeyError, AttributeError):
-                self.disasm = self.instance.project.analyses.Clinic(func)
+    def _create_blocks(self, disasm, supergraph, level: DisassemblyLevel) -> None:
+        self.disasm = disasm
+        self._supergraph = supergraph
 
-            self._supergraph = to_ail_supergraph(self.disasm.cc_graph)
+        if level is DisassemblyLevel.AIL:
 
             def nodefunc(n):
                 return n
@@ -148,10 +273,6 @@ class QDisassemblyGraph(QDisassemblyBaseControl, QZoomableDraggableGraphicsView)
 
             has_idx = True
         else:
-            include_ir = self._disassembly_level is DisassemblyLevel.LifterIR
-            self.disasm = self.instance.project.analyses.Disassembly(
-                function=self._function_graph.function, include_ir=include_ir
-            )
             view = self.disasm_view.workspace.view_manager.first_view_in_category("console")
             if view is not None:
                 from angrmanagement.ui.views import ConsoleView  # pylint: disable=import-outside-toplevel
@@ -162,7 +283,6 @@ class QDisassemblyGraph(QDisassemblyBaseControl, QZoomableDraggableGraphicsView)
                         "disasm": self.disasm,
                     }
                 )
-            self._supergraph = self._function_graph.supergraph
 
             def nodefunc(n):
                 return n.cfg_nodes
@@ -184,13 +304,15 @@ class QDisassemblyGraph(QDisassemblyBaseControl, QZoomableDraggableGraphicsView)
             )
             if n.addr == self._function_graph.function.addr:
                 self.entry_block = block
-            scene.addItem(block)
             self.blocks.append(block)
 
-            for insn_addr in block.addr_to_insns:
+            for insn_addr in block.insn_addrs:
                 self._insaddr_to_block[insn_addr] = block
+            block.on_materialize = self._track_materialized_block
+            # blocks are measured with their child items, which are dropped again once there are too many of them
+            block.materialize()
 
-        self.request_relayout()
+    def _finish_reload(self, selected_insns) -> None:
         self._update_scene_boundary()
 
         # determine initial view focus point
@@ -202,6 +324,26 @@ class QDisassemblyGraph(QDisassemblyBaseControl, QZoomableDraggableGraphicsView)
             self.infodock.select_instruction(insn_addr, unique=False, use_animation=False)
 
         self._minimap.reload_target_scene()
+        self._update_block_details()
+
+        if self._pending_show is not None:
+            args, kwargs = self._pending_show
+            self._pending_show = None
+            self.show_instruction(*args, **kwargs)
+
+    def _show_placeholder(self, text: str) -> None:
+        self._placeholder = QGraphicsSimpleTextItem(text)
+        self._placeholder.setFont(Conf.disasm_font)
+        self._placeholder.setBrush(Conf.palette_text)
+        scene = self.scene()
+        scene.addItem(self._placeholder)
+        scene.setSceneRect(self._placeholder.boundingRect())
+        self.centerOn(self._placeholder)
+
+    def _hide_placeholder(self) -> None:
+        if self._placeholder is not None:
+            self.scene().removeItem(self._placeholder)
+            self._placeholder = None
 
     def refresh(self) -> None:
         if not self.blocks:
@@ -213,6 +355,7 @@ class QDisassemblyGraph(QDisassemblyBaseControl, QZoomableDraggableGraphicsView)
 
         self.request_relayout()
         self._update_scene_boundary()
+        self._update_block_details()
 
         self._minimap.reload_target_scene()
         self._minimap.setVisible(self.disasm_view.show_minimap)
@@ -225,6 +368,83 @@ class QDisassemblyGraph(QDisassemblyBaseControl, QZoomableDraggableGraphicsView)
             for b in self.blocks:
                 b.restore_temporarily_hidden_objects()
 
+    def minimap_primitives(self) -> MiniMapPrimitives | None:
+        if self._placeholder is not None:
+            return None
+        primitives = MiniMapPrimitives()
+        plugins = self.disasm_view.workspace.plugins
+        border = Conf.disasm_view_node_border_color
+        for block in self.blocks:
+            fill = plugins.color_block(block.addr)
+            if fill is None:
+                fill = Conf.disasm_view_node_zoomed_out_background_color
+            primitives.add_rect(block.sceneBoundingRect(), fill, border)
+        for arrow in self._arrows:
+            primitives.add_line(arrow.edge.coordinates, arrow.color)
+        return primitives
+
+    #
+    # Level of detail
+    #
+
+    @staticmethod
+    def _create_materialized_block_cache(maxsize: int | None = None) -> SmartLRUCache:
+        def _evict(block: QGraphBlock, _) -> None:
+            block.dematerialize()
+
+        if maxsize is None:
+            maxsize = Conf.disasm_graph_materialized_blocks
+        return SmartLRUCache(maxsize=max(maxsize, 1), evict=_evict)
+
+    def _track_materialized_block(self, block: QGraphBlock) -> None:
+        """
+        Keep track of a block that is being materialized, no matter who materializes it.
+        """
+        self._materialized_blocks[block] = block
+
+    def _grow_materialized_block_cache(self, maxsize: int) -> None:
+        """
+        Make room for more materialized blocks, so that the blocks that are visible at the same time do not evict each
+        other.
+        """
+        old_cache = self._materialized_blocks
+        self._materialized_blocks = self._create_materialized_block_cache(maxsize)
+        for block in old_cache:
+            self._materialized_blocks[block] = block
+
+    def _on_visible_scene_rect_changed(self, rect: QRectF) -> None:  # pylint:disable=unused-argument
+        self._block_detail_timer.start()
+
+    def _update_block_details(self) -> None:
+        """
+        Materialize the blocks around the visible part of the scene if the text in them is legible. Blocks that have
+        not been visible for a while are dematerialized once there are too many materialized blocks.
+        """
+        scene = self.scene()
+        if scene is None or not self.blocks or self._placeholder is not None:
+            return
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(self.transform())
+        if lod < QGraphBlock.MINIMUM_DETAIL_LEVEL:
+            return
+
+        rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        visible = [item for item in scene.items(rect) if isinstance(item, QGraphBlock)]
+        if len(visible) > self._materialized_blocks.maxsize:
+            self._grow_materialized_block_cache(len(visible))
+        # include half a viewport on each side so that panning does not reveal blocks without text, as long as these
+        # blocks do not push visible blocks out of the cache
+        rect.adjust(-rect.width() / 2, -rect.height() / 2, rect.width() / 2, rect.height() / 2)
+        visible_set = set(visible)
+        nearby = [item for item in scene.items(rect) if isinstance(item, QGraphBlock) and item not in visible_set]
+        nearby = nearby[: self._materialized_blocks.maxsize - len(visible)]
+        resized = False
+        # visible blocks are materialized last, so that they are the most recently used ones
+        for item in nearby + visible:
+            resized |= item.materialize()
+        if resized:
+            self.request_relayout()
+            self._update_scene_boundary()
+
     #
     # Event handlers
     #
@@ -275,31 +495,45 @@ class QDisassemblyGraph(QDisassemblyBaseControl, QZoomableDraggableGraphicsView)
 
         return QSize(width, height)
 
-    def _layout_graph(self):
+    def _node_sizes(self):
         assert self._supergraph is not None
 
-        node_sizes = {}
         node_map = {}
         for block in self.blocks:
             node_map[block.addr] = block
+        node_sizes = {}
         for node in self._supergraph.nodes():
             block = node_map[node.addr]
             node_sizes[node] = block.width, block.height
-        gl = GraphLayouter(self._supergraph, node_sizes)
+        return node_sizes
+
+    @staticmethod
+    def _create_layouter(supergraph, node_sizes):
+        if len(supergraph) >= Conf.disasm_graph_scalable_layout_threshold:
+            return ScalableGraphLayouter(supergraph, node_sizes)
+        return GraphLayouter(supergraph, node_sizes)
 
-        nodes = {}
-        for node, coords in gl.node_coordinates.items():
-            nodes[(node.addr, node.idx)] = coords
+    def _compute_layout(self, func_addr: int, disasm, supergraph, node_sizes):
+        """
+        Lay out a function graph. This method may be called in a background thread.
+        """
+        nodes, edges = self.instance.graph_layout_cache.layout(func_addr, supergraph, node_sizes, self._create_layouter)
+        categorize_edges(disasm, edges)
+        return nodes, edges
 
-        return nodes, gl.edges
+    def _layout_graph(self):
+        assert self._supergraph is not None
+        return self._compute_layout(
+            self._function_graph.function.addr, self.disasm, self._supergraph, self._node_sizes()
+        )
 
     def request_relayout(self) -> None:
         node_coords, edges = self._layout_graph()
+        self._apply_layout(node_coords, edges)
 
+    def _apply_layout(self, node_coords, edges) -> None:
         self._edges = edges
 
-        categorize_edges(self.disasm, edges)
-
         if not node_coords:
             print("Failed to get node_coords")
             return
@@ -331,8 +565,23 @@ class QDisassemblyGraph(QDisassemblyBaseControl, QZoomableDraggableGraphicsView)
     def show_instruction(
         self, insn_addr, insn_pos=None, centering: bool = False, use_block_pos: bool = False, use_animation: bool = True
     ) -> None:
+        if self._placeholder is not None:
+            # the graph is still being prepared. show the instruction once it is ready
+            self._pending_show = (
+                (insn_addr,),
+                {
+                    "insn_pos": insn_pos,
+                    "centering": centering,
+                    "use_block_pos": use_block_pos,
+                    "use_animation": use_animation,
+                },
+            )
+            return
         block: QGraphBlock = self._insaddr_to_block.get(insn_addr, None)
         if block is not None:
+            if block.materialize():
+                self.request_relayout()
+                self._update_scene_boundary()
             if use_block_pos:
                 x, y = block.mapToScene(block.x(), block.y())
             else:
@@ -198,14 +198,14 @@ class FeatureMapItem(QGraphicsItem):
         return QRectF(0, 0, self._width, self._height)
 
     def _on_cfb_event(self, **kwargs) -> None:
-        if "object_added" in kwargs:  # Called by task thread
-            addr, item = kwargs["object_added"]
-            tags = _get_tags_for_item(item)
-            if tags is None or item.size is None:
-                return
+        if "object_added" in kwargs:
             with self._cfb_feature_maps_lock:
-                for fm in self._cfb_feature_maps:
-                    fm.add(addr, item.size, tags)
+                for addr, item in kwargs["object_added"]:
+                    tags = _get_tags_for_item(item)
+                    if tags is None or item.size is None:
+                        continue
+                    for fm in self._cfb_feature_maps:
+                        fm.add(addr, item.size, tags)
 
             if (
                 not self._refresh_pending
@@ -6,6 +6,7 @@ from functools import partial
 from typing import TYPE_CHECKING
 
 from angr.analyses.code_tagging import CodeTags
+from angr.misc.testing import is_testing
 from angr.utils.library import get_cpp_function_name
 from cle.backends.uefi_firmware import UefiPE
 from PySide6.QtCore import SIGNAL, QAbstractTableModel, QEvent, Qt
@@ -24,15 +25,19 @@ from PySide6.QtWidgets import (
 
 from angrmanagement.config import Conf
 from angrmanagement.data.instance import Instance, ObjectContainer
+from angrmanagement.data.trigram_index import TrigramIndex
+from angrmanagement.logic.threads import gui_thread_schedule_async
 from angrmanagement.ui.icons import icon
 from angrmanagement.ui.menus.function_context_menu import FunctionContextMenu
 from angrmanagement.ui.toolbars import FunctionTableToolbar
+from angrmanagement.utils.daemon_thread import start_daemon_thread
 
 if TYPE_CHECKING:
     import PySide6
     import PySide6.QtGui
     from angr.knowledge_plugins.functions import Function, FunctionManager
 
+    from angrmanagement.data.cfg_delta import CFGDelta
     from angrmanagement.ui.views.functions_view import FunctionsView
     from angrmanagement.ui.workspace import Workspace
 
@@ -62,6 +67,15 @@ class QFunctionTableModel(QAbstractTableModel):
         self._config = Conf
         self._data_cache = {}
 
+        # the current filter keyword, in lowercase, and the addresses of the functions that match it
+        self._keyword = ""
+        self._matched: set[int] | None = None
+        # the search index over the texts that functions are filtered by. it is built in the background the first time
+        # the table is filtered
+        self._search_index: TrigramIndex | None = None
+        self._search_index_building = False
+        self._search_index_seq = 0
+
     def __len__(self) -> int:
         if self._func_list is not None:
             return len(self._func_list)
@@ -79,24 +93,84 @@ class QFunctionTableModel(QAbstractTableModel):
     def func_list(self, v) -> None:
         self._func_list = None
         self._raw_func_list = v
+        self._keyword = ""
+        self._matched = None
+        self.invalidate_search_index()
         self._data_cache.clear()
         self.emit(SIGNAL("layoutChanged()"))  # type: ignore
 
     def filter(self, keyword) -> None:
+        keyword = keyword.lower() if keyword else ""
         if not keyword or self._raw_func_list is None:
             # remove the filtering
             self._func_list = None
+            self._matched = None
         else:
+            # a keyword that extends the previous keyword only matches functions that the previous keyword matched
+            narrowing = self._func_list is not None and self._keyword and self._keyword in keyword
+            source = self._func_list if narrowing else self._raw_func_list
+            index = self._get_search_index()
+            if index is not None:
+                self._matched = index.search(keyword)
+            else:
+                extra_columns = self.workspace.plugins.count_func_columns()
+                self._matched = {
+                    func.addr for func in source if self._func_match_keyword(func, keyword, extra_columns=extra_columns)
+                }
+            self._func_list = [func for func in source if func.addr in self._matched]
+        self._keyword = keyword
+
+        self._data_cache.clear()
+        self.emit(SIGNAL("layoutChanged()"))  # type: ignore
+
+    def add_functions(self, funcs: list[Function]) -> None:
+        """
+        Append functions to the table, keeping the current filter.
+        """
+        if self._raw_func_list is None:
+            self._raw_func_list = []
+        self._raw_func_list += funcs
+        index = self._search_index
+        if index is not None:
             extra_columns = self.workspace.plugins.count_func_columns()
-            self._func_list = [
-                func
-                for func in self._raw_func_list
-                if self._func_match_keyword(func, keyword, extra_columns=extra_columns)
-            ]
+            for func in funcs:
+                index.set(func.addr, self._search_text(func, extra_columns))
+        elif self._search_index_building:
+            # the index that is being built does not know about these functions
+            self.invalidate_search_index()
+        if self._func_list is not None:
+            extra_columns = self.workspace.plugins.count_func_columns()
+            for func in funcs:
+                if self._func_match_keyword(func, self._keyword, extra_columns=extra_columns):
+                    self._matched.add(func.addr)
+                    self._func_list.append(func)
+        self._data_cache.clear()
+        self.emit(SIGNAL("layoutChanged()"))  # type: ignore
 
+    def remove_functions(self, func_addrs: set[int]) -> None:
+        """
+        Remove functions from the table, keeping the current filter.
+        """
+        if self._raw_func_list is not None:
+            self._raw_func_list = [func for func in self._raw_func_list if func.addr not in func_addrs]
+        if self._func_list is not None:
+            self._func_list = [func for func in self._func_list if func.addr not in func_addrs]
+            self._matched -= func_addrs
+        if self._search_index is not None:
+            for addr in func_addrs:
+                self._search_index.discard(addr)
         self._data_cache.clear()
         self.emit(SIGNAL("layoutChanged()"))  # type: ignore
 
+    def invalidate_search_index(self) -> None:
+        """
+        Drop the search index, e.g., after functions were renamed. It is built again the next time the table is
+        filtered.
+        """
+        self._search_index = None
+        self._search_index_building = False
+        self._search_index_seq += 1
+
     def clear_data_cache(self):
         self._data_cache = {}
 
@@ -186,11 +260,16 @@ class QFunctionTableModel(QAbstractTableModel):
 
     def sort(self, column, order=None) -> None:
         self.layoutAboutToBeChanged.emit()
-        self.func_list = sorted(
-            self.func_list,
-            key=lambda f: self._get_column_data(f, column),
-            reverse=order == Qt.SortOrder.DescendingOrder,
-        )
+        if self._raw_func_list is not None:
+            # sort all functions, so that the order survives changes to the filter
+            self._raw_func_list = sorted(
+                self._raw_func_list,
+                key=lambda f: self._get_column_data(f, column),
+                reverse=order == Qt.SortOrder.DescendingOrder,
+            )
+            if self._func_list is not None:
+                self._func_list = [func for func in self._raw_func_list if func.addr in self._matched]
+        self._data_cache.clear()
         self.layoutChanged.emit()
 
     #
@@ -281,6 +360,53 @@ class QFunctionTableModel(QAbstractTableModel):
     def _get_tags_display_string(cls, tags):
         return ", ".join(cls.TAG_STRS.get(t, t) for t in tags)
 
+    def _get_search_index(self) -> TrigramIndex | None:
+        """
+        Get the search index, or None if it is not ready yet. The texts of functions are collected on the GUI thread,
+        since plugins provide some of them, and are indexed in the background.
+        """
+        if self._search_index is None and not self._search_index_building and self._raw_func_list:
+            extra_columns = self.workspace.plugins.count_func_columns()
+            items = [(func.addr, self._search_text(func, extra_columns)) for func in self._raw_func_list]
+            if is_testing:
+                self._search_index = TrigramIndex(items)
+            else:
+                self._search_index_building = True
+                start_daemon_thread(
+                    self._search_index_worker, "Indexing functions", args=(self._search_index_seq, items)
+                )
+        return self._search_index
+
+    def _search_index_worker(self, seq: int, items: list[tuple[int, str]]) -> None:
+        index = TrigramIndex(items)
+        gui_thread_schedule_async(self._on_search_index_ready, args=(seq, index))
+
+    def _on_search_index_ready(self, seq: int, index: TrigramIndex) -> None:
+        if seq != self._search_index_seq:
+            return
+        self._search_index = index
+        self._search_index_building = False
+
+    def _search_text(self, func, extra_columns: int = 0) -> str:
+        """
+        Get the text that a function is filtered by. Fields are separated by newlines, which keywords do not contain.
+        See _func_match_keyword.
+        """
+        fields = [func.name]
+        demangled_name = func.demangled_name
+        if demangled_name and demangled_name != func.name:
+            fields.append(demangled_name)
+        if isinstance(func.addr, int):
+            fields.append(f"{func.addr:#x}")
+        fields.append(",".join(func.tags))
+        if func.binary:
+            fields.append(self._get_binary_name(func))
+        for idx in range(extra_columns):
+            txt = self.workspace.plugins.extract_func_column(func, idx)[1]
+            if txt:
+                fields.append(txt)
+        return "\n".join(fields)
+
     def _func_match_keyword(self, func, keyword, extra_columns: int = 0) -> bool:
         """
         Check whether the function matches against the given keyword or not.
@@ -402,9 +528,9 @@ class QFunctionTableView(QTableView):
                     continue
                 if self.show_alignment_functions or (not self.show_alignment_functions and not f_.is_alignment):
                     new_funcs.append(f_)
-            self._model.func_list += new_funcs
+            self._model.add_functions(new_funcs)
         if removed_funcs:
-            self._model.func_list = [f_ for f_ in self._model.func_list if f_.addr not in removed_funcs]
+            self._model.remove_functions(removed_funcs)
         self.viewport().update()
 
     def changeEvent(self, event):  # type: ignore
@@ -549,6 +675,22 @@ class QFunctionTable(QWidget):
         self._function_count = len(self._last_known_func_addrs)
         self.update_displayed_function_count()
 
+    def apply_delta(self, delta: CFGDelta) -> None:
+        """
+        Add the functions that were created while the CFG is being recovered, without reloading the table.
+        """
+        if self.function_manager is None:
+            return
+        added_funcs = delta.added_functions - self._last_known_func_addrs
+        if added_funcs:
+            self._last_known_func_addrs |= added_funcs
+            self._table_view.refresh(added_funcs=added_funcs)
+        elif delta.changed_functions:
+            # sizes and block counts may have changed
+            self._table_view.viewport().update()
+        self._function_count = len(self._last_known_func_addrs)
+        self.update_displayed_function_count()
+
     def show_filter_box(self, prefix: str = "") -> None:
         if prefix:
             self._filter_box.setText(prefix)
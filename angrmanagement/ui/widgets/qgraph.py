@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from typing import TYPE_CHECKING
 
 from PySide6.QtCore import QEvent, QMarginsF, QPoint, QRectF, QSize, Qt, Signal
 from PySide6.QtGui import QImage, QMouseEvent, QPainter, QVector2D
@@ -14,6 +15,9 @@ from PySide6.QtWidgets import (
     QStyleOptionGraphicsItem,
 )
 
+if TYPE_CHECKING:
+    from .qminimap import MiniMapPrimitives
+
 _l = logging.getLogger(__name__)
 
 
@@ -44,6 +48,13 @@ class QBaseGraphicsView(QGraphicsView):
         if scene is not None:
             scene.update(self.sceneRect())
 
+    def minimap_primitives(self) -> MiniMapPrimitives | None:  # pylint:disable=no-self-use
+        """
+        Get a simplified version of the scene for the minimap. The minimap renders the scene itself if this returns
+        None.
+        """
+        return None
+
     def viewportEvent(self, event: QEvent) -> bool:
         visible_scene_rect = self.mapToScene(self.viewport().geometry()).boundingRect()
         if visible_scene_rect != self._visibile_scene_rect:
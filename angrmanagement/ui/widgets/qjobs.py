@@ -152,6 +152,7 @@ class QJobs(QTableWidget):
         self.workspace.job_manager.job_starting.connect(self.change_job_state)
         self.workspace.job_manager.job_exception.connect(self.change_job_state)
         self.workspace.job_manager.job_finished.connect(self.change_job_state)
+        self.workspace.job_manager.job_suspended.connect(self.change_job_state)
 
     # Private Methods
 
@@ -192,9 +193,12 @@ class QJobs(QTableWidget):
         self._add_table_row(job, pending)
 
     def change_job_state(self, job: Job):
-        """Changes the status of a job in the jobs view table to running."""
+        """Changes the status of a job in the jobs view table to reflect its current state."""
 
-        if job.state == JobState.RUNNING:
+        if job.state == JobState.PENDING:
+            # suspended in favor of a job with higher priority
+            status = PendingWidget()
+        elif job.state == JobState.RUNNING:
             status = RunningWidget()
         elif job.state == JobState.CANCELLED:
             status = CancelledWidget()
@@ -1,7 +1,9 @@
 # pylint:disable=missing-class-docstring
 from __future__ import annotations
 
+import functools
 import logging
+from collections import deque
 from typing import TYPE_CHECKING
 
 from angr.analyses.cfg.cfb import MemoryRegion, Unknown
@@ -14,7 +16,13 @@ from PySide6.QtWidgets import QAbstractScrollArea, QAbstractSlider, QGraphicsSce
 from sortedcontainers import SortedDict
 
 from angrmanagement.config import Conf
+from angrmanagement.data.jobs import DisassembleFunctionJob
+from angrmanagement.data.jobs.disassemble_function import disassemble_function
+from angrmanagement.data.jobs.job import JobPriority, JobState
+from angrmanagement.data.line_index import LineIndex
+from angrmanagement.logic.threads import gui_thread_schedule_async, gui_thread_schedule_later
 from angrmanagement.utils.cache import SmartLRUCache
+from angrmanagement.utils.daemon_thread import start_daemon_thread
 
 from .qblock import QLinearBlock
 from .qdisasm_base_control import DisassemblyLevel, QDisassemblyBaseControl
@@ -23,6 +31,8 @@ from .qmemory_data_block import QMemoryDataBlock
 from .qunknown_block import QUnknownBlock
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from angr.analyses import Disassembly
     from angr.analyses.decompiler import Clinic
     from angr.knowledge_plugins import Function
@@ -66,6 +76,8 @@ class QLinearDisassemblyView(QSaveableGraphicsView):
 
 class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
     OBJECT_PADDING = 0
+    # functions that are queued for disassembly beyond this are dropped, least urgent first
+    MAX_QUEUED_DISASMS = 16
 
     def __init__(self, instance: Instance, disasm_view, parent=None) -> None:
         QDisassemblyBaseControl.__init__(self, instance, disasm_view, QAbstractScrollArea)
@@ -92,11 +104,37 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
         self._max_offset = None
         # The first line that is rendered of the first object in self.objects. Start from 0.
         self._start_line_in_object = 0
-
-        self._disasms = SmartLRUCache(maxsize=1024)
+        # The address of the first object that is rendered
+        self._top_obj_addr: int | None = None
+        # The addresses that are rendered, from the first object to the end of the last object. The end is None if the
+        # objects do not fill the view
+        self._displayed_range: tuple[int, int | None] | None = None
+        # The lines of all objects, which the vertical scroll bar is based on once it is ready. Until then, the scroll
+        # bar is based on byte offsets
+        self._line_index: LineIndex | None = None
+        self._line_index_seq = 0
+        # objects that were added to the CFB while the line index is being built
+        self._pending_line_index_objects: list[tuple[int, object]] = []
+
+        # machine code is disassembled block by block: function address -> Disassembly of the blocks that have been
+        # displayed so far
+        self._disasms = SmartLRUCache(maxsize=1024, evict=self._on_disasm_eviction)
+        # function address -> addresses of the blocks in self._disasms, or None if the whole function is disassembled
+        self._disasm_blocks: dict[int, set[int] | None] = {}
         self._ail_disasms = SmartLRUCache(maxsize=1024)
         self.objects = SmartLRUCache(maxsize=1024, evict=self._on_object_eviction)
 
+        # large functions are lifted to AIL by jobs, one at a time. until then, their blocks are shown as raw bytes
+        # addresses of the functions to lift, most urgent first
+        self._disasm_queue: deque[int] = deque()
+        # the job that is lifting a function at the moment, if any
+        self._disasm_job: DisassembleFunctionJob | None = None
+        self._disasm_failed: set[int] = set()
+        # results of earlier generations (see initialize()) are discarded
+        self._disasm_seq = 0
+        # function address -> addresses of the placeholder objects of its blocks
+        self._placeholders: dict[int, set[int]] = {}
+
         self.verticalScrollBar().actionTriggered.connect(self._on_vertical_scroll_bar_triggered)
 
         self._init_widgets()
@@ -172,7 +210,7 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
             lines = min(int(delta // self._line_height), 3)
             self.prepare_objects(self.offset, start_line=self._start_line_in_object - lines)
 
-        self.verticalScrollBar().setValue(self.offset)
+        self._sync_scroll_bar()
         event.accept()
         self.viewport().update()
 
@@ -205,9 +243,13 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
             self.prepare_objects(self.offset, start_line=self._start_line_in_object - lines_per_page)
             self.viewport().update()
         elif action == QAbstractSlider.SliderAction.SliderMove:
-            # Setting a new offset
-            new_offset = max(0, self.verticalScrollBar().value())
-            self.prepare_objects(new_offset, adjust_start_line=True)
+            if self._line_index is not None:
+                # Setting a new line
+                self._scroll_to_line(max(0, self.verticalScrollBar().value()))
+            else:
+                # Setting a new offset
+                new_offset = max(0, self.verticalScrollBar().value())
+                self.prepare_objects(new_offset, adjust_start_line=True)
             self.viewport().update()
 
     def _on_object_eviction(  # pylint:disable=unused-argument
@@ -235,10 +277,21 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
         self._addr_to_region_offset.clear()
         self._offset_to_region.clear()
         self._disasms.clear()
+        self._disasm_blocks.clear()
         self._ail_disasms.clear()
+        self._disasm_seq += 1
+        self._disasm_queue.clear()
+        self._disasm_failed.clear()
+        self._cancel_disasm_job()
+        self._remove_placeholders(list(self._placeholders))
         self._offset = None
         self._max_offset = None
         self._start_line_in_object = 0
+        self._top_obj_addr = None
+        self._displayed_range = None
+        self._line_index = None
+        self._line_index_seq += 1
+        self._pending_line_index_objects.clear()
 
         # enumerate memory regions
         byte_offset = 0
@@ -251,6 +304,7 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
             self._offset_to_region[byte_offset] = mr
             byte_offset += mr.size
 
+        self._build_line_index()
         self.refresh()
 
     def goto_function(self, func) -> None:
@@ -299,8 +353,15 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
         self.navigate_to(floor_region_offset + offset_into_region)
 
     def navigate_to(self, offset: int) -> None:
-        self.verticalScrollBar().setValue(offset)
         self.prepare_objects(offset, start_line=0)
+        self._sync_scroll_bar()
+
+    def on_cfb_objects_added(self, objects: Iterable[tuple[int, object]]) -> None:
+        """
+        Handle a batch of objects that were added to the CFB while the CFG is being recovered. This method must be
+        called in the GUI thread.
+        """
+        self._add_line_index_objects(objects)
 
     #
     # Private methods
@@ -322,9 +383,32 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
             obj.refresh()
 
         # update vertical scrollbar
-        self.verticalScrollBar().setRange(-120, self.max_offset - (self.height() // self._line_height) // 2)
-        offset = 0 if self.offset is None else self.offset
-        self.verticalScrollBar().setValue(offset)
+        self._sync_scroll_bar()
+
+    def _sync_scroll_bar(self) -> None:
+        """
+        Update the range and the position of the vertical scroll bar, in lines if the line index is ready or in bytes
+        otherwise.
+        """
+        half_page = (self.height() // self._line_height) // 2
+        if self._line_index is not None:
+            self.verticalScrollBar().setRange(0, max(0, self._line_index.total_lines - half_page))
+            value = self._line_index.line_of(self._top_obj_addr) if self._top_obj_addr is not None else 0
+            value += self._start_line_in_object
+        else:
+            self.verticalScrollBar().setRange(-120, self.max_offset - half_page)
+            value = 0 if self.offset is None else self.offset
+        self.verticalScrollBar().setValue(value)
+
+    def _scroll_to_line(self, line: int) -> None:
+        location = self._line_index.locate(line)
+        if location is None:
+            return
+        addr, line_in_object = location
+        base_offset, mr = self._region_from_addr(addr)
+        if mr is None:
+            return
+        self.prepare_objects(base_offset + addr - mr.addr, start_line=line_in_object)
 
     def clear_objects(self) -> None:
         self.objects.clear()
@@ -378,6 +462,7 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
                 if qobject is None:
                     continue
                 object_lines = int(qobject.height // self._line_height)
+                self._correct_line_index(obj_addr, object_lines)
                 _l.debug("Compensating negative start_line: object %s, object_lines %d.", obj, object_lines)
                 start_line += object_lines
                 if start_line >= 0:
@@ -408,6 +493,8 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
         viewable_lines = int(self.height() // self._line_height)
         lines = 0
         start_line_in_object = 0
+        first_addr = last_addr = addr
+        top_obj_addr = None
 
         # Load a page of objects
         x = 80
@@ -441,6 +528,7 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
                 assert base_offset is not None and mr is not None
 
             object_lines = int(qobject.height // self._line_height)
+            self._correct_line_index(obj_addr, object_lines)
             _l.debug("... object lines: %d", object_lines)
 
             if start_line > 0 and start_line >= object_lines:
@@ -470,6 +558,8 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
                     lines += object_lines - start_line_in_object
                 else:
                     lines += object_lines
+                if top_obj_addr is None:
+                    top_obj_addr = obj_addr
                 self.objects[obj_addr] = qobject
                 qobject.setPos(x, y)
                 _l.debug(
@@ -484,6 +574,7 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
                     scene.addItem(qobject)
                 qobject.setVisible(True)
                 y += qobject.height + self.OBJECT_PADDING
+                last_addr = obj_addr + obj.size
 
             if lines > viewable_lines:
                 break
@@ -496,6 +587,10 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
         # Update properties
         self._offset = offset
         self._start_line_in_object = start_line_in_object
+        self._top_obj_addr = top_obj_addr
+        self._displayed_range = first_addr, last_addr if lines > viewable_lines else None
+
+        self._prefetch_disasms(first_addr, last_addr)
 
     def _obj_to_paintable(
         self, obj_addr, obj, use_cache=True
@@ -510,9 +605,12 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
                 func_addr = cfg_node.function_address
                 if self.instance.kb.functions.contains_addr(func_addr):
                     func = self.instance.kb.functions[func_addr]
-                    disasm = self._get_disasm(func)
+                    disasm = self._get_disasm(func, obj_addr)
                     qobject = None
-                    if self._disassembly_level is DisassemblyLevel.AIL:
+                    if disasm is None:
+                        # show the raw bytes of the block until the function has been lifted
+                        qobject = QUnknownBlock(self.instance, obj_addr, obj.bytes)
+                    elif self._disassembly_level is DisassemblyLevel.AIL:
                         ail_obj = None
                         if disasm.graph is not None:
                             # Clinic may yield a None graph when the function is empty
@@ -586,16 +684,265 @@ class QLinearDisassembly(QDisassemblyBaseControl, QAbstractScrollArea):
     def _addr_from_offset(mr, base_offset, offset: int):
         return mr.addr + (offset - base_offset)
 
-    def _get_disasm(self, func: Function) -> Clinic | Disassembly | None:
+    #
+    # Line index
+    #
+
+    LINE_INDEX_ATTEMPTS = 5
+    LINE_INDEX_RETRY_DELAY = 0.5
+
+    def _build_line_index(self, seq: int | None = None, attempt: int = 1) -> None:
         """
-        Get disassembly analysis object for a given function
+        Collect the objects of the displayed memory regions, and estimate their line counts in a background thread.
         """
-        if self._disassembly_level is DisassemblyLevel.AIL:
-            if func.addr not in self._ail_disasms:
-                self._ail_disasms[func.addr] = self.instance.project.analyses.Clinic(func)
-            return self._ail_disasms[func.addr]
+        if seq is None:
+            seq = self._line_index_seq
+        elif seq != self._line_index_seq:
+            return
+        regions = [(mr.addr, mr.size) for mr in self._offset_to_region.values()]
+        try:
+            objects = self._line_index_objects(self.cfb.am_obj, regions)
+        except Exception:  # pylint:disable=broad-except
+            # the CFG recovery adds objects to the CFB in its own thread, which may break the iteration
+            if attempt >= self.LINE_INDEX_ATTEMPTS:
+                _l.warning("Failed to index the lines of the linear view", exc_info=True)
+                self._pending_line_index_objects.clear()
+                return
+            _l.debug("Failed to collect the objects of the linear view, retrying", exc_info=True)
+            gui_thread_schedule_later(
+                functools.partial(self._build_line_index, seq, attempt + 1), delay=self.LINE_INDEX_RETRY_DELAY
+            )
+            return
+        start_daemon_thread(self._line_index_worker, "Indexing linear view", args=(seq, self.cfg.am_obj, objects))
+
+    def _line_index_worker(self, seq: int, cfg, objects: list[tuple[int, object]]) -> None:
+        try:
+            index = LineIndex((obj_addr, self._estimate_lines(cfg, obj_addr, obj)) for obj_addr, obj in objects)
+        except Exception:  # pylint:disable=broad-except
+            _l.warning("Failed to index the lines of the linear view", exc_info=True)
+            return
+        gui_thread_schedule_async(self._on_line_index_ready, args=(seq, index))
+
+    def _on_line_index_ready(self, seq: int, index: LineIndex) -> None:
+        if seq != self._line_index_seq:
+            return
+        self._line_index = index
+        pending, self._pending_line_index_objects = self._pending_line_index_objects, []
+        self._add_line_index_objects(pending)
+        self._sync_scroll_bar()
+
+    @staticmethod
+    def _line_index_objects(cfb, regions: list[tuple[int, int]]) -> list[tuple[int, object]]:
+        """
+        Get the objects of the CFB in the displayed memory regions.
+        """
+        objects = []
+        for region_addr, region_size in regions:
+            region_end = region_addr + region_size
+            for obj_addr, obj in cfb.floor_items(addr=region_addr):
+                if obj_addr >= region_end:
+                    break
+                if obj_addr >= region_addr:
+                    objects.append((obj_addr, obj))
+        return objects
 
-        if func.addr not in self._disasms:
+    @staticmethod
+    def _estimate_lines(cfg, obj_addr: int, obj) -> int:
+        """
+        Estimate how many lines an object takes without creating the object. The estimate is replaced by the actual
+        line count once the object is displayed.
+        """
+        if isinstance(obj, Block):
+            node = cfg.get_any_node(obj_addr, force_fastpath=True) if cfg is not None else None
+            if node is not None and node.instruction_addrs:
+                lines = len(node.instruction_addrs)
+            else:
+                lines = max(obj.size // 4, 1)
+            # the label of the block, or the header of the function
+            lines += 3 if node is not None and node.function_address == obj_addr else 1
+            return lines
+        if isinstance(obj, MemoryData):
+            size = obj.size or 1
+            # one line per 16 bytes, and the label
+            return (obj_addr + size - 1) // 16 - obj_addr // 16 + 2
+        if isinstance(obj, Unknown):
+            if not obj.bytes:
+                return 1
+            # QUnknownBlock omits the lines after the first 100 or so
+            return min((len(obj.bytes) + 15) // 16, 102)
+        return 0
+
+    def _correct_line_index(self, obj_addr: int, lines: int) -> None:
+        if self._line_index is not None and obj_addr in self._line_index:
+            self._line_index.set_lines(obj_addr, lines)
+
+    def _add_line_index_objects(self, objects: Iterable[tuple[int, object]]) -> None:
+        if self._line_index is None:
+            # the objects may have been added after the objects of the line index were collected
+            self._pending_line_index_objects.extend(objects)
+            return
+        cfg = self.cfg.am_obj
+        displayed = False
+        for addr, obj in objects:
+            _, mr = self._region_from_addr(addr)
+            if mr is None or addr >= mr.addr + mr.size:
+                continue
+            if addr not in self._line_index:
+                self._line_index.set_lines(addr, self._estimate_lines(cfg, addr, obj))
+            displayed |= self._is_displayed(addr)
+        if displayed:
+            # refresh the view once for the whole batch
+            self._refresh_displayed_objects()
+
+    def _is_displayed(self, addr: int) -> bool:
+        if self._displayed_range is None:
+            return False
+        first_addr, last_addr = self._displayed_range
+        return first_addr <= addr and (last_addr is None or addr < last_addr)
+
+    def _refresh_displayed_objects(self) -> None:
+        if self._offset is None:
+            return
+        offset, start_line = self._offset, self._start_line_in_object
+        self._offset = None
+        self.prepare_objects(offset, start_line=start_line)
+        self._sync_scroll_bar()
+        self.viewport().update()
+
+    #
+    # Disassembly
+    #
+
+    def _get_disasm(self, func: Function, block_addr: int) -> Clinic | Disassembly | None:
+        """
+        Get the disassembly analysis object of a function that covers at least the block at `block_addr`. Large
+        functions are lifted to AIL in the background, in which case None is returned and the object at `block_addr` is
+        replaced once the function is ready.
+        """
+        if self._disassembly_level is not DisassemblyLevel.AIL:
+            return self._get_block_disasm(func, block_addr)
+
+        disasm = self._ail_disasms.get(func.addr, None)
+        if disasm is not None:
+            return disasm
+
+        if len(func.block_addrs_set) < Conf.disasm_linear_async_threshold:
+            disasm = disassemble_function(self.instance, func, ail=True)
+            self._ail_disasms[func.addr] = disasm
+            return disasm
+
+        self._placeholders.setdefault(func.addr, set()).add(block_addr)
+        self._request_disasms([func.addr], urgent=True)
+        return None
+
+    def _get_block_disasm(self, func: Function, block_addr: int) -> Disassembly:
+        """
+        Disassemble a block of a function, so that the time to display a screen of instructions does not depend on
+        the size of the function. The blocks of a function share one Disassembly object. Variables, labels, and
+        comments are looked up in the knowledge base when blocks are displayed, so they do not need the whole
+        function to be disassembled.
+        """
+        disasm = self._disasms.get(func.addr, None)
+        if disasm is None:
             include_ir = self._disassembly_level is DisassemblyLevel.LifterIR
-            self._disasms[func.addr] = self.instance.project.analyses.Disassembly(function=func, include_ir=include_ir)
-        return self._disasms[func.addr]
+            # the prefetcher only prepares machine code disassembly of whole functions
+            disasm = None if include_ir else self.disasm_view.workspace.prefetcher.take_disassembly(func.addr)
+            if disasm is not None:
+                self._disasm_blocks[func.addr] = None
+            else:
+                # an empty Disassembly that blocks are added to
+                disasm = self.instance.project.analyses.Disassembly(include_ir=include_ir)
+                self._disasm_blocks[func.addr] = set()
+            self._disasms[func.addr] = disasm
+
+        blocks = self._disasm_blocks[func.addr]
+        if blocks is not None and block_addr not in blocks:
+            node = func.get_node(block_addr)
+            if node is None:
+                node = self.instance.project.factory.block(block_addr).codenode
+            disasm.parse_block(node)
+            blocks.add(block_addr)
+        return disasm
+
+    def _on_disasm_eviction(self, key: int, disasm: Disassembly) -> None:  # pylint:disable=unused-argument
+        self._disasm_blocks.pop(key, None)
+
+    def _prefetch_disasms(self, start_addr: int, end_addr: int) -> None:
+        """
+        Lift the functions right above and below the displayed range in the background, so that they are ready when
+        the user scrolls there.
+        """
+        if self.instance.kb is None or self._disassembly_level is not DisassemblyLevel.AIL:
+            return
+        functions = self.instance.kb.functions
+        func_addrs = []
+        for func in (functions.floor_func(start_addr - 1), functions.ceiling_func(end_addr)):
+            if func is not None and len(func.block_addrs_set) >= Conf.disasm_linear_async_threshold:
+                func_addrs.append(func.addr)
+        self._request_disasms(func_addrs, urgent=False)
+
+    def _request_disasms(self, func_addrs: list[int], urgent: bool) -> None:
+        func_addrs = [addr for addr in func_addrs if addr not in self._ail_disasms]
+        if not func_addrs:
+            return
+        current = self._disasm_job.function.addr if self._disasm_job is not None else None
+        for func_addr in func_addrs:
+            if func_addr == current or func_addr in self._disasm_failed:
+                continue
+            if func_addr in self._disasm_queue:
+                if not urgent:
+                    continue
+                self._disasm_queue.remove(func_addr)
+            if urgent:
+                self._disasm_queue.appendleft(func_addr)
+            else:
+                self._disasm_queue.append(func_addr)
+        while len(self._disasm_queue) > self.MAX_QUEUED_DISASMS:
+            self._disasm_queue.pop()
+        self._start_disasm_job()
+
+    def _start_disasm_job(self) -> None:
+        while self._disasm_job is None and self._disasm_queue:
+            func_addr = self._disasm_queue.popleft()
+            func = self.instance.kb.functions.function(addr=func_addr)
+            if func is None:
+                continue
+            self._disasm_job = DisassembleFunctionJob(
+                self.instance,
+                func,
+                ail=True,
+                # functions with placeholders on the screen are urgent, the others are lifted in advance
+                priority=JobPriority.INTERACTIVE if func_addr in self._placeholders else JobPriority.SPECULATIVE,
+                on_finish=functools.partial(self._on_disasm_ready, self._disasm_seq, func_addr),
+            )
+            self.disasm_view.workspace.job_manager.add_job(self._disasm_job)
+
+    def _cancel_disasm_job(self) -> None:
+        job = self._disasm_job
+        self._disasm_job = None
+        if job is not None and job.state in (JobState.PENDING, JobState.RUNNING):
+            self.disasm_view.workspace.job_manager.cancel_job(job)
+
+    def _on_disasm_ready(self, seq: int, func_addr: int, disasm: Clinic | None) -> None:
+        if seq != self._disasm_seq:
+            return
+        self._disasm_job = None
+        if disasm is None:
+            self._disasm_failed.add(func_addr)
+        else:
+            self._ail_disasms[func_addr] = disasm
+            if func_addr in self._placeholders:
+                self._remove_placeholders([func_addr])
+                # swap the AIL blocks in
+                curr_offset = self._offset
+                self._offset = None
+                self.prepare_objects(curr_offset, start_line=self._start_line_in_object)
+                self.viewport().update()
+        self._start_disasm_job()
+
+    def _remove_placeholders(self, func_addrs: list[int]) -> None:
+        for func_addr in func_addrs:
+            for obj_addr in self._placeholders.pop(func_addr, ()):
+                obj = self.objects.pop(obj_addr, None)
+                if obj is not None:
+                    self._on_object_eviction(obj_addr, obj)
@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+import math
 from typing import TYPE_CHECKING
 
 from PySide6.QtCore import QEvent, QMarginsF, QPoint, QPointF, QRectF, Qt
-from PySide6.QtGui import QImage, QMouseEvent, QPainter, QPainterPath, QPen, QRegion, QWheelEvent
+from PySide6.QtGui import (
+    QColor,
+    QImage,
+    QMouseEvent,
+    QPainter,
+    QPainterPath,
+    QPen,
+    QPolygonF,
+    QRegion,
+    QTransform,
+    QWheelEvent,
+)
 from PySide6.QtWidgets import QFrame, QGraphicsItem, QGraphicsScene, QGraphicsView
 
 from angrmanagement.config import Conf
@@ -16,6 +28,27 @@ def clamp(v, min_, max_):
     return min(max(v, min_), max_)
 
 
+class MiniMapPrimitives:
+    """
+    A simplified version of the items of a scene, in scene coordinates, for the minimap to draw instead of rendering the
+    scene itself.
+    """
+
+    __slots__ = ("lines", "rects")
+
+    def __init__(self) -> None:
+        # (rect, fill color, border color)
+        self.rects: list[tuple[QRectF, QColor, QColor]] = []
+        # (points, color)
+        self.lines: list[tuple[list[tuple[float, float]], QColor]] = []
+
+    def add_rect(self, rect: QRectF, fill: QColor, border: QColor) -> None:
+        self.rects.append((rect, fill, border))
+
+    def add_line(self, points: list[tuple[float, float]], color: QColor) -> None:
+        self.lines.append((points, color))
+
+
 class QMiniMapViewportBox(QGraphicsItem):
     """
     Widget to indicate target viewport position/size on the minimap.
@@ -76,14 +109,24 @@ class QMiniMapTargetSceneViewer(QGraphicsItem):
     """
     Widget to render minimized version of the target view's scene on the minimap.
 
-    For performance, the scene is cached in a QImage and only updated when update_scene_drawing is called.
+    For performance, the scene is cached in a QImage and only updated when update_scene_drawing is called. If the
+    target view provides MiniMapPrimitives, they are drawn instead of the scene, into tiles. Each tile is only drawn
+    again when the primitives that overlap it change.
     """
 
-    def __init__(self, target_view: QGraphicsView) -> None:
+    TILE_SIZE = 64
+
+    def __init__(self, target_view: QBaseGraphicsView) -> None:
         super().__init__()
-        self._view: QGraphicsView = target_view
+        self._view: QBaseGraphicsView = target_view
         self._minimap_scene_rect: QRectF = QRectF()
         self._scene_img: QImage = QImage()
+        # tile position -> image. tiles without any primitives have no image
+        self._tiles: dict[tuple[int, int], QImage] = {}
+        # tile position -> the primitives that were drawn in the tile
+        self._tile_contents: dict[tuple[int, int], tuple] = {}
+        # the transform and device pixel ratio that the tiles were drawn with
+        self._tiles_key = None
 
     def set_scene_rect(self, rect: QRectF) -> None:
         """
@@ -102,6 +145,16 @@ class QMiniMapTargetSceneViewer(QGraphicsItem):
         if scene is None:
             return
 
+        primitives = self._view.minimap_primitives()
+        if primitives is not None:
+            self._scene_img = QImage()
+            self._update_tiles(primitives, scene.sceneRect())
+            self.update()
+            return
+        self._tiles.clear()
+        self._tile_contents.clear()
+        self._tiles_key = None
+
         dpr = self._view.devicePixelRatioF()
         self._scene_img = QImage(
             dpr * self._minimap_scene_rect.width(), dpr * self._minimap_scene_rect.height(), QImage.Format.Format_ARGB32
@@ -115,10 +168,91 @@ class QMiniMapTargetSceneViewer(QGraphicsItem):
         self._view.set_extra_render_pass(False)
         self.update()
 
+    def _update_tiles(self, primitives: MiniMapPrimitives, scene_rect: QRectF) -> None:
+        """
+        Draw the tiles whose primitives changed since the last time.
+        """
+        if scene_rect.width() <= 0 or scene_rect.height() <= 0 or self._minimap_scene_rect.isEmpty():
+            self._tiles.clear()
+            self._tile_contents.clear()
+            return
+
+        dpr = self._view.devicePixelRatioF()
+        transform = QTransform()
+        transform.scale(
+            self._minimap_scene_rect.width() / scene_rect.width(),
+            self._minimap_scene_rect.height() / scene_rect.height(),
+        )
+        transform.translate(-scene_rect.x(), -scene_rect.y())
+        tiles_key = (transform.m11(), transform.m22(), transform.dx(), transform.dy(), dpr)
+        if tiles_key != self._tiles_key:
+            # everything moved
+            self._tiles.clear()
+            self._tile_contents.clear()
+            self._tiles_key = tiles_key
+
+        # collect the primitives that overlap each tile
+        tile_size = self.TILE_SIZE
+        contents: dict[tuple[int, int], list] = {}
+
+        def _add(primitive, bounds: QRectF) -> None:
+            bounds = transform.mapRect(bounds)
+            for tx in range(int(bounds.left() // tile_size), int(math.floor(bounds.right() / tile_size)) + 1):
+                for ty in range(int(bounds.top() // tile_size), int(math.floor(bounds.bottom() / tile_size)) + 1):
+                    contents.setdefault((tx, ty), []).append(primitive)
+
+        for rect, fill, border in primitives.rects:
+            _add(("rect", rect.getRect(), fill.rgba(), border.rgba()), rect)
+        for points, color in primitives.lines:
+            xs = [x for x, _ in points]
+            ys = [y for _, y in points]
+            bounds = QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+            _add(("line", tuple(points), color.rgba()), bounds)
+
+        for pos in list(self._tiles):
+            if pos not in contents:
+                del self._tiles[pos]
+                del self._tile_contents[pos]
+        for pos, tile_primitives in contents.items():
+            tile_primitives = tuple(tile_primitives)
+            if self._tile_contents.get(pos) != tile_primitives:
+                self._tiles[pos] = self._draw_tile(pos, tile_primitives, transform, dpr)
+                self._tile_contents[pos] = tile_primitives
+
+    def _draw_tile(self, pos: tuple[int, int], primitives: tuple, transform: QTransform, dpr: float) -> QImage:
+        tile_size = self.TILE_SIZE
+        img = QImage(int(tile_size * dpr), int(tile_size * dpr), QImage.Format.Format_ARGB32_Premultiplied)
+        img.setDevicePixelRatio(dpr)
+        img.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(img)
+        painter.setRenderHints(QPainter.RenderHint.Antialiasing)
+        painter.translate(-pos[0] * tile_size, -pos[1] * tile_size)
+        painter.setTransform(transform, True)
+        for primitive in primitives:
+            if primitive[0] == "rect":
+                _, (x, y, w, h), fill, border = primitive
+                pen = QPen(QColor.fromRgba(border), 0)
+                painter.setPen(pen)
+                painter.setBrush(QColor.fromRgba(fill))
+                painter.drawRect(QRectF(x, y, w, h))
+            else:
+                _, points, color = primitive
+                painter.setPen(QPen(QColor.fromRgba(color), 0))
+                painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in points]))
+        painter.end()
+        return img
+
     def paint(self, painter, option, widget) -> None:  # pylint: disable=unused-argument
         """
         Paint the minimized scene image.
         """
+        if self._scene_img.isNull():
+            painter.fillRect(self._minimap_scene_rect, Conf.disasm_view_minimap_background_color)
+            tile_size = self.TILE_SIZE
+            for (tx, ty), img in self._tiles.items():
+                painter.drawImage(QPointF(tx * tile_size, ty * tile_size), img)
+            return
         painter.drawImage(0, 0, self._scene_img)
 
     def boundingRect(self):
@@ -1,21 +1,20 @@
 from __future__ import annotations
 
-import re
 from typing import TYPE_CHECKING, Any
 
-from angr.knowledge_plugins.cfg.memory_data import MemoryDataSort
-from PySide6.QtCore import QAbstractTableModel, QSortFilterProxyModel, Qt
+from PySide6.QtCore import QAbstractTableModel, Qt
 from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
 
 from angrmanagement.config import Conf
 from angrmanagement.ui.dialogs.xref import XRefDialog
-from angrmanagement.utils import filter_string_for_display
 
 if TYPE_CHECKING:
-    from angr.analyses.cfg.cfg_fast import MemoryData
+    import re
+
     from PySide6.QtGui import QKeyEvent
 
     from angrmanagement.data.instance import Instance
+    from angrmanagement.data.strings_index import StringEntry, StringsIndex
 
 
 class QStringModel(QAbstractTableModel):
@@ -26,69 +25,63 @@ class QStringModel(QAbstractTableModel):
     LENGTH_COL = 2
     STRING_COL = 3
 
-    def __init__(self, cfg, func=None) -> None:
+    def __init__(self, strings_index: StringsIndex | None, func=None) -> None:
         super().__init__()
 
-        self._cfg = cfg
+        self._strings_index = strings_index
         self._function = func
-        self._xrefs = None
+        self._filter = None
+        self._sort_column: int | None = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
 
         self._values = None
 
     @property
-    def cfg(self):
-        return self._cfg
+    def strings_index(self) -> StringsIndex | None:
+        return self._strings_index
 
-    @cfg.setter
-    def cfg(self, v) -> None:
+    @strings_index.setter
+    def strings_index(self, v) -> None:
         self.beginResetModel()
-        self._cfg = v
+        self._strings_index = v
         self._values = None
         self.endResetModel()
 
     @property
-    def xrefs(self):
-        return self._xrefs
+    def function(self):
+        return self._function
 
-    @xrefs.setter
-    def xrefs(self, v) -> None:
+    @function.setter
+    def function(self, v) -> None:
         self.beginResetModel()
-        self._xrefs = v
+        self._function = v
         self._values = None
         self.endResetModel()
 
     @property
-    def function(self):
-        return self._function
+    def filter(self) -> str | re.Pattern | None:
+        return self._filter
 
-    @function.setter
-    def function(self, v) -> None:
+    @filter.setter
+    def filter(self, v) -> None:
         self.beginResetModel()
-        self._function = v
+        self._filter = v
         self._values = None
         self.endResetModel()
 
-    def _get_all_string_memory_data(self):
-        lst = []
-        if self.cfg is None:
-            return lst
-        for v in self.cfg.memory_data.values():
-            if v.sort in {MemoryDataSort.String, MemoryDataSort.UnicodeString}:
-                if self._function is None:
-                    lst.append(v)
-                else:
-                    xrefs = self._xrefs
-                    if v.addr in xrefs.xrefs_by_dst:
-                        for xref in xrefs.xrefs_by_dst[v.addr]:
-                            if xref.block_addr in self._function.block_addrs_set:
-                                lst.append(v)
-                                break
-        return lst
+    def _get_string_entries(self) -> list[StringEntry]:
+        if self._strings_index is None:
+            return []
+        func_addr = self._function.addr if self._function is not None else None
+        values = self._strings_index.search(self._filter or "", func_addr=func_addr)
+        if self._sort_column is not None:
+            values = self._sorted(values, self._sort_column, self._sort_order)
+        return values
 
     @property
-    def values(self):
+    def values(self) -> list[StringEntry]:
         if self._values is None:
-            self._values = self._get_all_string_memory_data()
+            self._values = self._get_string_entries()
         return self._values
 
     def __len__(self) -> int:
@@ -128,38 +121,35 @@ class QStringModel(QAbstractTableModel):
 
     def sort(self, column, order=None) -> Any:
         self.layoutAboutToBeChanged.emit()
+        # remember the order, so that it is kept when the filter changes
+        self._sort_column = column
+        self._sort_order = order
+        self._values = self._sorted(self.values, column, order)
+        self.layoutChanged.emit()
 
-        self._values = sorted(
-            self.values,
+    def _sorted(self, values: list[StringEntry], column: int, order) -> list[StringEntry]:
+        return sorted(
+            values,
             key=lambda x: self._get_column_data(x, column),
             reverse=order == Qt.SortOrder.DescendingOrder,
         )
-        self.layoutChanged.emit()
 
-    def _get_column_text(self, v: MemoryData, col: int):
+    def _get_column_text(self, v: StringEntry, col: int):
         if col < len(self.HEADER):
             data = self._get_column_data(v, col)
             if col == self.ADDRESS_COL and isinstance(data, int):
                 return f"{data:x}"
             return data
 
-    @staticmethod
-    def _get_decoded_string_content(md: MemoryData) -> str:
-        sort_to_encoding = {MemoryDataSort.String: "utf-8", MemoryDataSort.UnicodeString: "utf_16_le"}
-        return md.content.decode(sort_to_encoding[md.sort])
-
-    def _get_column_data(self, v: MemoryData, col: int) -> Any:
-        mapping = {
-            self.ADDRESS_COL: lambda x: x.addr,
-            self.SIZE_COL: lambda x: x.size,
-            self.LENGTH_COL: lambda x: len(self._get_decoded_string_content(x)) if x.content is not None else "<ERROR>",
-            self.STRING_COL: lambda x: (
-                filter_string_for_display(self._get_decoded_string_content(x)) if x.content is not None else "<ERROR>"
-            ),
-        }
-
-        if col in mapping:
-            return mapping[col](v)
+    def _get_column_data(self, v: StringEntry, col: int) -> Any:
+        if col == self.ADDRESS_COL:
+            return v.addr
+        elif col == self.SIZE_COL:
+            return v.size
+        elif col == self.LENGTH_COL:
+            return v.length
+        elif col == self.STRING_COL:
+            return v.display
         return None
 
 
@@ -177,11 +167,9 @@ class QStringTable(QTableView):
         self.verticalHeader().setDefaultSectionSize(24)
         self.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
 
+        # filtering is done by the model through the strings index
         self._model = QStringModel(None)
-        self._proxy = QSortFilterProxyModel(self)
-        self._proxy.setSourceModel(self._model)
-        self._proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        self.setModel(self._proxy)
+        self.setModel(self._model)
 
         self.setSortingEnabled(True)
         self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
@@ -197,21 +185,17 @@ class QStringTable(QTableView):
     #
 
     @property
-    def cfg(self):
-        return self._model.cfg
+    def strings_index(self) -> StringsIndex | None:
+        return self._model.strings_index
 
-    @cfg.setter
-    def cfg(self, v) -> None:
-        self._model.cfg = v
+    @strings_index.setter
+    def strings_index(self, v) -> None:
+        self._model.strings_index = v
         self.fast_resize()
 
     @property
     def xrefs(self):
-        return self._model.xrefs
-
-    @xrefs.setter
-    def xrefs(self, v) -> None:
-        self._model.xrefs = v
+        return self._instance.kb.xrefs if self._instance.kb is not None else None
 
     @property
     def function(self):
@@ -229,11 +213,7 @@ class QStringTable(QTableView):
     @filter_string.setter
     def filter_string(self, v) -> None:
         self._filter = v
-        if isinstance(v, re.Pattern):
-            self._proxy.setFilterRegularExpression(self._filter.pattern)
-        else:
-            self._proxy.setFilterWildcard(self._filter)
-        self._proxy.setFilterKeyColumn(3)
+        self._model.filter = v
 
     #
     # Public methods
@@ -249,7 +229,6 @@ class QStringTable(QTableView):
     #
 
     def _on_string_selected(self, model_index) -> None:
-        model_index = self._proxy.mapToSource(model_index)
         selected_index = model_index.row()
         if self._model is None:
             return
@@ -266,10 +245,9 @@ class QStringTable(QTableView):
 
             selected_rows = list(self.selectionModel().selectedRows())
             if len(selected_rows) == 1:
-                model_index = self._proxy.mapToSource(selected_rows[0])
-                selected_index = model_index.row()
+                selected_index = selected_rows[0].row()
                 if 0 <= selected_index < len(self._model.values):
-                    selected_item: MemoryData = self._model.values[selected_index]
+                    selected_item: StringEntry = self._model.values[selected_index]
                     dialog = XRefDialog(
                         addr=selected_item.addr,
                         dst_addr=selected_item.addr,
@@ -2,14 +2,18 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from angr.knowledge_plugins.variables.variable_access import VariableAccess
-from angr.knowledge_plugins.xrefs.xref import XRef, XRefType
+from angr.knowledge_plugins.xrefs.xref import XRefType
 from PySide6.QtCore import QAbstractTableModel, Qt
 from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
 
 from angrmanagement.config import Conf
+from angrmanagement.data.xref_index import XRefColumns
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from angr.knowledge_plugins.variables.variable_access import VariableAccess
+
     from angrmanagement.data.instance import Instance
 
 
@@ -191,6 +195,11 @@ class QXRefVariableModel(QXRefModel):
 
 
 class QXRefAddressModel(QXRefModel):
+    """
+    A virtual model of the references to an address. Rows are fetched in batches as they are scrolled into view, and
+    their texts are only formatted when they are displayed.
+    """
+
     HEADER = [("Direction", 70), ("Type", 50), ("PC", 160), ("Text", 300)]
 
     DIRECTION_COL = 0
@@ -198,10 +207,89 @@ class QXRefAddressModel(QXRefModel):
     PC_COL = 2
     TEXT_COL = 3
 
-    def _get_column_data(self, ref, idx: int):
+    # the number of rows that are fetched at a time
+    FETCH_BATCH = 256
+
+    def __init__(self, addr: int | None, instance: Instance, view, columns: XRefColumns) -> None:
+        super().__init__(addr, instance, view)
+
+        self.columns = columns
+        # row -> reference, as an index into the columns
+        self._order: Sequence[int] = range(len(columns))
+        self._fetched = min(len(columns), self.FETCH_BATCH)
+        # reference -> column -> text
+        self._texts: dict[int, dict[int, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def rowCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return self._fetched
+
+    def canFetchMore(self, parent) -> bool:
+        return not parent.isValid() and self._fetched < len(self.columns)
+
+    def fetchMore(self, parent) -> None:
+        count = min(len(self.columns) - self._fetched, self.FETCH_BATCH)
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
+
+    def src_at(self, row: int) -> int:
         """
+        Get the source address of the reference in a row.
+        """
+        return self.columns.srcs[self._order[row]]
+
+    def data(self, index, role):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        if row >= self._fetched:
+            return None
+
+        if role == Qt.DisplayRole:
+            return self._get_column_text(self._order[row], index.column())
 
-        :param XRef ref:
+        elif role == Qt.FontRole:
+            return Conf.tabular_view_font
+
+        return None
+
+    def sort(self, column, order) -> None:
+        srcs, types = self.columns.srcs, self.columns.types
+        refs = range(len(srcs))
+        reverse = order == Qt.SortOrder.DescendingOrder
+
+        self.layoutAboutToBeChanged.emit()
+        if column == self.TYPE_COL:
+            self._order = sorted(refs, key=lambda i: (types[i], srcs[i]), reverse=reverse)
+        elif column == self.TEXT_COL:
+            # the only column that has to be formatted for all references
+            self._order = sorted(refs, key=lambda i: self._get_column_text(i, column), reverse=reverse)
+        else:
+            # directions and PCs are ordered by the source addresses
+            self._order = sorted(refs, key=srcs.__getitem__, reverse=reverse)
+        self.layoutChanged.emit()
+
+    def _get_column_text(self, ref: int, idx: int):
+        texts = self._texts.get(ref)
+        if texts is None:
+            texts = self._texts[ref] = {}
+        text = texts.get(idx)
+        if text is None:
+            text = texts[idx] = super()._get_column_text(ref, idx)
+        return text
+
+    def _get_column_data(self, ref: int, idx: int):
+        """
+
+        :param int ref: Index of the reference in the columns.
         :param int idx:
         :return:
         """
@@ -217,41 +305,24 @@ class QXRefAddressModel(QXRefModel):
             return handler(ref)
         return None
 
-    def _addrstr(self, _r):
-        addr = _r.ins_addr
+    def _addrstr(self, ref: int):
+        addr = self.columns.srcs[ref]
         node = self.instance.cfg.get_any_node(addr, anyaddr=True)
         if node is not None and node.function_address is not None:
             return f"{addr:#x} ({self.instance.kb.functions[node.function_address].name})"
         return hex(addr)
 
-    def _direction(self, _r) -> str:
-        """
+    def _direction(self, ref: int) -> str:
+        src = self.columns.srcs[ref]
+        if self.addr is None or src == self.addr:
+            return ""
+        return "up" if src < self.addr else "down"
 
-        :param XRef _r:
-        :return:
-        """
-        if _r.ins_addr < self.addr:
-            return "up"
-        elif _r.ins_addr > self.addr:
-            return "down"
-        return ""
+    def _access_type(self, ref: int):
+        return XRefType.to_string(self.columns.types[ref])
 
-    @staticmethod
-    def _access_type(_r):
-        """
-
-        :param XRef _r:
-        :return:
-        """
-        return _r.type_string
-
-    def _text(self, _r):
-        """
-
-        :param XRef _r:
-        :return:
-        """
-        text = self.instance.get_instruction_text_at(_r.ins_addr)
+    def _text(self, ref: int):
+        text = self.instance.get_instruction_text_at(self.columns.srcs[ref])
         if text is None:
             text = "-=unavailable=-"
         return text
@@ -300,12 +371,13 @@ class QXRefViewer(QTableView):
             raise ValueError("Unsupported mode. Either variable or dst_addr should be specified.")
 
         self.items = []
+        self.columns = XRefColumns()
         self._reload()
 
         if self.mode == XRefMode.Variable:
             self._model = QXRefVariableModel(self._addr, self._instance, self)
         elif self.mode == XRefMode.Address:
-            self._model = QXRefAddressModel(self._addr, self._instance, self)
+            self._model = QXRefAddressModel(self._addr, self._instance, self, self.columns)
         else:
             raise ValueError("Unsupported mode. Either variable or dst_addr should be specified.")
         self.setModel(self._model)
@@ -328,13 +400,18 @@ class QXRefViewer(QTableView):
             self.items = self._variable_manager.get_variable_accesses(self._variable, same_name=True)
             self.items = sorted(self.items, key=lambda item: item.location.ins_addr)
         else:  # self.mode == XRefMode.Address
-            self.items = list(self._xrefs_manager.get_xrefs_by_dst(self._dst_addr))
+            if self._instance is not None:
+                columns = self._instance.xref_index.references_to(self._xrefs_manager, self._dst_addr)
+            else:
+                columns = XRefColumns.from_xrefs(self._xrefs_manager.get_xrefs_by_dst(self._dst_addr))
 
-            # Create XRef objects for addresses inside the CFG
-            self.items += list(self._xrefs_from_control_flow_transitions())
-            self.items = sorted(self.items, key=lambda item: item.ins_addr)
+            # add references for addresses inside the CFG
+            self.columns = columns.merge(XRefColumns.from_rows(self._xrefs_from_control_flow_transitions()))
 
-    def _xrefs_from_control_flow_transitions(self):
+    def _xrefs_from_control_flow_transitions(self) -> Iterator[tuple[int, int]]:
+        """
+        Yield the source addresses and types of the references from the blocks that branch to the address.
+        """
         if self._instance is not None:
             cfg = self._instance.cfg
             node = cfg.get_any_node(self._dst_addr)
@@ -350,13 +427,7 @@ class QXRefViewer(QTableView):
                             ins_addr = pred.instruction_addrs[-1]
                     else:
                         ins_addr = pred.addr
-                    yield XRef(
-                        ins_addr=ins_addr,
-                        block_addr=pred.addr,
-                        stmt_idx=None,
-                        dst=self._dst_addr,
-                        xref_type=XRefType.Offset,
-                    )
+                    yield ins_addr, XRefType.Offset
 
     #
     # Signal handlers
@@ -368,8 +439,8 @@ class QXRefViewer(QTableView):
         if xref_dialog is None:
             return
 
-        item = self.items[row]
-        if isinstance(item, VariableAccess):
+        if self.mode == XRefMode.Address:
+            xref_dialog.jump_to(self._model.src_at(row))
+        else:
+            item: VariableAccess = self.items[row]
             xref_dialog.jump_to(item.location.ins_addr)
-        elif isinstance(item, XRef):
-            xref_dialog.jump_to(item.ins_addr)
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import logging
 import os
-import time
 import traceback
 from typing import TYPE_CHECKING, TypeVar
 
@@ -28,6 +27,7 @@ from angrmanagement.data.breakpoint import Breakpoint, BreakpointType
 from angrmanagement.data.instance import Instance, ObjectContainer
 from angrmanagement.data.jobs import (
     APIDeobfuscationJob,
+    BatchDecompilationJob,
     CFGGenerationJob,
     CodeTaggingJob,
     FlirtSignatureRecognitionJob,
@@ -42,13 +42,13 @@ from angrmanagement.logic.debugger import DebuggerWatcher
 from angrmanagement.logic.debugger.bintrace import BintraceDebugger
 from angrmanagement.logic.debugger.simgr import SimulationDebugger
 from angrmanagement.logic.jobmanager import JobManager
+from angrmanagement.logic.prefetcher import Prefetcher
 from angrmanagement.logic.threads import gui_thread_schedule_async
 from angrmanagement.plugins import PluginManager
 from angrmanagement.ui.dialogs import AnalysisOptionsDialog
 from angrmanagement.ui.dialogs.function import FunctionDialog
 from angrmanagement.ui.views.view import FunctionView
 from angrmanagement.utils import locate_function
-from angrmanagement.utils.daemon_thread import start_daemon_thread
 
 from .view_manager import ViewManager
 from .views import (
@@ -112,6 +112,8 @@ class Workspace:
         self.main_instance.handle_comment_changed_callback = self.plugins.handle_comment_changed
         self.main_instance.job_worker_exception_callback = self._handle_job_exception
 
+        self.prefetcher = Prefetcher(self)
+
         self.current_screen = ObjectContainer(None, name="current_screen")
 
         self.default_tabs = [
@@ -226,34 +228,53 @@ class Workspace:
 
         cfg_job = CFGGenerationJob(self.main_instance, on_finish=self.on_cfg_generated, **cfg_args)
         self.job_manager.add_job(cfg_job)
-        start_daemon_thread(self._refresh_cfg, "Progressively Refreshing CFG", args=(cfg_job,))
+        self._add_post_cfg_jobs(cfg_job)
 
-    def _refresh_cfg(self, cfg_job) -> None:
+    def _add_post_cfg_jobs(self, cfg_job: CFGGenerationJob) -> None:
         """
-        Reload once and then refresh in a loop, while the CFG job is running
+        Queue the analyses that run on top of a recovered CFG. They are only dispatched once the CFG job (and the jobs
+        they depend on) have finished, and are cancelled by the job manager if any of them fails.
         """
-        reloaded = False
-        while True:
-            if not self.main_instance.cfg.am_none:
-                if reloaded:
-                    gui_thread_schedule_async(
-                        self.refresh,
-                        kwargs={
-                            "categories": ["disassembly", "functions"],
-                        },
-                    )
-                else:
-                    gui_thread_schedule_async(
-                        self.reload,
-                        kwargs={
-                            "categories": ["disassembly", "functions"],
-                        },
+        assert self.main_instance._analysis_configuration is not None
+
+        # disable multiprocessing on angr CI
+        batch_workers = 0 if is_testing else None
+
+        if self.main_instance._analysis_configuration["flirt"].enabled:
+            flirt_job = FlirtSignatureRecognitionJob(self.main_instance, depends_on=[cfg_job])
+            self.job_manager.add_job(flirt_job)
+            prototype_job = PrototypeFindingJob(self.main_instance, workers=batch_workers, depends_on=[flirt_job])
+            self.job_manager.add_job(prototype_job)
+
+            if self.main_instance._analysis_configuration["code_tagging"].enabled:
+                self.job_manager.add_job(
+                    CodeTaggingJob(
+                        self.main_instance,
+                        on_finish=self.on_function_tagged,
+                        workers=batch_workers,
+                        depends_on=[prototype_job],
                     )
-                    reloaded = True
+                )
 
-            time.sleep(0.3)
-            if cfg_job not in self.job_manager.jobs:
-                break
+            if self.main_instance._analysis_configuration["varec"].enabled:
+                options = self.main_instance._analysis_configuration["varec"].to_dict()
+                if is_testing:
+                    # disable multiprocessing on angr CI
+                    options["workers"] = 0
+                # functions displayed before the job starts are queued up by prioritize_function()
+                self.main_instance.variable_recovery_job = VariableRecoveryJob(
+                    self.main_instance,
+                    **self.main_instance._analysis_configuration["varec"].to_dict(),
+                    on_variable_recovered=self.on_variable_recovered,
+                    depends_on=[prototype_job],
+                )
+                disassembly_view = self.view_manager.first_view_in_category("disassembly")
+                if disassembly_view is not None and not disassembly_view.function.am_none:
+                    self.main_instance.variable_recovery_job.prioritize_function(disassembly_view.function.addr)
+                self.job_manager.add_job(self.main_instance.variable_recovery_job)
+
+        if self.main_instance._analysis_configuration["api_deobfuscation"].enabled:
+            self.job_manager.add_job(APIDeobfuscationJob(self.main_instance, depends_on=[cfg_job]))
 
     def on_cfg_generated(self, cfg_result) -> None:
         cfg, cfb = cfg_result
@@ -262,19 +283,6 @@ class Workspace:
         self.main_instance.cfb.am_event()
         self.main_instance.cfg.am_event()
 
-        assert self.main_instance._analysis_configuration is not None
-
-        if self.main_instance._analysis_configuration["flirt"].enabled:
-            self.job_manager.add_job(
-                FlirtSignatureRecognitionJob(
-                    self.main_instance,
-                    on_finish=self._on_flirt_signature_recognized,
-                )
-            )
-
-        if self.main_instance._analysis_configuration["api_deobfuscation"].enabled:
-            self.job_manager.add_job(APIDeobfuscationJob(self.main_instance))
-
         if not self.main_instance.cfg.am_none:
             if not self._first_cfg_generation_callback_completed:
                 self._first_cfg_generation_callback_completed = True
@@ -299,39 +307,6 @@ class Workspace:
             if view is not None:
                 view.clear()
 
-    def _on_flirt_signature_recognized(self, _: Any) -> None:
-        self.job_manager.add_job(
-            PrototypeFindingJob(
-                self.main_instance,
-                on_finish=self._on_prototype_found,
-            )
-        )
-
-    def _on_prototype_found(self, _: Any) -> None:
-        if self.main_instance._analysis_configuration["code_tagging"].enabled:
-            self.job_manager.add_job(
-                CodeTaggingJob(
-                    self.main_instance,
-                    on_finish=self.on_function_tagged,
-                )
-            )
-
-        if self.main_instance._analysis_configuration["varec"].enabled:
-            options = self.main_instance._analysis_configuration["varec"].to_dict()
-            if is_testing:
-                # disable multiprocessing on angr CI
-                options["workers"] = 0
-            self.main_instance.variable_recovery_job = VariableRecoveryJob(
-                self.main_instance,
-                **self.main_instance._analysis_configuration["varec"].to_dict(),
-                on_variable_recovered=self.on_variable_recovered,
-            )
-            # prioritize the current function in display
-            disassembly_view = self.view_manager.first_view_in_category("disassembly")
-            if disassembly_view is not None and not disassembly_view.function.am_none:
-                self.main_instance.variable_recovery_job.prioritize_function(disassembly_view.function.addr)
-            self.job_manager.add_job(self.main_instance.variable_recovery_job)
-
     def _on_patch_event(self, **kwargs) -> None:
         if self.main_instance.cfg.am_none:
             return
@@ -508,6 +483,7 @@ class Workspace:
 
     def set_comment(self, addr: int, comment_text) -> None:
         self.main_instance.set_comment(addr, comment_text)
+        self.prefetcher.invalidate_disassembly()
 
         disasm_view = self._get_or_create_view("disassembly", DisassemblyView)
         if disasm_view._flow_graph.disasm is not None:
@@ -622,6 +598,24 @@ class Workspace:
             view = self._get_or_create_view("disassembly", DisassemblyView)
             view.decompile_current_function()
 
+    def decompile_functions(self, limit: int | None = None) -> None:
+        """
+        Decompile all functions, or the `limit` functions with the most callers, in the background. The decompiler
+        options of the pseudocode view are used, so that opening these functions later hits the cache.
+
+        :param limit:   The maximum number of functions to decompile.
+        """
+        if self.main_instance.project.am_none or self.main_instance.cfg.am_none:
+            return
+        view = self._get_or_create_view("pseudocode", CodeView)
+        job = BatchDecompilationJob(
+            self.main_instance,
+            view.decompiler_args(),
+            limit=limit,
+            workers=0 if is_testing else None,
+        )
+        self.job_manager.add_job(job)
+
     def view_data_dependency_graph(self, analysis_params: dict) -> None:
         view = self._get_or_create_view("data_dependency", DataDepView)
         view.analysis_params = analysis_params
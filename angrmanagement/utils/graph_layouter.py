@@ -321,6 +321,9 @@ class GraphLayouter:
         self._row_to_nodes = {}
         self._row_heights = []
         self._col_widths = []
+        self._edge_row_heights = {}
+        self._edge_col_widths = {}
+        self._col_to_nodes = {}
         self._grid_coordinates = {}
 
         self.edges: list[Edge] = []
@@ -602,38 +605,70 @@ class GraphLayouter:
         self._row_heights = [0] * (self._max_row + 2)
         self._col_widths = [0] * (self._max_col + 2)
 
-        # update grid sizes based on nodes
+        # the space that edges need in each row and column does not depend on node sizes
+        self._edge_row_heights = {}
+        self._edge_col_widths = {}
+        for (col, row), max_id in self._grid_max_horizontal_id.items():
+            if col < len(self._col_widths) and row < len(self._row_heights):
+                self._edge_row_heights[row] = max(self._edge_row_heights.get(row, 0), (max_id + 2) * self.y_margin)
+        for (col, row), max_id in self._grid_max_vertical_id.items():
+            if col < len(self._col_widths) and row < len(self._row_heights):
+                self._edge_col_widths[col] = max(self._edge_col_widths.get(col, 0), (max_id + 2) * self.x_margin)
+
+        # each node spans two columns
+        self._col_to_nodes = defaultdict(list)
         for node in self.graph.nodes():
-            col, row = self._locations[node]
+            col, _ = self._locations[node]
+            self._col_to_nodes[col].append(node)
+            self._col_to_nodes[col + 1].append(node)
+
+        for row in range(len(self._row_heights)):
+            self._row_heights[row] = self._row_height(row)
+        for col in range(len(self._col_widths)):
+            self._col_widths[col] = self._col_width(col)
+
+    def _row_height(self, row: int):
+        height = self._edge_row_heights.get(row, 0)
+        for node in self._row_to_nodes.get(row, ()):
+            height = max(height, self._node_sizes[node][1])
+        return height
+
+    def _col_width(self, col: int):
+        width = self._edge_col_widths.get(col, 0)
+        for node in self._col_to_nodes.get(col, ()):
+            width = max(width, self._node_sizes[node][0] // 2)
+        # the left-most and the right-most column do not have any node assigned to it
+        if col in (0, len(self._col_widths) - 1):
+            width = max(width, 20)
+        return width
 
-            width, height = self._node_sizes[node]
+    def update_node_sizes(self, node_sizes) -> None:
+        """
+        Lay out the graph again after the sizes of some nodes changed. Rows, columns, and edge routes only depend on
+        the structure of the graph and are kept. Only the rows and columns of the resized nodes are measured again.
 
-            if self._row_heights[row] < height:
-                self._row_heights[row] = height
+        :param node_sizes:  A new dict of node sizes. The dict that was passed in before must not have been modified.
+        """
+        rows, cols = set(), set()
+        for node in self.graph.nodes():
+            if node_sizes[node] != self._node_sizes[node]:
+                col, row = self._locations[node]
+                rows.add(row)
+                cols.update((col, col + 1))
+        self._node_sizes = node_sizes
+        if not rows:
+            return
 
-            if self._col_widths[col] < width // 2:
-                self._col_widths[col] = width // 2
-            if col + 1 < len(self._col_widths) and self._col_widths[col + 1] < width // 2:
-                self._col_widths[col + 1] = width // 2
+        for row in rows:
+            self._row_heights[row] = self._row_height(row)
+        for col in cols:
+            self._col_widths[col] = self._col_width(col)
 
-        # update grid sizes based on edges
-        for col in range(self._max_col + 2):
-            for row in range(self._max_row + 2):
-                key = (col, row)
-                if key in self._grid_max_vertical_id:
-                    col_width = (self._grid_max_vertical_id[key] + 2) * self.x_margin
-                    if self._col_widths[col] < col_width:
-                        self._col_widths[col] = col_width
-                if key in self._grid_max_horizontal_id:
-                    row_height = (self._grid_max_horizontal_id[key] + 2) * self.y_margin
-                    if self._row_heights[row] < row_height:
-                        self._row_heights[row] = row_height
-
-        # the left-most and the right-most column do not have any node assigned to it
-        if self._col_widths[0] < 20:
-            self._col_widths[0] = 20
-        if self._col_widths[-1] < 20:
-            self._col_widths[-1] = 20
+        self._grid_coordinates = {}
+        self.node_coordinates = {}
+        for edge in self.edges:
+            edge.coordinates = []
+        self._calculate_coordinates()
 
     def _set_max_grid_edge_id(self) -> None:
         """
@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+import heapq
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from .edge import Edge, EdgeSort
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import networkx
+
+
+class ScalableGraphLayouter:
+    """
+    A layered (Sugiyama-style) graph layouter for very large graphs, with the same interface as GraphLayouter.
+
+    - Cycles are broken by reversing the back edges of a depth-first search.
+    - Nodes are assigned to layers by longest path.
+    - An edge that spans several layers gets a waypoint in every layer that it passes, which reserves room for it.
+    - The order of nodes and waypoints in each layer is computed with the barycenter heuristic.
+    - x coordinates are balanced between the order of each layer and the positions of the neighbors.
+    - Horizontal edge segments in the channel between two layers are assigned to tracks by interval scheduling.
+
+    All steps are linear in the number of nodes, edges, and waypoints, except for sorting: each sweep sorts the layers,
+    and the k segments in a channel take O(k log k) to assign to tracks. GraphLayouter allocates a dense grid of all
+    rows and columns instead and scans it while routing edges, which is quadratic for large, flat graphs.
+    """
+
+    # the number of alternating down and up sweeps for crossing minimization and coordinate assignment
+    SWEEPS = 4
+
+    def __init__(
+        self,
+        graph: networkx.DiGraph,
+        node_sizes,
+        node_compare_key: Callable | None = None,
+        node_sorter: Callable | None = None,
+        x_margin: int = 10,
+        y_margin: int = 5,
+        row_margin: int = 16,
+        col_margin: int = 16,
+    ) -> None:
+        self.graph = graph
+        self._node_sizes = node_sizes
+        self._node_compare_key = node_compare_key
+        self._node_sorter = node_sorter
+
+        if self._node_compare_key and self._node_sorter:
+            raise RuntimeError("You cannot provide both node_compare_key and node_sorter.")
+
+        self.x_margin = x_margin
+        self.y_margin = y_margin
+        self.row_margin = row_margin
+        self.col_margin = col_margin
+
+        # slots are the nodes and the edge waypoints of each layer
+        self._slot_node: list = []
+        self._slot_layer: list[int] = []
+        self._slot_width: list[float] = []
+        self._slot_seed: list[float] = []
+        self._slot_x: list[float] = []
+        # neighbors of each slot in the layer above and the layer below
+        self._up: list[list[int]] = []
+        self._down: list[list[int]] = []
+        self._layers: list[list[int]] = []
+        self._node_slot = {}
+
+        # for each edge: the slots it passes through, and the channel of each hop between two slots. channel i lies
+        # between layer i and layer i + 1
+        self._edge_paths: list[tuple[Edge, list[int], list[int]]] = []
+
+        self.edges: list[Edge] = []
+        self.node_coordinates = {}
+
+        self._layout()
+
+    def _layout(self) -> None:
+        if not self.graph:
+            return
+
+        ordered_nodes, back_edges = self._break_cycles()
+        layers = self._assign_layers(ordered_nodes, back_edges)
+        self._create_slots(ordered_nodes, layers, back_edges)
+        self._order_layers()
+        self._assign_x()
+        self._route_edges()
+
+    def update_node_sizes(self, node_sizes) -> None:
+        """
+        Lay out the graph again after the sizes of some nodes changed. Layers, the order of each layer, and the
+        waypoints of edges only depend on the structure of the graph and are kept.
+        """
+        widths_changed = False
+        self._node_sizes = node_sizes
+        for node, slot in self._node_slot.items():
+            width = node_sizes[node][0]
+            if self._slot_width[slot] != width:
+                self._slot_width[slot] = width
+                widths_changed = True
+
+        self.node_coordinates = {}
+        for edge in self.edges:
+            edge.coordinates = []
+        if widths_changed:
+            self._assign_x()
+        self._route_edges()
+
+    #
+    # Layering
+    #
+
+    def _initial_order(self) -> list:
+        if self._node_sorter is not None:
+            return list(self._node_sorter(list(self.graph.nodes())))
+        if self._node_compare_key is not None:
+            return sorted(self.graph.nodes(), key=self._node_compare_key)
+        return list(self.graph.nodes())
+
+    def _break_cycles(self):
+        """
+        Run a depth-first search over the graph.
+
+        :return:    The nodes in reverse post-order, which is a topological order once the back edges are ignored, and
+                    the set of back edges.
+        """
+        initial_order = self._initial_order()
+        rank = {node: i for i, node in enumerate(initial_order)}
+        graph = self.graph
+
+        def successors(node):
+            return iter(sorted(graph.successors(node), key=rank.__getitem__))
+
+        roots = [node for node in initial_order if graph.in_degree(node) == 0]
+
+        on_stack, done = 1, 2
+        state = {}
+        postorder = []
+        back_edges = set()
+        for root in roots + initial_order:
+            if root in state:
+                continue
+            state[root] = on_stack
+            stack = [(root, successors(root))]
+            while stack:
+                node, succs = stack[-1]
+                for succ in succs:
+                    succ_state = state.get(succ)
+                    if succ_state is None:
+                        state[succ] = on_stack
+                        stack.append((succ, successors(succ)))
+                        break
+                    if succ_state == on_stack:
+                        back_edges.add((node, succ))
+                else:
+                    stack.pop()
+                    state[node] = done
+                    postorder.append(node)
+
+        postorder.reverse()
+        if self._node_compare_key is not None or self._node_sorter is not None:
+            # keep the order that was asked for within each layer
+            return initial_order, back_edges
+        return postorder, back_edges
+
+    def _assign_layers(self, ordered_nodes, back_edges) -> dict:
+        """
+        Assign each node to the lowest layer that is below all of its predecessors, ignoring back edges.
+        """
+        # ordered_nodes is not a topological order if the caller asked for a specific order, so visit the nodes in
+        # Kahn's order instead
+        layers = dict.fromkeys(ordered_nodes, 0)
+        pending_preds = {
+            node: sum(1 for pred in self.graph.predecessors(node) if (pred, node) not in back_edges)
+            for node in ordered_nodes
+        }
+        queue = [node for node in ordered_nodes if pending_preds[node] == 0]
+        while queue:
+            node = queue.pop()
+            layer = layers[node] + 1
+            for succ in self.graph.successors(node):
+                if (node, succ) in back_edges:
+                    continue
+                if layers[succ] < layer:
+                    layers[succ] = layer
+                pending_preds[succ] -= 1
+                if pending_preds[succ] == 0:
+                    queue.append(succ)
+        return layers
+
+    def _add_slot(self, node, layer: int, width: float, seed: float) -> int:
+        slot = len(self._slot_node)
+        self._slot_node.append(node)
+        self._slot_layer.append(layer)
+        self._slot_width.append(width)
+        self._slot_seed.append(seed)
+        self._up.append([])
+        self._down.append([])
+        while len(self._layers) <= layer:
+            self._layers.append([])
+        self._layers[layer].append(slot)
+        return slot
+
+    def _link(self, upper: int, lower: int) -> None:
+        self._down[upper].append(lower)
+        self._up[lower].append(upper)
+
+    def _create_slots(self, ordered_nodes, layers: dict, back_edges) -> None:
+        for seed, node in enumerate(ordered_nodes):
+            self._node_slot[node] = self._add_slot(node, layers[node], self._node_sizes[node][0], seed)
+
+        for src, dst, data in self.graph.edges(data=True):
+            sort = EdgeSort.EXCEPTION_EDGE if data.get("type", None) == "exception" else None
+            edge = Edge(src, dst, sort=sort)
+            src_slot, dst_slot = self._node_slot[src], self._node_slot[dst]
+            src_layer, dst_layer = layers[src], layers[dst]
+            # waypoints start out next to the source node
+            seed = self._slot_seed[src_slot] + 0.5
+
+            path = [src_slot]
+            if (src, dst) in back_edges:
+                # leave the source downwards, go up next to all layers up to the destination, and enter the
+                # destination from above
+                channels = list(range(src_layer, dst_layer - 2, -1))
+                prev = None
+                for layer in range(src_layer, dst_layer - 1, -1):
+                    waypoint = self._add_slot(None, layer, self.x_margin, seed)
+                    if prev is not None:
+                        self._link(waypoint, prev)
+                    path.append(waypoint)
+                    prev = waypoint
+            else:
+                channels = list(range(src_layer, dst_layer))
+                prev = src_slot
+                for layer in range(src_layer + 1, dst_layer):
+                    waypoint = self._add_slot(None, layer, self.x_margin, seed)
+                    self._link(prev, waypoint)
+                    path.append(waypoint)
+                    prev = waypoint
+                self._link(prev, dst_slot)
+            path.append(dst_slot)
+
+            self._edge_paths.append((edge, path, channels))
+            self.edges.append(edge)
+
+        for layer in self._layers:
+            layer.sort(key=self._slot_seed.__getitem__)
+
+    #
+    # Ordering and coordinates
+    #
+
+    def _sweeps(self):
+        """
+        Yield the layers to process and the neighbors to consider, alternating between downward and upward sweeps.
+        """
+        layer_count = len(self._layers)
+        for i in range(self.SWEEPS):
+            if i % 2 == 0:
+                for layer_idx in range(1, layer_count):
+                    yield self._layers[layer_idx], self._up
+            else:
+                for layer_idx in range(layer_count - 2, -1, -1):
+                    yield self._layers[layer_idx], self._down
+
+    def _order_layers(self) -> None:
+        """
+        Reduce edge crossings by ordering each layer by the barycenters of the neighbors of its slots.
+        """
+        pos = [0.0] * len(self._slot_node)
+        for layer in self._layers:
+            for i, slot in enumerate(layer):
+                pos[slot] = i
+
+        for layer, neighbors in self._sweeps():
+            keys = {}
+            for slot in layer:
+                slot_neighbors = neighbors[slot]
+                if slot_neighbors:
+                    keys[slot] = sum(pos[n] for n in slot_neighbors) / len(slot_neighbors)
+                else:
+                    keys[slot] = pos[slot]
+            layer.sort(key=keys.__getitem__)
+            for i, slot in enumerate(layer):
+                pos[slot] = i
+
+    def _separation(self, a: int, b: int) -> float:
+        gap = self.col_margin if self._slot_node[a] is not None and self._slot_node[b] is not None else self.x_margin
+        return (self._slot_width[a] + self._slot_width[b]) / 2 + gap
+
+    def _place_layer(self, layer: list[int], desired: list[float]) -> None:
+        """
+        Place the slots of a layer as close to their desired x coordinates as their order and sizes permit.
+        """
+        x = self._slot_x
+        count = len(layer)
+        # push overlapping slots to the right, and, separately, to the left. the average of both placements keeps
+        # the required separations
+        right = list(desired)
+        for i in range(1, count):
+            right[i] = max(right[i], right[i - 1] + self._separation(layer[i - 1], layer[i]))
+        left = list(desired)
+        for i in range(count - 2, -1, -1):
+            left[i] = min(left[i], left[i + 1] - self._separation(layer[i], layer[i + 1]))
+        for i, slot in enumerate(layer):
+            x[slot] = (left[i] + right[i]) / 2
+
+    def _assign_x(self) -> None:
+        """
+        Assign x coordinates to the centers of all slots.
+        """
+        self._slot_x = [0.0] * len(self._slot_node)
+        for layer in self._layers:
+            self._place_layer(layer, [0.0] * len(layer))
+
+        x = self._slot_x
+        for layer, neighbors in self._sweeps():
+            desired = []
+            for slot in layer:
+                slot_neighbors = neighbors[slot]
+                if slot_neighbors:
+                    desired.append(sum(x[n] for n in slot_neighbors) / len(slot_neighbors))
+                else:
+                    desired.append(x[slot])
+            self._place_layer(layer, desired)
+
+        leftmost = min(x[slot] - self._slot_width[slot] / 2 for slot in range(len(x)))
+        shift = self.col_margin * 2 - leftmost
+        for slot in range(len(x)):
+            x[slot] += shift
+
+    #
+    # Edge routing
+    #
+
+    def _assign_ports(self) -> list[list[float]]:
+        """
+        Spread the edges that leave or enter a node along its bottom or top border, sorted by the direction that they
+        go to, and compute the x coordinates of all slots along each edge.
+        """
+        x = self._slot_x
+        out_edges = defaultdict(list)
+        in_edges = defaultdict(list)
+        for i, (_, path, _) in enumerate(self._edge_paths):
+            out_edges[path[0]].append((x[path[1]], i))
+            in_edges[path[-1]].append((x[path[-2]], i))
+
+        xs = [[x[slot] for slot in path] for _, path, _ in self._edge_paths]
+        for ports, is_out in ((out_edges, True), (in_edges, False)):
+            for slot, items in ports.items():
+                items.sort()
+                max_idx = len(items) - 1
+                for idx, (_, edge_idx) in enumerate(items):
+                    edge = self._edge_paths[edge_idx][0]
+                    port_x = x[slot] + (idx - max_idx / 2) * self.x_margin
+                    if is_out:
+                        edge.start_index, edge.max_start_index = idx, max_idx
+                        xs[edge_idx][0] = port_x
+                    else:
+                        edge.end_index, edge.max_end_index = idx, max_idx
+                        xs[edge_idx][-1] = port_x
+        return xs
+
+    def _assign_tracks(self, xs: list[list[float]]) -> tuple[dict, dict]:
+        """
+        Assign the horizontal segments in each channel to tracks, such that segments on the same track do not overlap.
+
+        :return:    The track of each segment, keyed by (edge index, hop index), and the number of tracks per channel.
+        """
+        segments = defaultdict(list)
+        for edge_idx, (_, _, channels) in enumerate(self._edge_paths):
+            edge_xs = xs[edge_idx]
+            for hop, channel in enumerate(channels):
+                x0, x1 = edge_xs[hop], edge_xs[hop + 1]
+                if x0 != x1:
+                    segments[channel].append((min(x0, x1), max(x0, x1), edge_idx, hop))
+
+        tracks = {}
+        track_counts = {}
+        for channel, channel_segments in segments.items():
+            channel_segments.sort()
+            # (end of the segment that occupies the track, track)
+            occupied: list[tuple[float, int]] = []
+            free: list[int] = []
+            track_count = 0
+            for start, end, edge_idx, hop in channel_segments:
+                while occupied and occupied[0][0] + self.x_margin <= start:
+                    heapq.heappush(free, heapq.heappop(occupied)[1])
+                if free:
+                    track = heapq.heappop(free)
+                else:
+                    track = track_count
+                    track_count += 1
+                heapq.heappush(occupied, (end, track))
+                tracks[(edge_idx, hop)] = track
+            track_counts[channel] = track_count
+        return tracks, track_counts
+
+    def _route_edges(self) -> None:
+        xs = self._assign_ports()
+        tracks, track_counts = self._assign_tracks(xs)
+
+        # y coordinates of layers and channels
+        layer_heights = [0.0] * len(self._layers)
+        for node, slot in self._node_slot.items():
+            layer = self._slot_layer[slot]
+            layer_heights[layer] = max(layer_heights[layer], self._node_sizes[node][1])
+
+        def channel_height(channel: int) -> float:
+            return self.row_margin * 2 + max(track_counts.get(channel, 0) - 1, 0) * self.y_margin
+
+        channel_tops = {-1: self.row_margin}
+        layer_tops = []
+        y = self.row_margin + channel_height(-1)
+        for layer, height in enumerate(layer_heights):
+            layer_tops.append(y)
+            y += height
+            channel_tops[layer] = y
+            y += channel_height(layer)
+
+        # nodes
+        for node, slot in self._node_slot.items():
+            width, height = self._node_sizes[node]
+            layer = self._slot_layer[slot]
+            self.node_coordinates[node] = (
+                self._slot_x[slot] - width / 2,
+                layer_tops[layer] + (layer_heights[layer] - height) / 2,
+            )
+
+        # edges
+        for edge_idx, (edge, _, channels) in enumerate(self._edge_paths):
+            edge_xs = xs[edge_idx]
+            src_y = self.node_coordinates[edge.src][1] + self._node_sizes[edge.src][1]
+            dst_y = self.node_coordinates[edge.dst][1]
+
+            edge.add_coordinate(edge_xs[0], src_y)
+            for hop, channel in enumerate(channels):
+                track = tracks.get((edge_idx, hop), 0)
+                y = channel_tops[channel] + self.row_margin + track * self.y_margin
+                edge.add_coordinate(edge_xs[hop], y)
+                edge.add_coordinate(edge_xs[hop + 1], y)
+            edge.add_coordinate(edge_xs[-1], dst_y - 6)
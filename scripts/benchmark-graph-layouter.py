@@ -0,0 +1,126 @@
+"""
+Benchmark the graph layouters on synthetic control flow graphs.
+
+Usage: python scripts/benchmark-graph-layouter.py [--sizes 100,1000,20000] [--shape cfg|flattened] [--memory]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+import networkx
+
+from angrmanagement.utils.scalable_graph_layouter import ScalableGraphLayouter
+
+
+class Node:
+    """
+    A basic block of a synthetic function.
+    """
+
+    __slots__ = ("addr", "idx")
+
+    def __init__(self, addr: int) -> None:
+        self.addr = addr
+        self.idx = None
+
+    def __repr__(self) -> str:
+        return f"<Node {self.addr:#x}>"
+
+
+def synthetic_cfg(size: int, seed: int) -> networkx.DiGraph:
+    """
+    A function with fall-through edges, forward conditional branches, loops, and the occasional switch.
+    """
+    rng = random.Random(seed)
+    nodes = [Node(0x400000 + i * 0x20) for i in range(size)]
+    graph = networkx.DiGraph()
+    graph.add_nodes_from(nodes)
+    for i in range(size - 1):
+        graph.add_edge(nodes[i], nodes[i + 1])
+        r = rng.random()
+        if r < 0.3:
+            graph.add_edge(nodes[i], nodes[min(i + rng.randint(2, 20), size - 1)])
+        elif r < 0.35:
+            graph.add_edge(nodes[i], nodes[max(i - rng.randint(1, 50), 0)])
+        elif r < 0.36:
+            for _ in range(rng.randint(5, 20)):
+                graph.add_edge(nodes[i], nodes[min(i + rng.randint(2, 100), size - 1)])
+    return graph
+
+
+def flattened_cfg(size: int, seed: int) -> networkx.DiGraph:
+    """
+    A function whose control flow has been flattened: every block returns to a single dispatcher.
+    """
+    rng = random.Random(seed)
+    nodes = [Node(0x400000 + i * 0x20) for i in range(size)]
+    graph = networkx.DiGraph()
+    graph.add_nodes_from(nodes)
+    entry, dispatcher = nodes[0], nodes[1]
+    graph.add_edge(entry, dispatcher)
+    for node in nodes[2:]:
+        graph.add_edge(dispatcher, node)
+        graph.add_edge(node, dispatcher)
+        if rng.random() < 0.1:
+            graph.add_edge(node, rng.choice(nodes[2:]))
+    return graph
+
+
+def node_sizes(graph: networkx.DiGraph, seed: int) -> dict:
+    rng = random.Random(seed)
+    return {node: (rng.randint(100, 400), rng.randint(20, 300)) for node in graph}
+
+
+def run(layouter_cls, graph, sizes, measure_memory: bool) -> tuple[float, float | None]:
+    gc.collect()
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    layouter_cls(graph, sizes)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="100,500,1000,2000,5000,10000,20000")
+    ap.add_argument("--shape", choices=["cfg", "flattened"], default="cfg")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--memory", action="store_true", help="Measure peak memory usage (slows down the layouters)")
+    ap.add_argument(
+        "--legacy-max-nodes", type=int, default=5000, help="Do not run GraphLayouter on graphs larger than this"
+    )
+    args = ap.parse_args()
+
+    layouters = [("ScalableGraphLayouter", ScalableGraphLayouter, None)]
+    try:
+        from angrmanagement.utils.graph_layouter import GraphLayouter  # pylint:disable=import-outside-toplevel
+    except ImportError as ex:
+        print(f"Skipping GraphLayouter: {ex}")
+    else:
+        layouters.append(("GraphLayouter", GraphLayouter, args.legacy_max_nodes))
+
+    generate = synthetic_cfg if args.shape == "cfg" else flattened_cfg
+    print(f"{'nodes':>8} {'edges':>8}  {'layouter':<22} {'seconds':>9} {'peak MiB':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        graph = generate(size, args.seed)
+        sizes = node_sizes(graph, args.seed)
+        for name, layouter_cls, max_nodes in layouters:
+            if max_nodes is not None and size > max_nodes:
+                continue
+            elapsed, peak = run(layouter_cls, graph, sizes, args.memory)
+            peak_str = f"{peak:9.1f}" if peak is not None else f"{'-':>9}"
+            print(f"{graph.number_of_nodes():>8} {graph.number_of_edges():>8}  {name:<22} {elapsed:9.3f} {peak_str}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import re
+import unittest
+
+from sortedcontainers import SortedDict
+
+from angrmanagement.data.code_highlighting import CodeHighlighting
+
+
+class FakeElement:
+    """
+    A position mapping element.
+    """
+
+    def __init__(self, start, length, obj):
+        self.start = start
+        self.length = length
+        self.obj = obj
+
+    def __contains__(self, pos):
+        return self.start <= pos < self.start + self.length
+
+
+class FakePositionMapping:
+    """
+    A position mapping of identifiers, which are the words that do not start with "k". The nodes of identifiers that
+    start with "c" or "f" are functions, and the others are variables.
+    """
+
+    def __init__(self, text):
+        self._posmap = SortedDict()
+        for m in re.finditer(r"\b[a-jl-z]\w*", text):
+            obj = "function" if m.group()[0] in "cf" else "variable"
+            self._posmap[m.start()] = FakeElement(m.start(), m.end() - m.start(), obj)
+
+    def get_element(self, pos):
+        try:
+            pre = next(self._posmap.irange(maximum=pos, reverse=True))
+        except StopIteration:
+            return None
+        element = self._posmap[pre]
+        return element if pos in element else None
+
+
+RULES = [(r"\bkif\b", "keyword"), (r"\bkreturn\b", "keyword")]
+
+TEXT = """int func(int a) {
+    /* a comment
+       about b */ kif (a) {
+        // a line comment
+        call("a \\" string");
+    }
+    kreturn a;
+}"""
+
+
+def _highlighting(text):
+    return CodeHighlighting(text, FakePositionMapping(text), lambda obj: obj, RULES)
+
+
+class CodeHighlightingTests(unittest.TestCase):
+    """
+    Test cases for CodeHighlighting
+    """
+
+    def test_lines(self):
+        highlighting = _highlighting(TEXT)
+        assert len(highlighting) == 8
+        assert highlighting.line(0) == ((0, 3, "variable"), (4, 4, "function"), (9, 3, "variable"), (13, 1, "variable"))
+        assert highlighting.line(1) == ((4, 12, "comment"),)
+        assert highlighting.line(2) == ((0, 17, "comment"), (23, 1, "variable"), (18, 3, "keyword"))
+        assert highlighting.line(3) == ((8, 17, "comment"),)
+        assert highlighting.line(4) == ((13, 13, "quotation"), (8, 4, "function"))
+        assert highlighting.line(6) == ((12, 1, "variable"), (4, 7, "keyword"))
+        assert highlighting.line(8) == ()
+
+    def test_update(self):
+        highlighting = _highlighting(TEXT)
+        renamed = TEXT.replace("call", "callee")
+        highlighting.update(renamed, FakePositionMapping(renamed))
+        assert highlighting.highlighted_lines == 1
+        assert highlighting.line(4) == ((15, 13, "quotation"), (8, 6, "function"))
+        assert highlighting.line(6) == ((12, 1, "variable"), (4, 7, "keyword"))
+
+        # lines that are inserted in a comment are highlighted, and so are the lines that follow them
+        inserted = renamed.replace("/* a comment", "/* a\n comment")
+        highlighting.update(inserted, FakePositionMapping(inserted))
+        assert highlighting.highlighted_lines == 2
+        assert highlighting.line(2) == ((0, 8, "comment"),)
+        assert highlighting.line(7) == ((12, 1, "variable"), (4, 7, "keyword"))
+
+        # a block comment that is not closed anymore changes all the lines after it
+        unclosed = inserted.replace("about b */", "about b")
+        highlighting.update(unclosed, FakePositionMapping(unclosed))
+        assert highlighting.highlighted_lines == len(highlighting) - 3
+        assert highlighting.line(8) == ((0, 1, "comment"),)
+
+
+if __name__ == "__main__":
+    unittest.main()
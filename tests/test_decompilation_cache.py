@@ -0,0 +1,85 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+
+from angrmanagement.data.decompilation_cache import DecompilationDiskCache
+from angrmanagement.data.object_container import ObjectContainer
+
+
+class FakeLabels(dict):
+    """
+    Labels that count how often they are listed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.listed = 0
+
+    def items(self):
+        self.listed += 1
+        return super().items()
+
+
+class FakeVariableManager:
+    """
+    A variable manager without variables.
+    """
+
+    def get_variables(self):
+        return []
+
+
+class FakeTypes:
+    """
+    A types store with user-defined types.
+    """
+
+    def __init__(self):
+        self.types = []
+
+    def iter_own(self):
+        return iter(self.types)
+
+
+class TestDecompilationDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.kb = SimpleNamespace(
+            labels=FakeLabels({0x1000: "main"}),
+            variables={"global": FakeVariableManager()},
+            types=FakeTypes(),
+        )
+        self.instance = SimpleNamespace(
+            project=ObjectContainer(None, "project"),
+            cfg=ObjectContainer(None, "cfg"),
+            kb=self.kb,
+            pseudocode_variable_kb=None,
+        )
+        self.disk_cache = DecompilationDiskCache(self.instance)
+
+    def test_globals_digest_is_kept_until_invalidated(self):
+        digest = self.disk_cache.globals_digest()
+        assert self.disk_cache.globals_digest() == digest
+        assert self.kb.labels.listed == 1
+
+        self.kb.labels[0x1000] = "renamed"
+        self.disk_cache.invalidate_globals_digest()
+        renamed_digest = self.disk_cache.globals_digest()
+        assert renamed_digest != digest
+        assert self.kb.labels.listed == 2
+
+        # CFG updates invalidate the digest as well
+        self.kb.labels[0x2000] = "sub_2000"
+        self.instance.cfg.am_event()
+        assert self.disk_cache.globals_digest() != renamed_digest
+
+    def test_types_are_hashed_every_time(self):
+        digest = self.disk_cache.globals_digest()
+        self.kb.types.types.append(SimpleNamespace(name="my_struct", type="struct my_struct { int a; }"))
+        assert self.disk_cache.globals_digest() != digest
+        assert self.kb.labels.listed == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
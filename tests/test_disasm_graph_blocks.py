@@ -0,0 +1,77 @@
+# pylint:disable=missing-class-docstring,wrong-import-order
+from __future__ import annotations
+
+import unittest
+
+import angr
+from common import AngrManagementTestCase
+
+from angrmanagement.config import Conf
+from angrmanagement.ui.views import DisassemblyView
+
+# f: xor rax, rax; test rdi, rdi; je +5; mov eax, 1; ret
+# g: call f; ret
+SHELLCODE = bytes.fromhex("4831c04885ff7405b801000000c3e8edffffffc3")
+LOAD_ADDRESS = 0x400000
+
+
+class TestDisasmGraphBlocks(AngrManagementTestCase):
+    def setUp(self):
+        super().setUp()
+        self._materialized_blocks = Conf.disasm_graph_materialized_blocks
+
+        instance = self.main.workspace.main_instance
+        instance.project.am_obj = angr.load_shellcode(
+            SHELLCODE, arch="amd64", start_offset=0, load_address=LOAD_ADDRESS
+        )
+        instance.project.am_event()
+        self.main.workspace.job_manager.join_all_jobs(wait_period=0.5)
+        self.func = instance.kb.functions[LOAD_ADDRESS]
+        self.view = self.main.workspace._get_or_create_view("disassembly", DisassemblyView)
+        self.view.display_disasm_graph()
+        self.graph = self.view._flow_graph
+
+    def tearDown(self):
+        Conf.disasm_graph_materialized_blocks = self._materialized_blocks
+        super().tearDown()
+
+    def _dematerialize_all(self) -> None:
+        self.graph._materialized_blocks = self.graph._create_materialized_block_cache(1)
+        for block in self.graph.blocks:
+            block.dematerialize()
+
+    def test_blocks_are_measured_and_kept_in_the_cache(self):
+        Conf.disasm_graph_materialized_blocks = 1
+        self.view.display_function(self.func)
+        blocks = self.graph.blocks
+        assert len(blocks) > 1
+        assert all(not block.boundingRect().isEmpty() for block in blocks)
+        # instruction addresses are known without materializing the blocks
+        insn_addrs = {addr for block in self.func.blocks for addr in block.instruction_addrs}
+        assert {addr for block in blocks for addr in block.insn_addrs} == insn_addrs
+
+        # looking up instructions materializes blocks through the cache, which dematerializes the other blocks
+        self._dematerialize_all()
+        for block in blocks:
+            assert block.addr_to_insns
+        assert list(self.graph._materialized_blocks) == [blocks[-1]]
+        assert [block for block in blocks if block._materialized] == [blocks[-1]]
+
+    def test_visible_blocks_do_not_evict_each_other(self):
+        Conf.disasm_graph_materialized_blocks = 1
+        self.view.display_function(self.func)
+        self._dematerialize_all()
+
+        # show the whole function. the view is hidden, so its layout is not updated when it is resized
+        self.graph.viewport().resize(1000, 1000)
+        self.graph.centerOn(self.graph.scene().itemsBoundingRect().center())
+        self.graph._update_block_details()
+        rect = self.graph.mapToScene(self.graph.viewport().rect()).boundingRect()
+        visible = [block for block in self.graph.blocks if rect.intersects(block.sceneBoundingRect())]
+        assert len(visible) > 1
+        assert self.graph._materialized_blocks.maxsize >= len(visible)
+        assert all(block._materialized for block in visible)
+
+
+if __name__ == "__main__":
+    unittest.main()
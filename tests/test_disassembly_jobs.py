@@ -0,0 +1,125 @@
+# pylint:disable=missing-class-docstring,wrong-import-order
+from __future__ import annotations
+
+import time
+import unittest
+
+import angr
+from common import AngrManagementTestCase
+from PySide6.QtWidgets import QApplication
+
+from angrmanagement.config import Conf
+from angrmanagement.data.jobs import DisassembleFunctionJob
+from angrmanagement.data.jobs.job import JobPriority, JobState
+from angrmanagement.ui.views import DisassemblyView
+from angrmanagement.ui.widgets.qdisasm_base_control import DisassemblyLevel
+
+# f: xor rax, rax; test rdi, rdi; je +5; mov eax, 1; ret
+# g: call f; ret
+SHELLCODE = bytes.fromhex("4831c04885ff7405b801000000c3e8edffffffc3")
+LOAD_ADDRESS = 0x400000
+
+
+class TestDisassemblyJobs(AngrManagementTestCase):
+    def setUp(self):
+        super().setUp()
+        self._graph_threshold = Conf.disasm_graph_async_threshold
+        self._linear_threshold = Conf.disasm_linear_async_threshold
+
+        instance = self.main.workspace.main_instance
+        instance.project.am_obj = angr.load_shellcode(
+            SHELLCODE, arch="amd64", start_offset=0, load_address=LOAD_ADDRESS
+        )
+        instance.project.am_event()
+        self.main.workspace.job_manager.join_all_jobs(wait_period=0.5)
+        self.func = instance.kb.functions[LOAD_ADDRESS]
+        self.view = self.main.workspace._get_or_create_view("disassembly", DisassemblyView)
+
+    def tearDown(self):
+        Conf.disasm_graph_async_threshold = self._graph_threshold
+        Conf.disasm_linear_async_threshold = self._linear_threshold
+        super().tearDown()
+
+    def _wait_for(self, condition, timeout: float = 30.0) -> None:
+        deadline = time.time() + timeout
+        while not condition():
+            assert time.time() < deadline, "Timed out"
+            # sleep in Python, so that the job worker threads can run
+            QApplication.processEvents()
+            time.sleep(0.02)
+
+    def test_graph_is_prepared_by_a_job(self):
+        Conf.disasm_graph_async_threshold = 0
+        graph = self.view._flow_graph
+        self.view.display_disasm_graph()
+        self.view.display_function(self.func)
+
+        # the placeholder is shown until the job has disassembled the function and the graph is laid out
+        assert isinstance(graph._prepare_job, DisassembleFunctionJob)
+        assert graph._placeholder is not None
+        assert not graph.blocks
+
+        self._wait_for(lambda: graph._placeholder is None)
+        assert graph._prepare_job is None
+        assert graph.disasm is not None
+        assert {block.addr for block in graph.blocks} == set(self.func.block_addrs_set)
+        assert all(block.scene() is graph.scene() for block in graph.blocks)
+
+    def test_stale_graph_job_is_discarded(self):
+        Conf.disasm_graph_async_threshold = 0
+        graph = self.view._flow_graph
+        self.view.display_disasm_graph()
+        self.view.display_function(self.func)
+        stale_job = graph._prepare_job
+
+        # reloading again before the job has finished prepares the graph right away
+        Conf.disasm_graph_async_threshold = self._graph_threshold
+        graph.reload()
+        blocks = list(graph.blocks)
+        assert blocks
+        assert graph._placeholder is None
+        assert stale_job.state in (JobState.CANCELLED, JobState.FINISHED)
+
+        self.main.workspace.job_manager.join_all_jobs(wait_period=0.2)
+        self._wait_for(lambda: not self.main.workspace.job_manager.jobs)
+        # the result of the stale job does not replace the current graph
+        assert graph.blocks == blocks
+        assert graph._placeholder is None
+
+    def test_linear_view_lifts_with_a_job(self):
+        Conf.disasm_linear_async_threshold = 0
+        linear = self.view._linear_viewer
+        self.view.display_linear_viewer()
+        self.view.set_disassembly_level(DisassemblyLevel.AIL)
+
+        # the block is shown as a placeholder until the function is lifted
+        assert linear._get_disasm(self.func, self.func.addr) is None
+        assert linear._placeholders[self.func.addr] == {self.func.addr}
+        # functions are lifted one at a time. the neighbors of the displayed range may be lifted first
+        if linear._disasm_job.function is self.func:
+            assert linear._disasm_job.priority == JobPriority.INTERACTIVE
+        else:
+            assert linear._disasm_queue[0] == self.func.addr
+
+        self._wait_for(lambda: self.func.addr not in linear._placeholders)
+        disasm = linear._ail_disasms[self.func.addr]
+        assert disasm is not None
+        assert linear._get_disasm(self.func, self.func.addr) is disasm
+
+    def test_stale_linear_job_is_discarded(self):
+        Conf.disasm_linear_async_threshold = 0
+        linear = self.view._linear_viewer
+        self.view.display_linear_viewer()
+        self.view.set_disassembly_level(DisassemblyLevel.AIL)
+        assert linear._get_disasm(self.func, self.func.addr) is None
+
+        # switching the disassembly level resets the view
+        self.view.set_disassembly_level(DisassemblyLevel.MachineCode)
+        assert linear._disasm_job is None
+        assert not linear._placeholders
+        self._wait_for(lambda: not self.main.workspace.job_manager.jobs)
+        assert self.func.addr not in linear._ail_disasms
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import unittest
+
+import networkx
+
+from angrmanagement.data.graph_layout_cache import GraphLayoutCache, graph_fingerprint
+from angrmanagement.utils.scalable_graph_layouter import ScalableGraphLayouter
+
+
+class Node:
+    """
+    A basic block.
+    """
+
+    def __init__(self, addr: int) -> None:
+        self.addr = addr
+        self.idx = None
+
+
+class GraphLayoutCacheTests(unittest.TestCase):
+    """
+    Test cases for GraphLayoutCache
+    """
+
+    def _graph(self):
+        nodes = [Node(0x1000 + i * 0x10) for i in range(5)]
+        graph = networkx.DiGraph()
+        graph.add_edges_from([(nodes[0], nodes[1]), (nodes[0], nodes[2]), (nodes[1], nodes[3]), (nodes[2], nodes[3])])
+        graph.add_edge(nodes[3], nodes[4])
+        return graph, dict.fromkeys(graph, (50, 30))
+
+    def _factory(self, calls):
+        def factory(graph, node_sizes):
+            calls.append(graph)
+            return ScalableGraphLayouter(graph, node_sizes)
+
+        return factory
+
+    def test_fingerprint(self):
+        graph_0, _ = self._graph()
+        graph_1, _ = self._graph()
+        assert graph_fingerprint(0x1000, graph_0) == graph_fingerprint(0x1000, graph_1)
+        assert graph_fingerprint(0x1000, graph_0) != graph_fingerprint(0x2000, graph_0)
+        graph_1.remove_edge(*next(iter(graph_1.edges)))
+        assert graph_fingerprint(0x1000, graph_0) != graph_fingerprint(0x1000, graph_1)
+
+    def test_hit(self):
+        calls = []
+        cache = GraphLayoutCache()
+        graph_0, sizes_0 = self._graph()
+        coords_0, edges_0 = cache.layout(0x1000, graph_0, sizes_0, self._factory(calls))
+
+        # the same structure in new objects is served from the cache
+        graph_1, sizes_1 = self._graph()
+        coords_1, edges_1 = cache.layout(0x1000, graph_1, sizes_1, self._factory(calls))
+        assert len(calls) == 1
+        assert coords_0 == coords_1
+        assert all(edge.src in graph_1 and edge.dst in graph_1 for edge in edges_1)
+        assert [e.coordinates for e in edges_0] == [e.coordinates for e in edges_1]
+
+    def test_node_sizes_changed(self):
+        calls = []
+        cache = GraphLayoutCache()
+        graph, sizes = self._graph()
+        cache.layout(0x1000, graph, sizes, self._factory(calls))
+
+        sizes = dict(sizes)
+        sizes[next(iter(graph))] = (300, 200)
+        coords, _ = cache.layout(0x1000, graph, sizes, self._factory(calls))
+        # the layouter of the graph is updated instead of creating a new one
+        assert len(calls) == 1
+        expected = ScalableGraphLayouter(graph, sizes).node_coordinates
+        assert coords == {(n.addr, n.idx): c for n, c in expected.items()}
+
+    def test_serialization(self):
+        calls = []
+        cache = GraphLayoutCache()
+        graph, sizes = self._graph()
+        coords, edges = cache.layout(0x1000, graph, sizes, self._factory(calls))
+
+        restored = GraphLayoutCache()
+        restored.loads(cache.dumps())
+        assert len(restored) == 1
+        coords_r, edges_r = restored.layout(0x1000, graph, sizes, self._factory(calls))
+        assert len(calls) == 1
+        assert coords == coords_r
+        assert [e.coordinates for e in edges] == [e.coordinates for e in edges_r]
+
+        # garbage is ignored
+        restored.loads("not json")
+        assert len(restored) == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# pylint:disable=missing-class-docstring,wrong-import-order
+from __future__ import annotations
+
+import unittest
+
+import angr
+from common import AngrManagementTestCase
+
+from angrmanagement.data.jobs import IndexSymbolsJob
+from angrmanagement.data.symbol_index import SymbolIndex
+
+# f: xor rax, rax; test rdi, rdi; je +5; mov eax, 1; ret
+# g: call f; ret
+SHELLCODE = bytes.fromhex("4831c04885ff7405b801000000c3e8edffffffc3")
+LOAD_ADDRESS = 0x400000
+
+
+class TestIndexSymbolsJob(AngrManagementTestCase):
+    def setUp(self):
+        super().setUp()
+        self.instance = self.main.workspace.main_instance
+        self.instance.project.am_obj = angr.load_shellcode(
+            SHELLCODE, arch="amd64", start_offset=0, load_address=LOAD_ADDRESS
+        )
+        self.instance.project.am_event()
+        self.job_manager = self.main.workspace.job_manager
+        self.job_manager.join_all_jobs(wait_period=0.5)
+
+        self.index_jobs = []
+        self.job_manager.job_added.connect(self._on_job_added)
+
+    def _on_job_added(self, job) -> None:
+        if isinstance(job, IndexSymbolsJob):
+            self.index_jobs.append(job)
+
+    def test_update_is_queued_while_indexing(self):
+        self.instance.update_indexes_async()
+        self.instance.kb.labels[LOAD_ADDRESS] = "renamed"
+        # the pending job may have read the labels already, so another update follows it
+        self.instance.update_indexes_async(rebuild_references=True)
+        assert len(self.index_jobs) == 1
+        assert self.instance._indexes_outdated
+
+        self.job_manager.join_all_jobs(wait_period=0.5)
+        assert len(self.index_jobs) == 2
+        assert self.index_jobs[1].rebuild_references
+        assert self.instance._index_job is None
+        symbol = self.instance.symbol_index.get(SymbolIndex.FUNCTION, LOAD_ADDRESS)
+        assert symbol is not None and symbol.caption == "renamed"
+
+    def test_index_job_waits_for_the_cfg(self):
+        self.main.workspace.generate_cfg()
+        self.instance.update_indexes_async()
+        cfg_jobs = self.instance._cfg_jobs()
+        assert cfg_jobs
+        assert self.index_jobs[-1].dependencies == cfg_jobs
+        self.job_manager.join_all_jobs(wait_period=0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
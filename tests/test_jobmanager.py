@@ -0,0 +1,66 @@
+# pylint:disable=missing-class-docstring,no-self-use
+from __future__ import annotations
+
+import unittest
+
+from common import create_qapp
+
+from angrmanagement.data.jobs.job import Job, JobState
+from angrmanagement.logic.jobmanager import JobManager
+
+
+class SuspendingJob(Job):
+    """
+    A job that is asked to suspend the first time it runs.
+    """
+
+    def __init__(self, cancel_after_checkpoint: bool = False) -> None:
+        super().__init__("Suspending job")
+        self.preemptible = True
+        self.runs = 0
+        self.cancel_after_checkpoint = cancel_after_checkpoint
+
+    def run(self, ctx):
+        self.runs += 1
+        if self.runs == 1:
+            self.suspend_requested = True
+            try:
+                ctx.checkpoint()
+            finally:
+                if self.cancel_after_checkpoint:
+                    # the job is cancelled after the checkpoint raised, but before the worker handles the suspension
+                    self.state = JobState.CANCELLED
+        return self.runs
+
+
+class TestJobManager(unittest.TestCase):
+    def setUp(self):
+        create_qapp()
+        self.job_manager = JobManager(None, worker_count=1)
+
+    def tearDown(self):
+        self.job_manager.quit()
+
+    def test_suspended_job_resumes(self):
+        job = SuspendingJob()
+        self.job_manager.add_job(job)
+        self.job_manager.join_all_jobs(wait_period=0.2)
+
+        assert job.state == JobState.FINISHED
+        assert job.runs == 2
+        assert job.suspend_count == 1
+        assert job.result == 2
+
+    def test_job_cancelled_while_suspending_is_dropped(self):
+        job = SuspendingJob(cancel_after_checkpoint=True)
+        self.job_manager.add_job(job)
+        self.job_manager.join_all_jobs(wait_period=0.2)
+
+        assert job.state == JobState.CANCELLED
+        assert job.runs == 1
+        assert job.suspend_count == 0
+        assert job not in self.job_manager.jobs
+
+
+if __name__ == "__main__":
+    unittest.main()
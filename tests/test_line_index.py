@@ -0,0 +1,73 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import random
+import unittest
+
+from angrmanagement.data.line_index import LineIndex
+
+
+class LineIndexTests(unittest.TestCase):
+    """
+    Test cases for LineIndex
+    """
+
+    def test_empty(self):
+        index = LineIndex()
+        assert len(index) == 0
+        assert index.total_lines == 0
+        assert index.line_of(0x1000) == 0
+        assert index.locate(0) is None
+
+    def test_line_of(self):
+        index = LineIndex([(0x100, 3), (0x110, 1), (0x120, 5)])
+        assert index.total_lines == 9
+        assert index.line_of(0x100) == 0
+        assert index.line_of(0x110) == 3
+        assert index.line_of(0x118) == 3
+        assert index.line_of(0x120) == 4
+        assert index.line_of(0x50) == 0
+
+    def test_locate(self):
+        index = LineIndex([(0x100, 3), (0x110, 0), (0x120, 5)])
+        assert index.locate(0) == (0x100, 0)
+        assert index.locate(2) == (0x100, 2)
+        assert index.locate(3) == (0x120, 0)
+        assert index.locate(7) == (0x120, 4)
+        # past the end
+        assert index.locate(10) == (0x120, 7)
+
+    def test_set_lines(self):
+        index = LineIndex([(0x100, 3), (0x110, 1), (0x120, 5)])
+        index.set_lines(0x110, 4)
+        assert index.lines(0x110) == 4
+        assert index.line_of(0x120) == 7
+        assert index.locate(6) == (0x110, 3)
+
+        # new objects are merged on the next query
+        index.set_lines(0x108, 2)
+        assert 0x108 in index
+        assert index.line_of(0x110) == 5
+        assert index.total_lines == 14
+        assert len(index) == 4
+
+    def test_random(self):
+        rng = random.Random(0)
+        items = {rng.randrange(0, 0x10000): rng.randrange(0, 10) for _ in range(500)}
+        index = LineIndex(items.items())
+        for _ in range(200):
+            addr = rng.choice(list(items))
+            items[addr] = rng.randrange(0, 10)
+            index.set_lines(addr, items[addr])
+
+        line = 0
+        for addr in sorted(items):
+            assert index.line_of(addr) == line
+            for i in range(items[addr]):
+                assert index.locate(line + i) == (addr, i)
+            line += items[addr]
+        assert index.total_lines == line
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# pylint:disable=missing-class-docstring,wrong-import-order
+from __future__ import annotations
+
+import time
+import unittest
+
+import angr
+from common import AngrManagementTestCase
+from PySide6.QtWidgets import QApplication
+
+from angrmanagement.ui.views import DisassemblyView
+
+# f: xor rax, rax; test rdi, rdi; je +5; mov eax, 1; ret
+# g: call f; ret
+SHELLCODE = bytes.fromhex("4831c04885ff7405b801000000c3e8edffffffc3")
+LOAD_ADDRESS = 0x400000
+
+
+class TestLinearLineIndex(AngrManagementTestCase):
+    def setUp(self):
+        super().setUp()
+        instance = self.main.workspace.main_instance
+        instance.project.am_obj = angr.load_shellcode(
+            SHELLCODE, arch="amd64", start_offset=0, load_address=LOAD_ADDRESS
+        )
+        instance.project.am_event()
+        self.main.workspace.job_manager.join_all_jobs(wait_period=0.5)
+        self.view = self.main.workspace._get_or_create_view("disassembly", DisassemblyView)
+        self.view.display_linear_viewer()
+        self.linear = self.view._linear_viewer
+
+    def _wait_for(self, condition, timeout: float = 30.0) -> None:
+        deadline = time.time() + timeout
+        while not condition():
+            assert time.time() < deadline, "Timed out"
+            # sleep in Python, so that the indexing thread can run
+            QApplication.processEvents()
+            time.sleep(0.02)
+
+    def test_line_index_is_built_in_the_background(self):
+        self.linear.initialize()
+        assert self.linear._line_index is None
+        self._wait_for(lambda: self.linear._line_index is not None)
+        assert LOAD_ADDRESS in self.linear._line_index
+
+    def test_line_index_is_retried(self):
+        collect = self.linear._line_index_objects
+        attempts = []
+
+        def _flaky_line_index_objects(cfb, regions):
+            attempts.append(None)
+            if len(attempts) == 1:
+                raise RuntimeError("the CFB changed during iteration")
+            return collect(cfb, regions)
+
+        self.linear._line_index_objects = _flaky_line_index_objects
+        self.linear.LINE_INDEX_RETRY_DELAY = 0.0
+        self.linear.initialize()
+        self._wait_for(lambda: self.linear._line_index is not None)
+        assert len(attempts) == 2
+        assert LOAD_ADDRESS in self.linear._line_index
+
+    def test_added_objects_are_handled_in_one_batch(self):
+        self.linear.initialize()
+        cfb = self.main.workspace.main_instance.cfb.am_obj
+        objects = list(cfb.floor_items(addr=LOAD_ADDRESS))
+        assert len(objects) > 1
+
+        # objects that are added while the index is being built are applied once it is ready
+        self.linear.on_cfb_objects_added(objects)
+        assert self.linear._pending_line_index_objects == objects
+        self._wait_for(lambda: self.linear._line_index is not None)
+        assert not self.linear._pending_line_index_objects
+
+        refreshes = []
+        self.linear._refresh_displayed_objects = lambda: refreshes.append(None)
+        self.linear._displayed_range = (LOAD_ADDRESS, None)
+        self.linear.on_cfb_objects_added(objects)
+        assert len(refreshes) == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
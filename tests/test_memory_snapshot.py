@@ -0,0 +1,161 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import unittest
+
+import angr
+import claripy
+from angr.errors import SimMemoryMissingError
+
+from angrmanagement.logic.debugger.memory_snapshot import DebuggerMemorySnapshot
+
+PAGE_SIZE = 0x1000
+
+
+class FakeValue:
+    """
+    A concrete value loaded from memory.
+    """
+
+    symbolic = False
+
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeSolver:
+    """
+    Evaluates FakeValues.
+    """
+
+    def eval(self, value, cast_to=None):
+        assert cast_to is bytes
+        return value.data
+
+
+class FakeMemory:
+    """
+    Paged memory that shares its pages with the memory it was copied from until they are written to.
+    """
+
+    page_size = PAGE_SIZE
+
+    def __init__(self, pages=None):
+        self._pages = {} if pages is None else pages
+        self.loads = 0
+
+    def copy(self, memo):  # pylint:disable=unused-argument
+        return FakeMemory(dict(self._pages))
+
+    def store(self, addr, data):
+        pageno, offset = divmod(addr, PAGE_SIZE)
+        page = bytearray(self._pages.get(pageno, bytes(PAGE_SIZE)))
+        page[offset : offset + len(data)] = data
+        self._pages[pageno] = page
+
+    def load(self, addr, size, **kwargs):  # pylint:disable=unused-argument
+        self.loads += 1
+        pageno, offset = divmod(addr, PAGE_SIZE)
+        return FakeValue(bytes(self._pages.get(pageno, bytes(PAGE_SIZE))[offset : offset + size]))
+
+
+class FakeState:
+    """
+    A state with paged memory.
+    """
+
+    def __init__(self, memory=None):
+        self.memory = FakeMemory() if memory is None else memory
+        self.solver = FakeSolver()
+
+    def copy(self):
+        return FakeState(self.memory.copy({}))
+
+
+class DebuggerMemorySnapshotTests(unittest.TestCase):
+    """
+    Test cases for DebuggerMemorySnapshot
+    """
+
+    def test_written_and_untouched_pages(self):
+        state = FakeState()
+        state.memory.store(0x1000, b"\x01")
+        state.memory.store(0x2000, b"\x02")
+
+        snapshot = DebuggerMemorySnapshot()
+        assert snapshot.update(state) == {}
+        assert snapshot.read(0x1000, 1) == (b"\x01", {})
+        assert snapshot.read(0x2000, 1) == (b"\x02", {})
+        untouched = snapshot.read_page(0x2000)
+
+        next_state = state.copy()
+        next_state.memory.store(0x1004, b"\x11")
+        dirty = snapshot.update(next_state)
+
+        # only the written page is reported, with its old contents
+        assert list(dirty) == [0x1000]
+        assert dirty[0x1000].data[:5] == b"\x01\x00\x00\x00\x00"
+        assert snapshot.read(0x1000, 5) == (b"\x01\x00\x00\x00\x11", {})
+
+        # the untouched page is not read again
+        assert snapshot.read_page(0x2000) is untouched
+        assert next_state.memory.loads == 1
+
+    def test_page_first_read_after_copy(self):
+        state = FakeState()
+        snapshot = DebuggerMemorySnapshot()
+        snapshot.update(state)
+
+        next_state = state.copy()
+        next_state.memory.store(0x3000, b"\x03")
+        assert snapshot.update(next_state) == {}
+        # the page was not read before, so it is read from the new state
+        assert snapshot.read(0x3000, 1) == (b"\x03", {})
+
+        # the page is shared with the copy of the memory that the snapshot took, so writing it is noticed
+        last_state = next_state.copy()
+        assert snapshot.update(last_state) == {}
+        last_state = last_state.copy()
+        last_state.memory.store(0x3001, b"\x33")
+        dirty = snapshot.update(last_state)
+        assert list(dirty) == [0x3000]
+        assert snapshot.read(0x3000, 2) == (b"\x03\x33", {})
+
+    def test_read_across_pages(self):
+        state = FakeState()
+        state.memory.store(0x1FFF, b"\xaa")
+        state.memory.store(0x2000, b"\xbb")
+
+        snapshot = DebuggerMemorySnapshot()
+        snapshot.update(state)
+        assert snapshot.read(0x1FFF, 2) == (b"\xaa\xbb", {})
+
+        assert snapshot.update(None) == {}
+        data, unknown = snapshot.read(0x1FFF, 2)
+        assert data == b"\x00\x00"
+        assert unknown == {0: "?", 1: "?"}
+
+    def test_unwritten_memory_is_not_filled(self):
+        project = angr.load_shellcode(b"\xc3", arch="amd64", load_address=0x400000)
+        state = project.factory.blank_state()
+        # far away from the memory of the loader
+        state.memory.store(0x10000010, b"\x01\x02")
+        state.memory.store(0x10000020, claripy.BVS("x", 8))
+
+        snapshot = DebuggerMemorySnapshot()
+        snapshot.update(state)
+        data, unknown = snapshot.read(0x10000000, 0x30)
+        assert data[0x10:0x12] == b"\x01\x02"
+        assert unknown[0x20] == "S"
+        assert unknown[0] == "?" and unknown[0x12] == "?" and unknown[0x2F] == "?"
+        assert len(unknown) == 0x30 - 2
+
+        # reading did not store symbolic variables in the unwritten bytes
+        with self.assertRaises(SimMemoryMissingError):
+            state.memory.load(0x10000000, 1, fill_missing=False)
+        with self.assertRaises(SimMemoryMissingError):
+            state.memory.load(0x10000FFF, 1, fill_missing=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import unittest
+
+from angrmanagement.data.object_container import EventSentinel, ObjectContainer
+
+
+class EventSentinelTests(unittest.TestCase):
+    """
+    Test cases for EventSentinel
+    """
+
+    def setUp(self):
+        self.scheduled = []
+        EventSentinel.am_scheduler = lambda func, delay: self.scheduled.append(func)
+
+    def tearDown(self):
+        EventSentinel.am_scheduler = None
+        EventSentinel.am_profiling = False
+
+    def _run_scheduled(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for func in scheduled:
+            func()
+
+    def test_immediate(self):
+        events = []
+        sentinel = EventSentinel()
+        sentinel.am_subscribe(lambda **kwargs: events.append(kwargs))
+        sentinel.am_event(a=1)
+        sentinel.am_event(a=2)
+        assert events == [{"a": 1}, {"a": 2}]
+        assert not self.scheduled
+
+    def test_coalesce(self):
+        events = []
+        container = ObjectContainer(None, "test")
+        container.am_coalesce(batch_keys=("added",))
+        container.am_subscribe(lambda **kwargs: events.append(kwargs))
+
+        container.am_event(added=1)
+        container.am_event(added=2)
+        container.am_event()
+        container.am_event(value=1)
+        container.am_event(value=2)
+        container.am_event(added=3)
+        assert not events
+        assert len(self.scheduled) == 1
+
+        self._run_scheduled()
+        assert events == [{"added": [1, 2, 3]}, {}, {"value": 2}]
+
+        # a new window starts after delivery
+        container.am_event(added=4)
+        self._run_scheduled()
+        assert events[-1] == {"added": [4]}
+
+    def test_coalesce_without_scheduler(self):
+        EventSentinel.am_scheduler = None
+        events = []
+        sentinel = EventSentinel()
+        sentinel.am_coalesce(batch_keys=("added",))
+        sentinel.am_subscribe(lambda **kwargs: events.append(kwargs))
+        sentinel.am_event(added=1)
+        assert events == [{"added": [1]}]
+
+    def test_listener_stats(self):
+        EventSentinel.am_profiling = True
+
+        def listener(**kwargs):  # pylint:disable=unused-argument
+            pass
+
+        sentinel = EventSentinel()
+        sentinel.am_subscribe(listener)
+        sentinel.am_event()
+        sentinel.am_event()
+        stats = sentinel.am_listener_stats[listener.__qualname__]
+        assert stats.calls == 2
+        assert stats.max_time <= stats.total_time
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import random
+import unittest
+
+from angrmanagement.data.operand_index import OperandValueIndex, function_fingerprint
+
+
+class OperandValueIndexTests(unittest.TestCase):
+    """
+    Test cases for OperandValueIndex
+    """
+
+    def test_find(self):
+        index = OperandValueIndex(
+            [(0x10, 0x401000, 1), (0x67452301, 0x401010, 0), (0x10, 0x400FF0, 0), (-1, 0x402000, 1)]
+        )
+        assert len(index) == 4
+        assert index.find(0x10) == [(0x10, 0x400FF0, 0), (0x10, 0x401000, 1)]
+        assert index.find(0x67452301) == [(0x67452301, 0x401010, 0)]
+        assert index.find(0xFFFFFFFFFFFFFFFF) == [(0xFFFFFFFFFFFFFFFF, 0x402000, 1)]
+        assert index.find(0x11) == []
+        assert index.find_range(0x10, 0x67452301) == [
+            (0x10, 0x400FF0, 0),
+            (0x10, 0x401000, 1),
+            (0x67452301, 0x401010, 0),
+        ]
+        assert index.find_range(0x11, 0x67452300) == []
+        assert index.find_range(5, 1) == []
+
+    def test_find_masked(self):
+        rng = random.Random(0)
+        entries = [(rng.choice((rng.getrandbits(64), rng.getrandbits(16))), i, 0) for i in range(2000)]
+        index = OperandValueIndex(entries)
+        for mask in (0, 0xFFFFFFFFFFFFFFFF, 0xFFFFFFFFFFFF0000, 0xFF00, 0xF000000000000F0F, 0x1):
+            for value, _, _ in entries[:20]:
+                expected = sorted(e for e in entries if e[0] & mask == value & mask)
+                assert index.find_masked(value, mask) == expected
+
+    def test_serialization(self):
+        index = OperandValueIndex([(3, 0x1000, 2), (1, 0x1004, 0), (2**63, 0x1008, 1)], fingerprint=1234)
+        loaded = OperandValueIndex.loads(index.dumps())
+        assert loaded.fingerprint == 1234
+        assert loaded.find_range(0, 2**64) == index.find_range(0, 2**64)
+        with self.assertRaises(ValueError):
+            OperandValueIndex.loads("not an index")
+        assert function_fingerprint([1, 2, 3]) == function_fingerprint({3, 2, 1})
+        assert function_fingerprint([1, 2, 3]) != function_fingerprint([1, 2, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
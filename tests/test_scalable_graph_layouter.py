@@ -0,0 +1,79 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import unittest
+
+import networkx
+
+from angrmanagement.utils.edge import EdgeSort
+from angrmanagement.utils.scalable_graph_layouter import ScalableGraphLayouter
+
+
+def _overlaps(a, b) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class ScalableGraphLayouterTests(unittest.TestCase):
+    """
+    Test cases for ScalableGraphLayouter
+    """
+
+    def _layout(self, edges, **kwargs):
+        graph = networkx.DiGraph()
+        graph.add_edges_from(edges)
+        sizes = {node: (40 + (node % 3) * 30, 20 + (node % 4) * 10) for node in graph}
+        return graph, sizes, ScalableGraphLayouter(graph, sizes, **kwargs)
+
+    def _check_geometry(self, graph, sizes, gl):
+        assert set(gl.node_coordinates) == set(graph)
+        rects = {node: (x, y, x + sizes[node][0], y + sizes[node][1]) for node, (x, y) in gl.node_coordinates.items()}
+        nodes = list(rects)
+        for i, a in enumerate(nodes):
+            for b in nodes[i + 1 :]:
+                assert not _overlaps(rects[a], rects[b]), f"{a} and {b} overlap"
+
+        assert len(gl.edges) == graph.number_of_edges()
+        for edge in gl.edges:
+            coords = edge.coordinates
+            assert coords[0][1] == rects[edge.src][3]
+            assert coords[-1][1] == rects[edge.dst][1] - 6
+            for (x0, y0), (x1, y1) in zip(coords, coords[1:], strict=False):
+                # edges are orthogonal and never pass through other nodes
+                assert x0 == x1 or y0 == y1
+                segment = (min(x0, x1), min(y0, y1), max(x0, x1) + 1, max(y0, y1) + 1)
+                for node, rect in rects.items():
+                    if node not in (edge.src, edge.dst):
+                        assert not _overlaps(segment, rect), f"{edge} passes through {node}"
+
+    def test_diamond(self):
+        graph, sizes, gl = self._layout([(0, 1), (0, 2), (1, 3), (2, 3)])
+        self._check_geometry(graph, sizes, gl)
+        ys = {node: y for node, (_, y) in gl.node_coordinates.items()}
+        assert ys[0] < ys[1] < ys[3]
+        assert ys[0] < ys[2] < ys[3]
+
+    def test_loops(self):
+        graph, sizes, gl = self._layout([(0, 1), (1, 2), (2, 3), (3, 1), (2, 2), (3, 4), (0, 4)])
+        self._check_geometry(graph, sizes, gl)
+
+    def test_long_edges(self):
+        edges = [(i, i + 1) for i in range(30)] + [(i, i + 7) for i in range(0, 24, 3)] + [(29, 2), (20, 0)]
+        graph, sizes, gl = self._layout(edges)
+        self._check_geometry(graph, sizes, gl)
+
+    def test_exception_edges(self):
+        graph = networkx.DiGraph()
+        graph.add_edge(0, 1)
+        graph.add_edge(0, 2, type="exception")
+        gl = ScalableGraphLayouter(graph, {0: (10, 10), 1: (10, 10), 2: (10, 10)})
+        sorts = {(edge.src, edge.dst): edge.sort for edge in gl.edges}
+        assert sorts == {(0, 1): None, (0, 2): EdgeSort.EXCEPTION_EDGE}
+
+    def test_empty(self):
+        gl = ScalableGraphLayouter(networkx.DiGraph(), {})
+        assert gl.node_coordinates == {}
+        assert gl.edges == []
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import re
+import unittest
+from types import SimpleNamespace
+
+from angrmanagement.data.strings_index import StringsIndex, required_literal
+
+
+def _item(addr: int, sort: str, content: bytes):
+    return SimpleNamespace(addr=addr, sort=sort, content=content, size=len(content))
+
+
+def _cfg_model(items):
+    nodes = {0x100: 0x100, 0x110: 0x100, 0x200: 0x200}
+    return SimpleNamespace(
+        memory_data={item.addr: item for item in items},
+        get_any_node=lambda addr: SimpleNamespace(function_address=nodes[addr]) if addr in nodes else None,
+    )
+
+
+def _xrefs(refs: dict[int, list[int]]):
+    return SimpleNamespace(
+        xrefs_by_dst={dst: [SimpleNamespace(block_addr=src) for src in srcs] for dst, srcs in refs.items()}
+    )
+
+
+class StringsIndexTests(unittest.TestCase):
+    """
+    Test cases for StringsIndex
+    """
+
+    def test_required_literal(self):
+        assert required_literal("hello") == "hello"
+        assert required_literal("^err(or)?: .*failed$") == "failed"
+        assert required_literal(r"usage: \w+ \[options\]") == " [options]"
+        assert required_literal("colou?r") == "colo"
+        assert required_literal("ab+cde") == "cde"
+        assert required_literal("[a-z]+_init") == "_init"
+        assert required_literal("foo|bar") == ""
+        assert required_literal("a{2,3}bc") == "bc"
+
+    def test_required_literal_groups(self):
+        # literals in groups that may match nothing are not required
+        assert required_literal("(abc)?def") == "def"
+        assert required_literal("(foo)*bar") == "bar"
+        assert required_literal("x(hello){0,1}") == "x"
+        # group syntax is not literal
+        assert required_literal("(?:abc)") == "abc"
+        assert required_literal("(?P<n>ab)c") == "ab"
+        assert required_literal("(?!foo)bar") == "bar"
+        assert required_literal("(?<=ab)cd") == "cd"
+        assert required_literal("(ab(cd)?)+e") == "ab"
+        assert required_literal(r"\(x\)") == "(x)"
+        # inline flags change how literals match
+        assert required_literal("(?i)hello") == ""
+
+    def test_sync_and_search(self):
+        items = [
+            _item(0x1000, "string", b"Hello, World\n"),
+            _item(0x2000, "unicode", "hello unicode".encode("utf_16_le")),
+            _item(0x3000, "integer", b"\x01\x02\x03\x04"),
+            _item(0x4000, "string", b"usage: prog [options]"),
+        ]
+        cfg_model = _cfg_model(items)
+        index = StringsIndex()
+        assert index.sync(cfg_model, xrefs=_xrefs({0x1000: [0x110], 0x4000: [0x110, 0x200]}))
+        assert len(index) == 3
+        assert index.get(0x1000).display == "Hello, World\\n"
+        assert index.get(0x2000).encoding == "utf_16_le"
+        assert index.get(0x4000).functions == {0x100, 0x200}
+
+        assert [e.addr for e in index.search("hello")] == [0x1000, 0x2000]
+        assert [e.addr for e in index.search("world\\n")] == [0x1000]
+        assert [e.addr for e in index.search("h*o, w")] == [0x1000]
+        assert [e.addr for e in index.search(re.compile(r"^usage: \w+"))] == [0x4000]
+        assert [e.addr for e in index.search("", func_addr=0x100)] == [0x1000, 0x4000]
+        assert [e.addr for e in index.search("usage", func_addr=0x200)] == [0x4000]
+        assert index.search("hello", func_addr=0x200) == []
+
+        # nothing changed
+        assert not index.sync(cfg_model)
+
+        # memory data changes
+        del cfg_model.memory_data[0x1000]
+        cfg_model.memory_data[0x5000] = _item(0x5000, "string", b"another hello")
+        assert index.sync(cfg_model)
+        assert [e.addr for e in index.entries()] == [0x2000, 0x4000, 0x5000]
+        assert [e.addr for e in index.entries(func_addr=0x100)] == [0x4000]
+        assert [e.addr for e in index.search("hello")] == [0x2000, 0x5000]
+
+        # the CFG is replaced
+        assert index.sync(_cfg_model([_item(0x6000, "string", b"new")]))
+        assert [e.addr for e in index.entries()] == [0x6000]
+
+    def test_sync_memory_data_that_becomes_a_string(self):
+        item = _item(0x1000, "unknown", b"late string")
+        cfg_model = _cfg_model([item])
+        index = StringsIndex()
+        index.sync(cfg_model)
+        assert len(index) == 0
+
+        item.sort = "string"
+        assert index.sync(cfg_model)
+        assert index.get(0x1000).text == "late string"
+
+        # the string is looked at again when its size changes
+        item.content = b"late"
+        item.size = 4
+        assert index.sync(cfg_model)
+        assert index.get(0x1000).text == "late"
+        assert not index.sync(cfg_model)
+
+    def test_sync_rebuilds_references(self):
+        cfg_model = _cfg_model([_item(0x1000, "string", b"referenced later")])
+        refs = {0x1000: [0x110]}
+        index = StringsIndex()
+        index.sync(cfg_model, xrefs=_xrefs(refs))
+        assert index.get(0x1000).functions == {0x100}
+
+        refs[0x1000].append(0x200)
+        assert not index.sync(cfg_model, xrefs=_xrefs(refs))
+        assert index.sync(cfg_model, xrefs=_xrefs(refs), rebuild_references=True)
+        assert index.get(0x1000).functions == {0x100, 0x200}
+        assert [e.addr for e in index.entries(func_addr=0x200)] == [0x1000]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+
+from angrmanagement.data.symbol_index import SymbolIndex, fuzzy_score
+
+
+def _kb(funcs: dict[int, str], labels: dict[int, str]):
+    functions = SimpleNamespace(
+        function_addrs_set=set(funcs),
+        get_by_addr=lambda addr: SimpleNamespace(addr=addr, name=funcs[addr]),
+    )
+    return SimpleNamespace(functions=functions, labels={**labels, **funcs})
+
+
+class SymbolIndexTests(unittest.TestCase):
+    """
+    Test cases for SymbolIndex
+    """
+
+    def test_fuzzy_score(self):
+        assert fuzzy_score("main", "main") == 100
+        assert fuzzy_score("mai", "main") > fuzzy_score("ain", "main") > fuzzy_score("mn", "main")
+        assert fuzzy_score("mem", "memcpy") > fuzzy_score("mem", "memmove_s")
+        assert fuzzy_score("nm", "main") is None
+
+    def test_search(self):
+        index = SymbolIndex()
+        for addr, name in enumerate(["memcpy", "memmove", "main", "__libc_start_main", "domain_name", "m"]):
+            index.set(SymbolIndex.FUNCTION, addr, name)
+        assert [s.caption for s in index.search("main")] == ["main", "domain_name", "__libc_start_main"]
+        assert [s.caption for s in index.search("MEM", limit=2)] == ["memcpy", "memmove"]
+        assert [s.caption for s in index.search("mmv")] == ["memmove"]
+        assert index.search("") == []
+        assert index.search("xyz") == []
+
+    def test_search_limit(self):
+        index = SymbolIndex()
+        names = [f"sub_{i:x}" for i in range(1000)]
+        for addr, name in enumerate(names):
+            index.set(SymbolIndex.FUNCTION, addr, name)
+        matches = [n for n in names if fuzzy_score("sub_1", n) is not None]
+        # ties go to shorter names, and then to names that were added first
+        expected = sorted(matches, key=lambda n: (-fuzzy_score("sub_1", n), len(n), names.index(n)))[:20]
+        assert [s.caption for s in index.search("sub_1", limit=20)] == expected
+
+    def test_sync(self):
+        index = SymbolIndex()
+        funcs = {0x1000: "main", 0x2000: "sub_2000"}
+        kb = _kb(funcs, {0x3000: "g_counter"})
+        index.sync(kb)
+        assert len(index) == 3
+        assert [s.addr for s in index.symbols(SymbolIndex.FUNCTION)] == [0x1000, 0x2000]
+        assert index.get(SymbolIndex.LABEL, 0x3000).caption == "g_counter"
+
+        # rename a function and a label, and remove a label
+        funcs[0x2000] = "parse_args"
+        kb.labels[0x2000] = "parse_args"
+        del kb.labels[0x3000]
+        kb.labels[0x4000] = "g_flags"
+        index.sync(kb)
+        assert [s.caption for s in index.search("parse")] == ["parse_args"]
+        assert index.get(SymbolIndex.LABEL, 0x3000) is None
+        assert index.get(SymbolIndex.LABEL, 0x4000).caption == "g_flags"
+        assert len(index) == 3
+
+    def test_sync_strings(self):
+        index = SymbolIndex()
+        kb = _kb({}, {})
+        item = SimpleNamespace(addr=0x5000, sort="unknown", size=6, content=b"hello\x00")
+        cfg_model = SimpleNamespace(memory_data={0x5000: item})
+        index.sync(kb, cfg_model)
+        assert index.get(SymbolIndex.STRING, 0x5000) is None
+
+        # memory data that turns out to be a string is looked at again
+        item.sort = "string"
+        index.sync(kb, cfg_model)
+        assert index.get(SymbolIndex.STRING, 0x5000).caption == "hello\x00"
+
+        item.sort = "unknown"
+        index.sync(kb, cfg_model)
+        assert index.get(SymbolIndex.STRING, 0x5000) is None
+
+    def test_sync_holds_lock_to_apply_changes(self):
+        index = SymbolIndex()
+        kb = _kb({0x1000: "main"}, {})
+        held = []
+
+        class Lock:
+            def __enter__(self):
+                # the changes are collected before the lock is taken
+                held.append(len(index))
+
+            def __exit__(self, *args):
+                held.append(len(index))
+
+        index.sync(kb, lock=Lock())
+        assert held == [0, 1]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import unittest
 
-from angrmanagement.data.tagged_interval_map import TaggedIntervalMap
+from angrmanagement.data.tagged_interval_map import IntervalIndex, TaggedIntervalMap
 
 
 class TaggedIntervalMapTests(unittest.TestCase):
@@ -109,5 +109,52 @@ class TaggedIntervalMapTests(unittest.TestCase):
         assert not list(im.irange(351, 400))
 
 
+class IntervalIndexTests(unittest.TestCase):
+    """
+    Test cases for IntervalIndex
+    """
+
+    def test_empty(self):
+        idx = IntervalIndex()
+        assert len(idx) == 0
+        assert idx.overlapping(0, 100) == []
+        assert idx.at(0) == []
+
+    def test_lookup(self):
+        idx = IntervalIndex()
+        idx.add(100, 10, "a")
+        idx.add(105, 10, "b")
+        idx.add(120, 1, "c")
+        idx.add(130, 0, "empty")
+        assert len(idx) == 3
+        assert idx.at(99) == []
+        assert idx.at(100) == ["a"]
+        assert idx.at(107) == ["a", "b"]
+        assert idx.at(110) == ["b"]
+        assert idx.at(115) == []
+        assert idx.at(130) == []
+        assert idx.overlapping(0, 99) == []
+        assert idx.overlapping(109, 120) == ["a", "b", "c"]
+        assert idx.overlapping(115, 200) == ["c"]
+
+    def test_insertion_order(self):
+        idx = IntervalIndex()
+        idx.add(200, 10, "late")
+        idx.add(100, 200, "early")
+        idx.add(0, 0x10000, "long")
+        idx.add(150, 100, "last")
+        assert idx.at(205) == ["late", "early", "long", "last"]
+        assert idx.overlapping(0, 10) == ["long"]
+        assert idx.overlapping(0x10000, 0x20000) == []
+
+    def test_clear(self):
+        idx = IntervalIndex()
+        idx.add(0, 0x10000, 1)
+        idx.add(0, 10, 2)
+        idx.clear()
+        assert len(idx) == 0
+        assert idx.at(5) == []
+
+
 if __name__ == "__main__":
     unittest.main()
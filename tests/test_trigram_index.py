@@ -0,0 +1,67 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import random
+import unittest
+
+from angrmanagement.data.trigram_index import TrigramIndex
+
+
+class TrigramIndexTests(unittest.TestCase):
+    """
+    Test cases for TrigramIndex
+    """
+
+    def test_search(self):
+        index = TrigramIndex([(1, "main\n0x401000"), (2, "Memcpy\n0x401100"), (3, "memset\n0x402000")])
+        assert len(index) == 3
+        assert index.search("") == {1, 2, 3}
+        assert index.search("m") == {1, 2, 3}
+        assert index.search("MEM") == {2, 3}
+        assert index.search("memc") == {2}
+        assert index.search("0x40") == {1, 2, 3}
+        assert index.search("4011") == {2}
+        assert index.search("nothing") == set()
+
+    def test_narrowing(self):
+        index = TrigramIndex([(1, "alpha"), (2, "alphabet"), (3, "beta")])
+        assert index.search("al") == {1, 2}
+        assert index.search("alph") == {1, 2}
+        assert index.search("alphab") == {2}
+        # changes to the index are not hidden by the previous results
+        index.set(3, "alphabetical")
+        assert index.search("alphabe") == {2, 3}
+
+    def test_update(self):
+        index = TrigramIndex([(1, "foo"), (2, "bar")])
+        index.set(1, "baz")
+        assert index.search("foo") == set()
+        assert index.search("ba") == {1, 2}
+        index.discard(2)
+        index.discard(4)
+        assert 2 not in index
+        assert index.search("bar") == set()
+        assert index.text(1) == "baz"
+        assert index.text(2) is None
+
+    def test_random(self):
+        rng = random.Random(0)
+        alphabet = "abcdef"
+        texts = {}
+        index = TrigramIndex()
+        for _ in range(3000):
+            key = rng.randrange(200)
+            if rng.random() < 0.2:
+                texts.pop(key, None)
+                index.discard(key)
+            else:
+                texts[key] = "".join(rng.choice(alphabet) for _ in range(rng.randrange(1, 12)))
+                index.set(key, texts[key])
+            if rng.random() < 0.1:
+                query = "".join(rng.choice(alphabet) for _ in range(rng.randrange(0, 5)))
+                assert index.search(query) == {k for k, t in texts.items() if query in t}
+        assert len(index) == len(texts)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+
+import networkx
+
+from angrmanagement.data.jobs.variable_recovery import FUNCTIONS_PER_WORKER, VariableRecoveryJob
+from angrmanagement.logic.jobmanager import JobSuspended
+
+
+class FakeFunctions:
+    """
+    The functions of a knowledge base, calling each other in a chain.
+    """
+
+    def __init__(self, count):
+        self.callgraph = networkx.MultiDiGraph()
+        self._functions = {}
+        for addr in range(count):
+            self.callgraph.add_node(addr)
+            if addr > 0:
+                # each function calls the previous one
+                self.callgraph.add_edge(addr, addr - 1)
+            self._functions[addr] = SimpleNamespace(is_alignment=False, calling_convention=None, prototype=None)
+
+    def __contains__(self, addr):
+        return addr in self._functions
+
+    def get_by_addr(self, addr):
+        return self._functions[addr]
+
+
+class FakeCompleteCallingConventions:
+    """
+    Records the functions that each analysis is asked to analyze.
+    """
+
+    def __init__(self, batches, **kwargs):
+        assert kwargs["skip_other_funcs"]
+        assert not kwargs["auto_start"]
+        self._batches = batches
+        self._func_addrs = kwargs["prioritize_func_addrs"]
+
+    def work(self):
+        self._batches.append(self._func_addrs)
+
+
+class FakeContext:
+    """
+    A job context that asks the job to suspend after a number of checkpoints.
+    """
+
+    def __init__(self, suspend_at=None):
+        self.checkpoints = 0
+        self.suspend_at = suspend_at
+
+    def checkpoint(self):
+        self.checkpoints += 1
+        if self.checkpoints == self.suspend_at:
+            raise JobSuspended
+
+    def set_progress(self, percentage, text=""):
+        pass
+
+
+class TestVariableRecoveryJob(unittest.TestCase):
+    def _create_job(self, func_count, batches):
+        analyses = SimpleNamespace(
+            CompleteCallingConventions=lambda **kwargs: FakeCompleteCallingConventions(batches, **kwargs)
+        )
+        instance = SimpleNamespace(
+            kb=SimpleNamespace(functions=FakeFunctions(func_count)),
+            project=SimpleNamespace(analyses=analyses),
+            cfg=SimpleNamespace(am_obj=None),
+        )
+        return VariableRecoveryJob(instance, workers=2)
+
+    def test_workers_resume_after_last_batch(self):
+        batch_size = 2 * FUNCTIONS_PER_WORKER
+        batches = []
+        job = self._create_job(batch_size * 3, batches)
+        assert job.preemptible
+
+        with self.assertRaises(JobSuspended):
+            job.run(FakeContext(suspend_at=2))
+        # the job suspends after the first batch is finished
+        assert batches == [set(range(batch_size))]
+
+        job.run(FakeContext())
+        assert batches[1:] == [set(range(batch_size, batch_size * 2)), set(range(batch_size * 2, batch_size * 3))]
+
+    def test_prioritized_function_goes_into_next_batch(self):
+        batch_size = 2 * FUNCTIONS_PER_WORKER
+        batches = []
+        job = self._create_job(batch_size * 3, batches)
+
+        with self.assertRaises(JobSuspended):
+            job.run(FakeContext(suspend_at=2))
+        job.prioritize_function(batch_size * 3 - 1)
+        with self.assertRaises(JobSuspended):
+            job.run(FakeContext(suspend_at=2))
+
+        # the prioritized function and its callee are analyzed in the next batch
+        assert {batch_size * 3 - 2, batch_size * 3 - 1} <= batches[1]
+        assert len(batches[1]) == batch_size
+
+
+if __name__ == "__main__":
+    unittest.main()
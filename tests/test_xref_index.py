@@ -0,0 +1,54 @@
+# pylint:disable=no-self-use
+from __future__ import annotations
+
+import unittest
+from collections import defaultdict, namedtuple
+from types import SimpleNamespace
+
+from angrmanagement.data.xref_index import UNKNOWN_TYPE, XRefColumns, XRefIndex
+
+FakeXRef = namedtuple("FakeXRef", ("ins_addr", "block_addr", "type"))
+
+
+def _xref(ins_addr, xref_type, block_addr=None):
+    return FakeXRef(ins_addr, block_addr, xref_type)
+
+
+class XRefIndexTests(unittest.TestCase):
+    """
+    Test cases for XRefIndex
+    """
+
+    def test_columns(self):
+        columns = XRefColumns.from_xrefs([_xref(0x30, 1), _xref(0x10, 0), _xref(None, None, block_addr=0x20)])
+        assert list(columns.srcs) == [0x10, 0x20, 0x30]
+        assert list(columns.types) == [0, UNKNOWN_TYPE, 1]
+
+        merged = columns.merge(XRefColumns.from_rows([(0x28, 0), (0x5, 2)]))
+        assert list(merged.srcs) == [0x5, 0x10, 0x20, 0x28, 0x30]
+        assert list(merged.types) == [2, 0, UNKNOWN_TYPE, 0, 1]
+        assert columns.merge(XRefColumns()) is columns
+
+    def test_references_to(self):
+        xrefs = SimpleNamespace(xrefs_by_dst=defaultdict(set))
+        xrefs.xrefs_by_dst[0x1000].update({_xref(0x20, 1), _xref(0x10, 2)})
+        index = XRefIndex()
+
+        columns = index.references_to(xrefs, 0x1000)
+        assert list(columns.srcs) == [0x10, 0x20]
+        assert index.references_to(xrefs, 0x1000) is columns
+        assert len(index.references_to(xrefs, 0x2000)) == 0
+        assert 0x2000 not in xrefs.xrefs_by_dst
+
+        # added references are noticed
+        xrefs.xrefs_by_dst[0x1000].add(_xref(0x15, 0))
+        assert list(index.references_to(xrefs, 0x1000).srcs) == [0x10, 0x15, 0x20]
+
+        # a different manager replaces the index
+        other = SimpleNamespace(xrefs_by_dst={0x1000: {_xref(0x40, 0)}})
+        assert list(index.references_to(other, 0x1000).srcs) == [0x40]
+        assert len(index) == 1
+
+
+if __name__ == "__main__":
+    unittest.main()